@@ -0,0 +1,371 @@
+"""
+Fake Notion API server for benchmarks
+Serves synthetic databases, pages, blocks and users on localhost, no token or network needed.
+
+    workspace = Workspace(pages=1000, blocks=500)
+    with FakeNotionServer(workspace) as server:
+        nkit.Client(token="fake", base_url=server.url)
+"""
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+DATABASE_ID = "bench-database"
+PAGE_ID = "bench-page"
+USER_ID = "bench-user"
+TIMESTAMP = "2023-01-01T00:00:00.000Z"
+
+
+def rich_text(text:str) ->list[dict]:
+    return [{"type": "text", "text": {"content": text, "link": None},
+             "annotations": {"bold": False, "italic": False, "strikethrough": False,
+                             "underline": False, "code": False, "color": "default"},
+             "plain_text": text, "href": None}]
+
+
+def _user(id:str) ->dict:
+    return {"object": "user", "id": id, "type": "person", "name": f"User {id}",
+            "avatar_url": None, "person": {"email": f"{id}@example.com"}}
+
+
+def make_database(database_id:str = DATABASE_ID) ->dict:
+    options = [{"id": f"option-{i}", "name": f"Option {i}", "color": "default"} for i in range(8)]
+    properties = {
+        "Name":     {"id": "title", "type": "title", "title": {}},
+        "Text":     {"id": "text", "type": "rich_text", "rich_text": {}},
+        "Number":   {"id": "number", "type": "number", "number": {"format": "number"}},
+        "Select":   {"id": "select", "type": "select", "select": {"options": options}},
+        "Tags":     {"id": "tags", "type": "multi_select", "multi_select": {"options": options}},
+        "Status":   {"id": "status", "type": "status", "status": {"options": options, "groups": []}},
+        "Date":     {"id": "date", "type": "date", "date": {}},
+        "People":   {"id": "people", "type": "people", "people": {}},
+        "Done":     {"id": "done", "type": "checkbox", "checkbox": {}},
+        "URL":      {"id": "url", "type": "url", "url": {}},
+        "Email":    {"id": "email", "type": "email", "email": {}},
+        "Formula":  {"id": "formula", "type": "formula", "formula": {"expression": "prop(\"Number\") * 2"}},
+        "Created":  {"id": "created", "type": "created_time", "created_time": {}},
+        "Edited":   {"id": "edited", "type": "last_edited_time", "last_edited_time": {}},
+    }
+    for name, item in properties.items():
+        item["name"] = name
+    return {"object": "database", "id": database_id, "created_time": TIMESTAMP, "last_edited_time": TIMESTAMP,
+            "created_by": {"object": "user", "id": USER_ID}, "last_edited_by": {"object": "user", "id": USER_ID},
+            "title": rich_text("Benchmark"), "description": [], "icon": None, "cover": None,
+            "properties": properties, "parent": {"type": "page_id", "page_id": PAGE_ID},
+            "url": f"https://www.notion.so/{database_id}", "archived": False, "is_inline": False}
+
+
+def make_page(index:int, database_id:str = DATABASE_ID) ->dict:
+    option = {"id": f"option-{index % 8}", "name": f"Option {index % 8}", "color": "default"}
+    created = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(1672531200 + index * 60))
+    properties = {
+        "Name":     {"type": "title", "title": rich_text(f"Page {index}")},
+        "Text":     {"type": "rich_text", "rich_text": rich_text(f"Text of page {index} " * 4)},
+        "Number":   {"type": "number", "number": index * 1.5},
+        "Select":   {"type": "select", "select": option},
+        "Tags":     {"type": "multi_select", "multi_select": [option, {**option, "id": "option-7", "name": "Option 7"}]},
+        "Status":   {"type": "status", "status": option},
+        "Date":     {"type": "date", "date": {"start": created[:10], "end": None, "time_zone": None}},
+        "People":   {"type": "people", "people": [{"object": "user", "id": USER_ID}]},
+        "Done":     {"type": "checkbox", "checkbox": index % 2 == 0},
+        "URL":      {"type": "url", "url": f"https://example.com/{index}"},
+        "Email":    {"type": "email", "email": f"page{index}@example.com"},
+        "Formula":  {"type": "formula", "formula": {"type": "number", "number": index * 3.0}},
+        "Created":  {"type": "created_time", "created_time": created},
+        "Edited":   {"type": "last_edited_time", "last_edited_time": created},
+    }
+    for name, item in make_database(database_id)["properties"].items():
+        properties[name]["id"] = item["id"]
+    return {"object": "page", "id": f"page-{index}", "created_time": created, "last_edited_time": created,
+            "created_by": {"object": "user", "id": USER_ID}, "last_edited_by": {"object": "user", "id": USER_ID},
+            "cover": None, "icon": None, "parent": {"type": "database_id", "database_id": database_id},
+            "archived": False, "properties": properties, "url": f"https://www.notion.so/page-{index}"}
+
+
+def make_block(id:str, parent_id:str, type:str = "paragraph", has_children:bool = False) ->dict:
+    if type in ("divider", "column_list", "column"):
+        content = {}
+    else:
+        content = {"rich_text": rich_text(f"Block {id}"), "color": "default"}
+    return {"object": "block", "id": id, "type": type, type: content,
+            "parent": {"type": "page_id", "page_id": parent_id},
+            "created_time": TIMESTAMP, "last_edited_time": TIMESTAMP,
+            "created_by": {"object": "user", "id": USER_ID}, "last_edited_by": {"object": "user", "id": USER_ID},
+            "has_children": has_children, "archived": False}
+
+
+class Workspace:
+    def __init__(self, pages:int = 1000, blocks:int = 500, fanout:int = 10, users:int = 200):
+        """
+        Synthetic workspace
+        One database of "pages" pages, one page with a block tree of about "blocks" blocks.
+
+        Parameters:
+            pages:      (int)   - Pages in the database
+            blocks:     (int)   - Blocks in the tree of PAGE_ID
+            fanout:     (int)   - Max children of each toggle block
+            users:      (int)   - Users of workspace
+        """
+        self.lock = threading.Lock()
+        self.database = json.dumps(make_database()).encode()
+        # NOTE: Pages are encoded once, query responses only join the bytes
+        self.pages = [json.dumps(make_page(i)).encode() for i in range(pages)]
+        self._filtered:dict[str, list[bytes]] = {}
+        self.children:dict[str, list[dict]] = {}
+        self.users = [_user(f"user-{i}") for i in range(users)]
+        self._build_tree(blocks, fanout)
+
+    def _build_tree(self, blocks:int, fanout:int) ->None:
+        # Breadth first: toggles get "fanout" children until the count is used up
+        queue, count = [PAGE_ID], 0
+        while queue and count < blocks:
+            parent_id = queue.pop(0)
+            children = self.children.setdefault(parent_id, [])
+            for _ in range(min(fanout, blocks - count)):
+                count += 1
+                id = f"block-{count}"
+                toggle = count % 3 == 0
+                children.append(make_block(id, parent_id, "toggle" if toggle else "paragraph", toggle))
+                if toggle:
+                    queue.append(id)
+        # Toggles that never got children
+        for children in list(self.children.values()):
+            for block in children:
+                if block["has_children"] and block["id"] not in self.children:
+                    block["has_children"] = False
+
+    def query(self, filter:dict | None, properties:list[str] | None = None) ->list[bytes]:
+        """
+        Pages matching the filter [Timestamp, number and compound filters]
+        Result of each filter is kept, so following cursor requests only slice it.
+        With "properties" (filter_properties), pages have only these property ids.
+        """
+        if filter is None and properties is None:
+            return self.pages
+        key = json.dumps([filter, properties], sort_keys=True)
+        with self.lock:
+            if key not in self._filtered:
+                pages = [json.loads(page) for page in self.pages]
+                self._filtered[key] = [json.dumps(project(page, properties)).encode() for page in pages
+                                       if filter is None or _matches(page, filter)]
+            return self._filtered[key]
+
+    def append(self, parent_id:str, children:list[dict]) ->list[dict]:
+        results = []
+        with self.lock:
+            for child in children:
+                type = child.get("type", "paragraph")
+                block = make_block(str(uuid.uuid4()), parent_id, type, bool(child.get(type, {}).get("children")))
+                self.children.setdefault(parent_id, []).append(block)
+                results.append(block)
+        return results
+
+
+_COMPARE = {
+    "equals":                   lambda value, target: value == target,
+    "does_not_equal":           lambda value, target: value != target,
+    "greater_than":             lambda value, target: value is not None and value > target,
+    "less_than":                lambda value, target: value is not None and value < target,
+    "greater_than_or_equal_to": lambda value, target: value is not None and value >= target,
+    "less_than_or_equal_to":    lambda value, target: value is not None and value <= target,
+    "after":                    lambda value, target: value is not None and value > target,
+    "before":                   lambda value, target: value is not None and value < target,
+    "on_or_after":              lambda value, target: value is not None and value >= target,
+    "on_or_before":             lambda value, target: value is not None and value <= target,
+    "is_empty":                 lambda value, target: value is None,
+    "is_not_empty":             lambda value, target: value is not None,
+}
+
+
+def _timestamp(value:str) ->float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _matches(page:dict, filter:dict) ->bool:
+    if "and" in filter:
+        return all(_matches(page, item) for item in filter["and"])
+    if "or" in filter:
+        return any(_matches(page, item) for item in filter["or"])
+    if "timestamp" in filter:
+        (condition, target), = filter[filter["timestamp"]].items()
+        value = _timestamp(page[filter["timestamp"]])
+        return _COMPARE[condition](value, _timestamp(target) if isinstance(target, str) else target)
+    item = page["properties"][filter["property"]]
+    (condition, target), = filter[item["type"]].items()
+    return _COMPARE[condition](item[item["type"]], target)
+
+
+def project(page:dict, properties:list[str] | None) ->dict:
+    """
+    Page with only property ids in "properties" [None: all]
+    """
+    if properties is None:
+        return page
+    return {**page, "properties": {name: item for name, item in page["properties"].items()
+                                   if item["id"] in properties}}
+
+
+def _paginate(items:list, body:dict) ->tuple[list, dict]:
+    start = int(body.get("start_cursor") or 0)
+    size = min(int(body.get("page_size") or 100), 100)
+    end = start + size
+    has_more = end < len(items)
+    return items[start:end], {"has_more": has_more, "next_cursor": str(end) if has_more else None}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # NOTE: Headers and body are separate writes, Nagle + delayed ACK would add ~40 ms per response
+    disable_nagle_algorithm = True
+    server:'FakeNotionServer'
+
+    ROUTES = [
+        ("GET",   re.compile(r"/v1/users/me"),                          "bot"),
+        ("GET",   re.compile(r"/v1/users"),                             "list_users"),
+        ("GET",   re.compile(r"/v1/users/(?P<id>[^/]+)"),               "retrieve_user"),
+        ("GET",   re.compile(r"/v1/databases/(?P<id>[^/]+)"),           "retrieve_database"),
+        ("POST",  re.compile(r"/v1/databases/(?P<id>[^/]+)/query"),     "query_database"),
+        ("POST",  re.compile(r"/v1/pages"),                             "create_page"),
+        ("GET",   re.compile(r"/v1/pages/(?P<id>[^/]+)"),               "retrieve_page"),
+        ("PATCH", re.compile(r"/v1/pages/(?P<id>[^/]+)"),               "update_page"),
+        ("GET",   re.compile(r"/v1/blocks/(?P<id>[^/]+)/children"),     "list_children"),
+        ("PATCH", re.compile(r"/v1/blocks/(?P<id>[^/]+)/children"),     "append_children"),
+        ("GET",   re.compile(r"/v1/blocks/(?P<id>[^/]+)"),              "retrieve_block"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def _dispatch(self, method:str) ->None:
+        path, _, query = self.path.partition("?")
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        for key, values in parse_qs(query).items():
+            body.setdefault(key, values if key == "filter_properties" else values[0])
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                try:
+                    payload = getattr(self, name)(body, **match.groupdict())
+                except (KeyError, ValueError) as error:
+                    self._send(400, {"object": "error", "status": 400, "code": "validation_error",
+                                     "message": f"Not supported by the fake server: {error!r}"})
+                    return
+                self._send(200, payload)
+                return
+        self._send(404, {"object": "error", "status": 404, "code": "object_not_found",
+                         "message": f"{method} {path} is not served by the fake server"})
+
+    def _send(self, status:int, payload:dict | bytes) ->None:
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    @property
+    def workspace(self) ->Workspace:
+        return self.server.workspace
+
+    def bot(self, body:dict) ->dict:
+        return {"object": "user", "id": "bench-bot", "type": "bot", "name": "Benchmark", "avatar_url": None, "bot": {}}
+
+    def list_users(self, body:dict) ->dict:
+        users, cursor = _paginate(self.workspace.users, body)
+        return {"object": "list", "results": users, "type": "user", "user": {}, **cursor}
+
+    def retrieve_user(self, body:dict, id:str) ->dict:
+        return _user(id)
+
+    def retrieve_database(self, body:dict, id:str) ->bytes:
+        return self.workspace.database
+
+    def query_database(self, body:dict, id:str) ->bytes:
+        pages, cursor = _paginate(self.workspace.query(body.get("filter"), body.get("filter_properties")), body)
+        return b'{"object": "list", "results": [' + b", ".join(pages) + b'], "type": "page", "page": {}, ' + json.dumps(cursor).encode()[1:]
+
+    def create_page(self, body:dict) ->dict:
+        page = make_page(len(self.workspace.pages))
+        page["id"] = str(uuid.uuid4())
+        return page
+
+    def retrieve_page(self, body:dict, id:str) ->dict:
+        page = make_page(int(id.rsplit("-", 1)[-1]) if id.startswith("page-") else 0)
+        return project(page, body.get("filter_properties"))
+
+    def update_page(self, body:dict, id:str) ->dict:
+        page = self.retrieve_page(body, id)
+        page["archived"] = body.get("archived", False)
+        return page
+
+    def list_children(self, body:dict, id:str) ->dict:
+        blocks, cursor = _paginate(self.workspace.children.get(id, []), body)
+        return {"object": "list", "results": blocks, "type": "block", "block": {}, **cursor}
+
+    def append_children(self, body:dict, id:str) ->dict:
+        blocks = self.workspace.append(id, body.get("children", []))
+        return {"object": "list", "results": blocks, "type": "block", "block": {},
+                "has_more": False, "next_cursor": None}
+
+    def retrieve_block(self, body:dict, id:str) ->dict:
+        return make_block(id, PAGE_ID)
+
+
+class FakeNotionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, workspace:Workspace, latency:float = 0.0, port:int = 0):
+        """
+        Fake Notion API server on localhost
+
+        Parameters:
+            workspace:  (Workspace) - Served data
+            latency:    (float)     - Seconds to sleep before each response
+            port:       (int)       - Port [Default: 0, any free port]
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.workspace = workspace
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self._thread:threading.Thread | None = None
+
+    @property
+    def url(self) ->str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) ->'FakeNotionServer':
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) ->None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) ->'FakeNotionServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) ->None:
+        self.stop()
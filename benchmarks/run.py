@@ -0,0 +1,187 @@
+"""
+Benchmarks of notion_kit against the local fake Notion server
+No token or network needed. Run from repository root:
+
+    python benchmarks/run.py                            # all benchmarks
+    python benchmarks/run.py -k database --pages 5000   # name contains "database"
+    python benchmarks/run.py --save baseline.json       # save result
+    python benchmarks/run.py --compare baseline.json    # exit 1 if slower than baseline by threshold
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from notion_kit import kit, object, Scheduler, Query, number_partitions  # noqa: E402
+from fake_notion import (Workspace, FakeNotionServer, DATABASE_ID,  # noqa: E402
+                         PAGE_ID, make_page)
+
+BENCHMARKS:dict[str, Callable[['Context'], int]] = {}
+
+
+def benchmark(name:str):
+    """
+    Register benchmark function
+    Function takes Context and returns number of processed items.
+    """
+    def register(function:Callable[['Context'], int]) ->Callable[['Context'], int]:
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+class Context:
+    def __init__(self, args:argparse.Namespace, server:FakeNotionServer):
+        self.args = args
+        self.server = server
+        # NOTE: Scheduler far above the fake server speed, so bulk writes are not paced to Notion rate limit
+        self.kit = kit("fake-token", base_url=server.url, scheduler=Scheduler(rate=1e6))
+        self.raw_pages = [make_page(i) for i in range(args.pages)]
+
+
+@benchmark("object.Page parse")
+def page_parse(ctx:Context) ->int:
+    for page in ctx.raw_pages:
+        object.Page.from_dict(page)
+    return len(ctx.raw_pages)
+
+
+@benchmark("database.get_pages")
+def database_get_pages(ctx:Context) ->int:
+    return len(ctx.kit.Database.get_pages(DATABASE_ID).results)
+
+
+@benchmark("database.iter_pages")
+def database_iter_pages(ctx:Context) ->int:
+    return sum(1 for _ in ctx.kit.Database.iter_pages(DATABASE_ID))
+
+
+@benchmark("database.iter_pages raw")
+def database_iter_pages_raw(ctx:Context) ->int:
+    return sum(1 for _ in ctx.kit.Database.iter_pages(DATABASE_ID, raw=True))
+
+
+@benchmark("database.iter_pages projected")
+def database_iter_pages_projected(ctx:Context) ->int:
+    query = Query(filter_properties=["Status", "Number"])
+    return sum(1 for _ in ctx.kit.Database.iter_pages(DATABASE_ID, query=query))
+
+
+@benchmark("database.scan")
+def database_scan(ctx:Context) ->int:
+    # "Number" of page i is i * 1.5
+    step = ctx.args.pages * 1.5 / ctx.args.partitions
+    partitions = number_partitions("Number", [step * index for index in range(1, ctx.args.partitions)] or [0])
+    return sum(1 for _ in ctx.kit.Database.scan(DATABASE_ID, partitions, max_workers=ctx.args.workers))
+
+
+@benchmark("database.export")
+def database_export(ctx:Context) ->int:
+    return len(ctx.kit.Database.export(DATABASE_ID))
+
+
+@benchmark("block.get_block_tree")
+def block_get_block_tree(ctx:Context) ->int:
+    def count(node:object.BlockTree) ->int:
+        return len(node.children) + sum(count(child) for child in node.children)
+    return count(ctx.kit.Block.get_block_tree(PAGE_ID, max_workers=ctx.args.workers))
+
+
+@benchmark("block.add_block")
+def block_add_block(ctx:Context) ->int:
+    blocks = [object.Block(type="paragraph",
+                           paragraph=object.Paragraph(rich_text=[object.RichText(text=object.TextContent(content=f"Block {i}"))]))
+              for i in range(ctx.args.writes)]
+    ctx.kit.Block.add_block("bench-append", blocks)
+    return len(blocks)
+
+
+@benchmark("page.bulk_create_in_database")
+def page_bulk_create(ctx:Context) ->int:
+    records = ((f"Page {i}", None) for i in range(ctx.args.writes))
+    report = ctx.kit.Page.bulk_create_in_database(DATABASE_ID, records, max_workers=ctx.args.workers).run()
+    return report.total
+
+
+@benchmark("page.update_queue")
+def page_update_queue(ctx:Context) ->int:
+    with ctx.kit.Page.update_queue(max_workers=ctx.args.workers) as queue:
+        for i in range(ctx.args.writes):
+            queue.put(f"page-{i % ctx.args.pages}", archived=False)
+    return ctx.args.writes
+
+
+def run(name:str, function:Callable[[Context], int], ctx:Context) ->dict:
+    times = []
+    requests = ctx.server.requests
+    for _ in range(ctx.args.repeat):
+        start = time.perf_counter()
+        items = function(ctx)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {"name": name, "items": items,
+            "requests": (ctx.server.requests - requests) // ctx.args.repeat,
+            "best": best, "median": statistics.median(times),
+            "items_per_sec": items / best if best else float("inf")}
+
+
+def compare(results:list[dict], baseline_path:str, threshold:float) ->list[str]:
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {result["name"]: result for result in json.load(file)["results"]}
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None:
+            continue
+        change = result["best"] / base["best"] - 1
+        result["change"] = change
+        if change > threshold:
+            regressions.append(f'{result["name"]}: {base["best"]*1000:.1f} ms -> {result["best"]*1000:.1f} ms (+{change:.0%})')
+    return regressions
+
+
+def main(argv:list[str] | None = None) ->int:
+    parser = argparse.ArgumentParser(description="notion_kit benchmarks with fake Notion server")
+    parser.add_argument("-k", dest="keyword", default="", help="Run benchmarks whose name contains this")
+    parser.add_argument("--pages", type=int, default=1000, help="Pages in the database")
+    parser.add_argument("--blocks", type=int, default=500, help="Blocks in the page tree")
+    parser.add_argument("--writes", type=int, default=200, help="Items of write benchmarks")
+    parser.add_argument("--workers", type=int, default=4, help="max_workers of concurrent methods")
+    parser.add_argument("--partitions", type=int, default=4, help="Range partitions of database.scan")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of server latency per request")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each benchmark, best is reported")
+    parser.add_argument("--save", help="Write results to JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file from --save")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown against baseline [0.2: 20%%]")
+    args = parser.parse_args(argv)
+
+    workspace = Workspace(pages=args.pages, blocks=args.blocks)
+    results = []
+    with FakeNotionServer(workspace, latency=args.latency) as server:
+        ctx = Context(args, server)
+        for name, function in BENCHMARKS.items():
+            if args.keyword in name:
+                results.append(run(name, function, ctx))
+        ctx.kit.http_client.close()
+
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+    print(f'{"benchmark":<32}{"items":>8}{"requests":>10}{"best ms":>10}{"median ms":>11}{"items/s":>12}{"change":>9}')
+    for result in results:
+        change = f'{result["change"]:+.0%}' if "change" in result else ""
+        print(f'{result["name"]:<32}{result["items"]:>8}{result["requests"]:>10}'
+              f'{result["best"]*1000:>10.1f}{result["median"]*1000:>11.1f}{result["items_per_sec"]:>12.0f}{change:>9}')
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"args": vars(args), "results": results}, file, indent=2)
+    for regression in regressions:
+        print("Regression:", regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
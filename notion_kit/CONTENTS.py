@@ -84,6 +84,52 @@ ROLLUP_TYPE_LIST = [
                     "number", "date", "array", "unsupported", "incomplete"
 ]
 
+#---------------------[Query]---------------------#
+_TEXT_FILTER_CONDITIONS = ["equals", "does_not_equal", "contains", "does_not_contain",
+                           "starts_with", "ends_with", "is_empty", "is_not_empty"]
+_DATE_FILTER_CONDITIONS = ["equals", "before", "after", "on_or_before", "on_or_after",
+                           "this_week", "past_week", "past_month", "past_year",
+                           "next_week", "next_month", "next_year",
+                           "is_empty", "is_not_empty"]
+_CONTAINS_FILTER_CONDITIONS = ["contains", "does_not_contain", "is_empty", "is_not_empty"]
+
+# NOTE: {property type: filter conditions}
+#       "formula" and "rollup" conditions are the nested type
+FILTER_CONDITIONS = {
+    "title":            _TEXT_FILTER_CONDITIONS,
+    "rich_text":        _TEXT_FILTER_CONDITIONS,
+    "url":              _TEXT_FILTER_CONDITIONS,
+    "email":            _TEXT_FILTER_CONDITIONS,
+    "phone_number":     _TEXT_FILTER_CONDITIONS,
+    "number":           ["equals", "does_not_equal", "greater_than", "less_than",
+                         "greater_than_or_equal_to", "less_than_or_equal_to",
+                         "is_empty", "is_not_empty"],
+    "checkbox":         ["equals", "does_not_equal"],
+    "select":           ["equals", "does_not_equal", "is_empty", "is_not_empty"],
+    "status":           ["equals", "does_not_equal", "is_empty", "is_not_empty"],
+    "multi_select":     _CONTAINS_FILTER_CONDITIONS,
+    "date":             _DATE_FILTER_CONDITIONS,
+    "created_time":     _DATE_FILTER_CONDITIONS,
+    "last_edited_time": _DATE_FILTER_CONDITIONS,
+    "people":           _CONTAINS_FILTER_CONDITIONS,
+    "created_by":       _CONTAINS_FILTER_CONDITIONS,
+    "last_edited_by":   _CONTAINS_FILTER_CONDITIONS,
+    "relation":         _CONTAINS_FILTER_CONDITIONS,
+    "files":            ["is_empty", "is_not_empty"],
+    "formula":          ["checkbox", "date", "number", "string"],
+    "rollup":           ["any", "every", "none", "date", "number"],
+}
+
+# NOTE: Conditions without value. "is_empty" / "is_not_empty" send True, relative dates send {}
+FILTER_EMPTY_CONDITIONS = ["is_empty", "is_not_empty"]
+FILTER_RELATIVE_DATE_CONDITIONS = ["this_week", "past_week", "past_month", "past_year",
+                                   "next_week", "next_month", "next_year"]
+
+FILTER_COMPOUND_OPERATORS = ["and", "or"]
+FILTER_NESTING_LIMIT = 2
+FILTER_TIMESTAMP_TYPES = ["created_time", "last_edited_time"]
+SORT_DIRECTIONS = ["ascending", "descending"]
+
 #---------------------[Block]---------------------#
 
 BLOCK_CHILDREN_TYPES = [
@@ -95,6 +141,11 @@ BLOCK_CHILDREN_TYPES = [
                         "page_or_database"
 ]
 
+# Append block children request limits
+BLOCK_APPEND_CHILDREN_LIMIT = 100
+BLOCK_APPEND_ELEMENTS_LIMIT = 1000
+BLOCK_APPEND_NESTING_LIMIT = 2
+
 BLOCK_TYPE_LIST = [
                     "paragraph", "heading_1", "heading_2", "heading_3", 
                     "callout", "quote", "bulleted_list_item",
@@ -23,7 +23,14 @@
 ####################################################################################
 from .tool import kit
 from .object import *
+from .scheduler import Scheduler
+from .cache import MemoryCache, SQLiteCache
+from .checkpoint import FileCheckpoint, SQLiteCheckpoint
+from .query import Query, Filter, TimestampFilter, Sort, timestamp_partitions, number_partitions
+from . import instrument
 
-__all__ = ["kit", "object"]
+__all__ = ["kit", "object", "Scheduler", "MemoryCache", "SQLiteCache", "FileCheckpoint", "SQLiteCheckpoint",
+           "Query", "Filter", "TimestampFilter", "Sort", "timestamp_partitions", "number_partitions",
+           "instrument"]
 
 # from notion_kit import Kit
\ No newline at end of file
@@ -21,23 +21,104 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 ####################################################################################
+import contextvars
+import time
+from dataclasses import replace
+from functools import partial
 from pprint import pprint
+from typing import Container, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from notion_client.errors import APIResponseError, APIErrorCode
 
-from notion_kit import object
+from notion_kit import object, instrument
+from notion_kit.bulk import BulkJob, UpdateQueue, merge_streams
+from notion_kit.export import ColumnarTable
+from notion_kit.query import Query, FilterMethod
+from notion_kit.cache import MemoryCache, SQLiteCache, UserDirectory
+from notion_kit.checkpoint import FileCheckpoint, SQLiteCheckpoint, Progress, checkpoint_key
+from notion_kit.scheduler import Scheduler, default_scheduler
 from notion_kit.CONTENTS import (
                         NON_CREATEABLE_PROPERTIES_TYPES,
                         NON_UPDATABLE_PROPERTIES_TYPES,
                         NON_UPDATABLE_PROPERTIES_ITEMS,
+                        BLOCK_APPEND_CHILDREN_LIMIT,
+                        BLOCK_APPEND_ELEMENTS_LIMIT,
+                        BLOCK_APPEND_NESTING_LIMIT,
                         )
 
 class Base_api:
-    def __init__(self, client, id:str | None):
+    def __init__(self, client, id:str | None, scheduler:Scheduler | None = None,
+                                              cache:MemoryCache | SQLiteCache | None = None):
         self.id = id
         self.client = client
+        self.scheduler = scheduler
+        self.cache = cache
     
+    def _request(self, function, *args, **kwargs):
+        """
+        Call notion client method, through scheduler if it is set
+        """
+        record = instrument.current()
+        if record is None:
+            if self.scheduler is None:
+                return function(*args, **kwargs)
+            return self.scheduler.call(function, *args, **kwargs)
+        
+        # NOTE: Latency of scheduled requests is added by the scheduler, wait time excluded
+        record.add(requests=1)
+        if self.scheduler is None:
+            start = time.perf_counter()
+            try:
+                response = function(*args, **kwargs)
+            finally:
+                record.add(latency=time.perf_counter() - start)
+        else:
+            response = self.scheduler.call(function, *args, **kwargs)
+        record.add(response_bytes=instrument.payload_size(response))
+        return response
+    
+    def _retrieve(self, key:str, last_edited_time:str | None, function, *args, **kwargs) ->dict:
+        """
+        Get response from cache if it is valid, otherwise request and store it
+        """
+        response = self._cached(key, last_edited_time)
+        if response is not None:
+            return response
+        response = self._request(function, *args, **kwargs)
+        self._store(key, response)
+        return response
+    
+    def _cached(self, key:str, last_edited_time:str | None) ->dict | None:
+        """
+        Response in cache if it is valid
+        """
+        if self.cache is None:
+            return None
+        response = self.cache.get(key, last_edited_time)
+        if response is not None:
+            record = instrument.current()
+            if record is not None:
+                record.add(cache_hits=1)
+        return response
+    
+    def _scheduled(self):
+        """
+        Self, or same api with the default scheduler of client if scheduler is not set
+        """
+        if self.scheduler is not None:
+            return self
+        return self.__class__(self.client, self.id, scheduler=default_scheduler(self.client), cache=self.cache)
+    
+    def _store(self, key:str, response:dict) ->dict:
+        if self.cache is not None:
+            self.cache.set(key, response)
+        return response
+    
+@instrument.instrumented
 class Page(Base_api):
-    def __init__(self, client, id:str | None):
-        super().__init__(client, id)
+    def __init__(self, client, id:str | None, scheduler:Scheduler | None = None,
+                                              cache:MemoryCache | SQLiteCache | None = None):
+        super().__init__(client, id, scheduler, cache)
         # if id is not None:
         #     self.page_dict = self.get_data(id)
         #     self.page_info = self.gadget.get_info(self.page_dict)
@@ -65,6 +146,47 @@ class Page(Base_api):
         Returns:
             object.Page:               (object.Page)            - New page
         """
+        kwargs = self._create_in_database_kwargs(parent_database_id, title,
+                                                 properties_item_dict, icon, cover)
+        return object.Page.from_dict(self._request(self.client.pages.create, **kwargs))
+    
+    def bulk_create_in_database(self, parent_database_id:str,
+                                      records:Iterable[tuple[object.RichText | str, dict[str,object.PropertyItem] | None]],
+                                      max_workers:int = 4,
+                                      skip:Container[int] | None = None) ->BulkJob:
+        """
+        Create many pages in database
+        Concurrent requests are bounded by "max_workers" and paced by scheduler.
+        If scheduler is not set, the default Scheduler of client (Notion rate limit) is used.
+        It is shared by bulk jobs, update queues and scans of the same client.
+        
+        Parameters:
+            parent_database_id:     (str)                   - Target database id
+            records:                (Iterable[tuple])       - (title, properties_item_dict) of each page. Read lazily
+                                                                title: object.RichText or str
+            max_workers:            (int)                   - Max concurrent requests
+            skip:                   (Container[int])        - Index of records to skip. Example: report.done_indices [For resume]
+            
+        Returns:
+            BulkJob:                (BulkJob)               - Iterate to stream BulkResult (value: object.Page),
+                                                              or ".run()" to get BulkReport
+        """
+        page_api = self._scheduled()
+        
+        def create(record) ->object.Page:
+            title, properties_item_dict = record
+            if type(title) == str:
+                title = object.RichText(text=object.TextContent(content=title))
+            return page_api.create_in_database(parent_database_id, title, properties_item_dict)
+        
+        return BulkJob(create, records, max_workers=max_workers, skip=skip)
+    
+    @staticmethod
+    def _create_in_database_kwargs(parent_database_id:str,
+                                   title:object.RichText | None,
+                                   properties_item_dict:dict[str,object.PropertyItem] | None = None,
+                                   icon:object.Icon | None = None,
+                                   cover:object.FileLink | None = None) ->dict:
         kwargs = {
             'parent': object.Parent(type="database_id", database_id=parent_database_id).Dict,  # type: ignore
             'properties': {"Name": {"title": [title.Dict]}}                      # type: ignore
@@ -81,7 +203,7 @@ class Page(Base_api):
             kwargs['icon'] = icon.Dict
         if cover is not None:
             kwargs['cover'] = cover.Dict
-        return object.Page(**self.client.pages.create(**kwargs))
+        return kwargs
    
     def create_in_page(self, parent_page_id, title:object.RichText | None = None,
                                             icon:object.Icon | None = None,
@@ -101,6 +223,13 @@ class Page(Base_api):
         Returns:
             object.Page:               (object.Page)            - New page
         """
+        kwargs = self._create_in_page_kwargs(parent_page_id, title, icon, cover)
+        return object.Page.from_dict(self._request(self.client.pages.create, **kwargs))
+    
+    @staticmethod
+    def _create_in_page_kwargs(parent_page_id, title:object.RichText | None = None,
+                                               icon:object.Icon | None = None,
+                                               cover:object.FileLink | None = None) ->dict:
         kwargs = {
             'parent': object.Parent(type="page_id", page_id=parent_page_id).Dict, # type: ignore
             'properties': {"title": [title.Dict]}, # type: ignore
@@ -109,44 +238,144 @@ class Page(Base_api):
             kwargs['icon'] = icon.Dict
         if cover is not None:
             kwargs['cover'] = cover.Dict
-        return object.Page(**self.client.pages.create(**kwargs))
+        return kwargs
      
-    def get_data(self, page_id:str) ->object.Page:
+    def get_data(self, page_id:str, last_edited_time:str | None = None,
+                                        properties:Iterable[str] | None = None,
+                                        database_id:str | None = None) ->object.Page:
         """
         Use notion client api get page info dict
+        If cache is set, cached page is used when it is valid.
+        With "properties", only these properties are parsed.
+        With "properties" and "database_id", names are converted to ids by schema of the database
+        (retrieved once, cached) and only these properties are requested ("filter_properties").
+        Without "database_id", full page is requested (or read from cache) and projected.
+        Projected response is not cached, but a cached full page is projected without request.
 
         Parameters:
             page_id:            (str)            - Target page id
+            last_edited_time:   (str)            - Known "last_edited_time" to validate cache [Optional]
+            properties:         (Iterable[str])  - Property names or ids [Optional, default: all]
+            database_id:        (str)            - Parent database of page [Optional]
             
         Return:
             object.Page:        (object.Page)    - Target page information
+        
+        Raises:
+            ValueError:  If property is not in page
         """   
-        return object.Page(**self.client.pages.retrieve(page_id))
+        if properties is None:
+            return object.Page.from_dict(self._retrieve(f"page:{page_id}", last_edited_time,
+                                                        self.client.pages.retrieve, page_id))
+        properties = list(properties)
+        if database_id is None:
+            # NOTE: "filter_properties" takes ids, names can not be resolved without database
+            response = self._retrieve(f"page:{page_id}", last_edited_time, self.client.pages.retrieve, page_id)
+        else:
+            properties = self._property_ids(database_id, properties)
+            response = self._cached(f"page:{page_id}", last_edited_time)
+            if response is None:
+                response = self._request(self.client.pages.retrieve, page_id, filter_properties=properties)
+        missing = self._missing_properties(response, properties)
+        if missing:
+            raise ValueError(f'Property "{missing[0]}" is not in page')
+        return object.Page.from_dict(response, properties)
+    
+    def _property_ids(self, database_id:str, properties:list[str]) ->list[str]:
+        database = object.Database(**self._retrieve(f"database:{database_id}", None,
+                                                    self.client.databases.retrieve, database_id))
+        return Query(filter_properties=properties).validate(database).filter_properties
     
-    def update(self, new_page_object:object.Page) ->object.Page:
+    @staticmethod
+    def _missing_properties(response:dict, properties:list[str]) ->list[str]:
+        found = set(response['properties'])
+        found.update(item['id'] for item in response['properties'].values())
+        return [name for name in properties if name not in found]
+    
+    def update(self, new_page_object:object.Page, full:bool = False) ->object.Page:
         """
         Update page 
+        Only properties changed after load (and "archived" / "icon" / "cover") are sent.
+        No request if nothing is changed.
 
         Parameters:
             new_page_object:        (object.Page)       - Will update dict of properties
+            full:                   (bool)              - Send all properties, "archived", "icon" and "cover"
             
         Return:
             object.Page:            (object.Page)       - New page dict
         """
-        page_dict = new_page_object.Dict
-        for name, value in page_dict['properties'].items():
-            if value is None:
-                continue
-            if value['type'] in NON_UPDATABLE_PROPERTIES_ITEMS:
-                new_page_object.properties.pop(name)
-        new_page_object.update()
+        kwargs = self._update_kwargs(new_page_object, full)
+        if not kwargs:
+            return new_page_object
+        page = object.Page.from_dict(self._store(f"page:{new_page_object.id}",
+                                                 self._request(self.client.pages.update, new_page_object.id, **kwargs)))
+        new_page_object.mark_clean()
+        return page
+    
+    @staticmethod
+    def _update_kwargs(new_page_object:object.Page, full:bool = False) ->dict:
+        return new_page_object.changes(full)
+    
+    def update_properties(self, page_id:str, properties:dict[str, object.PropertyItem | dict] | None = None,
+                                             **fields) ->object.Page:
+        """
+        Update given properties of page, without retrieving it
+
+        Parameters:
+            page_id:                (str)               - Target page id
+            properties:             (dict)              - {name: PropertyItem or property item dict} [Optional]
+            **fields:                                   - "archived", "icon", "cover" [Optional]
+            
+        Return:
+            object.Page:            (object.Page)       - New page dict
+        """
+        kwargs = self._properties_kwargs(properties, fields)
+        return object.Page.from_dict(self._store(f"page:{page_id}",
+                                                 self._request(self.client.pages.update, page_id, **kwargs)))
+    
+    @staticmethod
+    def _properties_kwargs(properties:dict[str, object.PropertyItem | dict] | None, fields:dict) ->dict:
+        for name in fields:
+            if name not in object.PAGE_UPDATE_FIELDS:
+                raise TypeError(f"Unexpected page field: '{name}'")
+        kwargs = {}
+        if properties:
+            kwargs['properties'] = {name: item if type(item) == dict else item.Dict
+                                    for name, item in properties.items()}
+        for name, value in fields.items():
+            kwargs[name] = value.Dict if isinstance(value, object.BaseMethod) else value
+        return kwargs
+    
+    def update_queue(self, max_pending:int = 100,
+                           max_delay:float = 1.0,
+                           max_workers:int = 4) ->UpdateQueue:
+        """
+        Queue of page updates
+        Changes of the same page are merged into one request, flushed by size or time.
+        If scheduler is not set, the default Scheduler of client (Notion rate limit) is used.
+        It is shared by bulk jobs, update queues and scans of the same client.
+
+        Parameters:
+            max_pending:            (int)               - Flush when this number of pages are pending
+            max_delay:              (float)             - Flush when the oldest change waits this seconds
+            max_workers:            (int)               - Max concurrent requests of a flush
+
+        Returns:
+            UpdateQueue:            (UpdateQueue)       - Use "put" / "put_page", "flush()" and "close()" [Context manager]
+        """
+        page_api = self._scheduled()
         
-        return object.Page(**self.client.pages.update(new_page_object.id, 
-                                                      **new_page_object.Dict))
+        def update(page_id:str, kwargs:dict) ->object.Page:
+            return page_api.update_properties(page_id, **kwargs)
+        
+        return UpdateQueue(update, max_pending=max_pending, max_delay=max_delay, max_workers=max_workers)
     
+@instrument.instrumented
 class Database(Base_api):
-    def __init__(self, client, id:str | None):
-        super().__init__(client, id)
+    def __init__(self, client, id:str | None, scheduler:Scheduler | None = None,
+                                              cache:MemoryCache | SQLiteCache | None = None):
+        super().__init__(client, id, scheduler, cache)
         # if id is not None:
         #     self.database_dict = self.get_data(id)
         #     self.page_dict = self.get_pages(id)
@@ -174,7 +403,16 @@ class Database(Base_api):
         Return:
             object.Database:           (object.Database)           - New database
         """
-        
+        kwargs = self._create_kwargs(parent_page_id, title, properties_type_list,
+                                     icon, cover, is_inline)
+        return object.Database(**self._request(self.client.databases.create, **kwargs))
+    
+    @staticmethod
+    def _create_kwargs(parent_page_id:str, title:object.RichText,
+                                           properties_type_list:list[object.PropertyType] | None = None,
+                                           icon:object.Icon | None = None,
+                                           cover:object.FileLink | None = None,
+                                           is_inline:bool = False) ->dict:
         kwargs = {
             'parent': object.Parent(page_id=parent_page_id, type='page_id').asdict(),
             'title': [title.Dict],
@@ -193,31 +431,266 @@ class Database(Base_api):
             kwargs['cover'] = cover.Dict
         if is_inline:
             kwargs['is_inline'] = is_inline
-        return object.Database(**self.client.databases.create(**kwargs))
+        return kwargs
     
-    def get_pages(self, database_id:str) ->object.DatabaseContainer:
+    def get_pages(self, database_id:str, query:Query | None = None,
+                                         validate:bool = True) ->object.DatabaseContainer:
         """
         Get database information
+        First page of query result. Use "iter_pages" for all pages.
+        Pages are parsed with only "filter_properties" of query, if it is set.
 
         Parameters:
             database_id:                (str)                       - Target database id
+            query:                      (Query)                     - Filter, sorts and filter_properties [Optional]
+            validate:                   (bool)                      - Check query against database schema before request
         
         Returns:
             object.DatabaseContainer:  (object.DatabaseContainer)   - Page information of database
         """
-        return object.DatabaseContainer(**self.client.databases.query(database_id))
+        kwargs = {}
+        if query is not None:
+            if validate:
+                query = query.validate(self.get_data(database_id))
+            kwargs = query.asdict()
+        response = self._request(self.client.databases.query, database_id, **kwargs)
+        if query is not None and query.filter_properties:
+            response['results'] = [object.Page.from_dict(page, query.filter_properties) for page in response['results']]
+        return object.DatabaseContainer(**response)
+
+    def iter_pages(self, database_id:str, filter:dict | None = None,
+                                          sorts:list[dict] | None = None,
+                                          page_size:int = 100,
+                                          query:Query | None = None,
+                                          validate:bool = True,
+                                          raw:bool = False,
+                                          prefetch:int = 1,
+                                          checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                                          checkpoint_interval:float = 0.0) ->Iterator[object.Page | dict]:
+        """
+        Iterate all pages of database
+        Follow "next_cursor" until "has_more" is False, and yield page one by one.
+        Next responses are requested in a background thread while pages of the current one are consumed.
+        With "checkpoint", cursor is saved after pages of each response are consumed, and the same
+        database and query resume from it. Checkpoint is deleted when all pages are consumed.
+        Pages are parsed with only "filter_properties" of query, if it is set.
+
+        Parameters:
+            database_id:        (str)               - Target database id
+            filter:             (dict)              - Query filter [Optional]
+            sorts:              (list[dict])        - Query sorts [Optional]
+            page_size:          (int)               - Number of pages per request. Max 100 [Optional]
+            query:              (Query)             - Query builder, instead of "filter" and "sorts" [Optional]
+            validate:           (bool)              - Check query against database schema before request
+            raw:                (bool)              - Yield response dict of page, not object.Page
+            prefetch:           (int)               - Max responses fetched ahead of the consumer [0: no background request]
+            checkpoint:         (FileCheckpoint | SQLiteCheckpoint) - Store of cursor [Optional]
+            checkpoint_interval:(float)             - Min seconds between saves [0: every response]
+
+        Yields:
+            object.Page:        (object.Page)       - Page of database
+        """
+        if query is not None and validate:
+            query = query.validate(self.get_data(database_id))
+        kwargs = self._query_kwargs(filter, sorts, page_size, query)
+        properties = (query.filter_properties or None) if query is not None else None
+        progress = Progress(checkpoint, checkpoint_key('iter_pages', database_id, kwargs), checkpoint_interval)
+        if progress.state is not None:
+            kwargs['start_cursor'] = progress.state['start_cursor']
+        if prefetch > 0:
+            responses = merge_streams([partial(self._query_responses, database_id, kwargs)],
+                                      max_workers=1, max_buffered=prefetch)
+        else:
+            responses = self._query_responses(database_id, kwargs)
+        completed = False
+        try:
+            for response in responses:
+                for page in response['results']:
+                    yield page if raw else object.Page.from_dict(page, properties)
+                if response['has_more'] and response['next_cursor'] is not None:
+                    progress.update({'start_cursor': response['next_cursor']})
+            completed = True
+        finally:
+            progress.close(completed)
+    
+    def _query_responses(self, database_id:str, kwargs:dict) ->Iterator[dict]:
+        while True:
+            response = self._request(self.client.databases.query, database_id, **kwargs)
+            yield response
+            if not response['has_more'] or response['next_cursor'] is None:
+                return
+            kwargs['start_cursor'] = response['next_cursor']
+    
+    def scan(self, database_id:str, partitions:Iterable[FilterMethod],
+                                    query:Query | None = None,
+                                    max_workers:int = 4,
+                                    page_size:int = 100,
+                                    validate:bool = True,
+                                    raw:bool = False,
+                                    max_buffered:int = 1000,
+                                    checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                                    checkpoint_interval:float = 0.0) ->Iterator[object.Page | dict]:
+        """
+        Iterate all pages of database by parallel partitions
+        Cursor chain of each partition runs concurrently, pages are yielded in arrival order (not sorted).
+        Partitions must be disjoint and cover all pages. Use "timestamp_partitions" / "number_partitions".
+        If scheduler is not set, the default Scheduler of client (Notion rate limit) is used.
+        It is shared by bulk jobs, update queues and scans of the same client.
+        With "checkpoint", cursor of each partition is saved, same as "iter_pages".
+
+        Parameters:
+            database_id:        (str)                   - Target database id
+            partitions:         (Iterable[FilterMethod])- Filter of each partition
+            query:              (Query)                 - Filter, sorts and filter_properties of all partitions [Optional]
+                                                          Filter is combined with partition filter by "and"
+            max_workers:        (int)                   - Max partitions queried at the same time
+            page_size:          (int)                   - Number of pages per request. Max 100 [Optional]
+            validate:           (bool)                  - Check queries against database schema before request
+            raw:                (bool)                  - Yield response dict of page, not object.Page
+            max_buffered:       (int)                   - Max fetched pages waiting for the consumer
+            checkpoint:         (FileCheckpoint | SQLiteCheckpoint) - Store of cursors [Optional]
+            checkpoint_interval:(float)                 - Min seconds between saves [0: every response]
+
+        Yields:
+            object.Page:        (object.Page)           - Page of database
+
+        Raises:
+            ValueError:  If combined filter is nested too deep, or query is invalid [validate]
+        """
+        queries = self._partition_queries(partitions, query)
+        if validate:
+            database = self.get_data(database_id)
+            queries = [partition_query.validate(database) for partition_query in queries]
+        properties = (query.filter_properties or None) if query is not None else None
+        for page in self._scan(database_id, queries, max_workers, page_size, max_buffered,
+                               checkpoint, checkpoint_interval):
+            yield page if raw else object.Page.from_dict(page, properties)
+    
+    def _scan(self, database_id:str, queries:list[Query], max_workers:int = 4,
+                    page_size:int = 100, max_buffered:int = 1000,
+                    checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                    checkpoint_interval:float = 0.0) ->Iterator[dict]:
+        database_api = self._scheduled()
+        kwargs_list = [self._query_kwargs(page_size=page_size, query=partition_query) for partition_query in queries]
+        progress = Progress(checkpoint, checkpoint_key('scan', database_id, kwargs_list), checkpoint_interval)
+        # NOTE: {partition index: start cursor}, None: partition is done, no entry: not started
+        cursors:dict[str, str | None] = dict(progress.state['cursors']) if progress.state is not None else {}
+        sources = [partial(database_api._partition_pages, database_id, str(index), kwargs, cursors.get(str(index)))
+                   for index, kwargs in enumerate(kwargs_list)
+                   if str(index) not in cursors or cursors[str(index)] is not None]
+        completed = False
+        try:
+            for item in merge_streams(sources, max_workers=max_workers, max_buffered=max_buffered):
+                if type(item) == tuple:
+                    index, cursors[index] = item
+                    progress.update({'cursors': dict(cursors)})
+                    continue
+                yield item
+            completed = True
+        finally:
+            progress.close(completed)
+    
+    def _partition_pages(self, database_id:str, index:str, kwargs:dict,
+                               start_cursor:str | None = None) ->Iterator[dict | tuple[str, str | None]]:
+        # Pages, then (index, next cursor) after pages of each response
+        if start_cursor is not None:
+            kwargs['start_cursor'] = start_cursor
+        for response in self._query_responses(database_id, kwargs):
+            yield from response['results']
+            has_more = response['has_more'] and response['next_cursor'] is not None
+            yield index, response['next_cursor'] if has_more else None
+    
+    @staticmethod
+    def _export_query(database:object.Database, columns:list[str] | None = None,
+                                                query:Query | None = None) ->Query | None:
+        # Request only exported columns
+        if columns is None or (query is not None and query.filter_properties):
+            return query
+        return replace(query if query is not None else Query(),
+                       filter_properties=[database.properties[name].id for name in columns]) # type: ignore
+    
+    @staticmethod
+    def _partition_queries(partitions:Iterable[FilterMethod], query:Query | None = None) ->list[Query]:
+        query = query if query is not None else Query()
+        return [Query(filter=partition if query.filter is None else query.filter & partition,
+                      sorts=query.sorts, filter_properties=query.filter_properties)
+                for partition in partitions]
+    
+    def export(self, database_id:str, columns:Iterable[str] | None = None,
+                                      query:Query | None = None,
+                                      validate:bool = True,
+                                      page_size:int = 100,
+                                      partitions:Iterable[FilterMethod] | None = None,
+                                      max_workers:int = 4,
+                                      id_column:str = 'id') ->ColumnarTable:
+        """
+        Export database pages into typed column buffers
+        Pages are streamed as response dicts, no object.Page is created.
+        With "columns", only these properties are requested, unless query has "filter_properties".
+
+        Parameters:
+            database_id:        (str)               - Target database id
+            columns:            (Iterable[str])     - Property names to export [Optional, default: all]
+            query:              (Query)             - Filter and sorts of pages [Optional]
+            validate:           (bool)              - Check query against database schema before request
+            page_size:          (int)               - Number of pages per request. Max 100 [Optional]
+            partitions:         (Iterable[FilterMethod]) - Scan partitions concurrently, same as "scan" [Optional]
+                                                      Rows are in arrival order
+            max_workers:        (int)               - Max partitions queried at the same time
+            id_column:          (str)               - Name of page id column [Default: "id"]
 
-    def get_data(self, database_id:str) ->object.Database:
+        Returns:
+            ColumnarTable:      (ColumnarTable)     - Columns. Use ".to_numpy()" / ".to_arrow()" / ".write_parquet()"
+        
+        Raises:
+            ValueError:  If property name is same as "id_column"
+        """
+        database = self.get_data(database_id)
+        columns = list(columns) if columns is not None else None
+        table = ColumnarTable.from_database(database, columns, id_column)
+        query = self._export_query(database, columns, query)
+        if partitions is not None:
+            queries = self._partition_queries(partitions, query)
+            if validate:
+                queries = [partition_query.validate(database) for partition_query in queries]
+            table.extend(self._scan(database_id, queries, max_workers, page_size))
+            return table
+        if query is not None and validate:
+            query = query.validate(database)
+        table.extend(self.iter_pages(database_id, page_size=page_size, query=query,
+                                     validate=False, raw=True))
+        return table
+    
+    @staticmethod
+    def _query_kwargs(filter:dict | None = None,
+                      sorts:list[dict] | None = None,
+                      page_size:int = 100,
+                      query:Query | None = None) ->dict:
+        kwargs = {'page_size': page_size}
+        if query is not None:
+            if filter is not None or sorts is not None:
+                raise ValueError('Use "query" or "filter" / "sorts", not both')
+            kwargs.update(query.asdict())
+        if filter is not None:
+            kwargs['filter'] = filter
+        if sorts is not None:
+            kwargs['sorts'] = sorts
+        return kwargs
+
+    def get_data(self, database_id:str, last_edited_time:str | None = None) ->object.Database:
         """
         Get database information
+        If cache is set, cached database is used when it is valid.
 
         Parameters:
             database_id:        (str)       - Target database id
+            last_edited_time:   (str)       - Known "last_edited_time" to validate cache [Optional]
 
         Returns:
             object.Database:    (object.Database)   - Database information
         """
-        return object.Database(**self.client.databases.retrieve(database_id))
+        return object.Database(**self._retrieve(f"database:{database_id}", last_edited_time,
+                                                self.client.databases.retrieve, database_id))
         
     def update(self, new_database_object:object.Database) ->object.Database:
         """
@@ -229,6 +702,12 @@ class Database(Base_api):
         Return:
             object.Database:            (object.Database)       - New database dict
         """
+        kwargs = self._update_kwargs(new_database_object)
+        return object.Database(**self._store(f"database:{new_database_object.id}",
+                                             self._request(self.client.databases.update, new_database_object.id, **kwargs)))
+    
+    @staticmethod
+    def _update_kwargs(new_database_object:object.Database) ->dict:
         database_dict = new_database_object.Dict
         for name, value in database_dict['properties'].items():
             if value is None:
@@ -236,12 +715,18 @@ class Database(Base_api):
             if value['type'] in NON_UPDATABLE_PROPERTIES_TYPES:
                 new_database_object.properties.pop(name)
         new_database_object.update()
-        
-        return object.Database(**self.client.databases.update(new_database_object.id, 
-                                                              **new_database_object.Dict))
+        return new_database_object.Dict
     
+@instrument.instrumented
 class User(Base_api):
-    def __dict_to_object(self, user_dict:dict) ->object.User | object.Bot | None:
+    def __init__(self, client, id:str | None, scheduler:Scheduler | None = None,
+                                              cache:MemoryCache | SQLiteCache | None = None,
+                                              directory_ttl:float | None = 3600):
+        super().__init__(client, id, scheduler=scheduler, cache=cache)
+        self.directory = UserDirectory(ttl=directory_ttl)
+    
+    @staticmethod
+    def _dict_to_object(user_dict:dict) ->object.User | object.Bot | None:
         """
         Convert dict to object
         
@@ -257,21 +742,81 @@ class User(Base_api):
             return object.Bot(**user_dict)
         return None
     
+    @staticmethod
+    def _is_not_found(error:APIResponseError) ->bool:
+        return error.code == APIErrorCode.ObjectNotFound
+    
+    @staticmethod
+    def _page_user_ids(page:object.Page | dict) ->list[str]:
+        """
+        User ids referenced by page: "created_by", "last_edited_by" and people / created_by / last_edited_by properties
+        """
+        if type(page) == dict:
+            page = object.Page.from_dict(page)
+        user_ids = [page.created_by.id, page.last_edited_by.id]
+        for item in page.properties.values():
+            if item.type == 'people':
+                user_ids.extend(user.id for user in item.people)
+            elif item.type in ('created_by', 'last_edited_by'):
+                user_ids.append(getattr(item, item.type).id)
+        return user_ids
+    
+    def iter_users(self, page_size:int = 100) ->Iterator[object.User | object.Bot]:
+        """
+        Iterate all users in workspace
+        Follow "next_cursor" until "has_more" is False.
+
+        Parameters:
+            page_size:      (int)       - Users per request [Max: 100]
+
+        Yields:
+            user:           (object.User | object.Bot)  - User
+        """
+        start_cursor = None
+        while True:
+            kwargs = {'page_size': page_size}
+            if start_cursor is not None:
+                kwargs['start_cursor'] = start_cursor
+            response = self._request(self.client.users.list, **kwargs)
+            for user in response['results']:
+                user = self._dict_to_object(user)
+                if user is not None:
+                    yield user
+            if not response.get('has_more') or response.get('next_cursor') is None:
+                return
+            start_cursor = response['next_cursor']
+    
     def get_user_list(self) ->list[object.User | object.Bot]:
         """
         Get user list
+        All pages of workspace user list. Directory is refreshed by the result.
 
         Returns:
             user_list:      (list)      - User list
         """
-        user_list = self.client.users.list()['results']
-        for i, user in enumerate(user_list):
-            user_list[i] = self.__dict_to_object(user)
+        user_list = list(self.iter_users())
+        self.directory.load(user_list)
         return user_list
     
+    def load_directory(self, force:bool = False) ->dict[str, object.User | object.Bot]:
+        """
+        Load user directory
+        Request full user list only when directory is not loaded or expired.
+
+        Parameters:
+            force:          (bool)      - Reload even if directory is valid
+
+        Returns:
+            users:          (dict)      - {user id: user}
+        """
+        if force or not self.directory.loaded:
+            self.get_user_list()
+        return self.directory.users()
+    
     def get_user_data(self, user_id:str) ->object.User | object.Bot | None:
         """
         Get user data
+        User in directory is returned without request.
 
         Parameters:
             user_id:        (str)                               - Target user id
@@ -279,8 +824,52 @@ class User(Base_api):
         Returns:
             user_data:      (object.User | object.Bot | None)   - User data [None if user not found]
         """
-        print(self.client.users.retrieve(user_id=user_id))
-        return  self.__dict_to_object(self.client.users.retrieve(user_id=user_id))
+        if user_id in self.directory:
+            return self.directory.get(user_id)
+        user = self._dict_to_object(self._request(self.client.users.retrieve, user_id=user_id))
+        self.directory.set(user_id, user)
+        return user
+    
+    def resolve(self, user_ids:Iterable[str]) ->dict[str, object.User | object.Bot | None]:
+        """
+        Resolve user ids in bulk
+        Directory is loaded once, only ids not in the list (Example: guests) are requested one by one.
+
+        Parameters:
+            user_ids:       (Iterable[str])     - User ids
+
+        Returns:
+            users:          (dict)              - {user id: user} [None if user not found]
+        """
+        self.load_directory()
+        users = {}
+        for user_id in user_ids:
+            if user_id in users:
+                continue
+            try:
+                users[user_id] = self.get_user_data(user_id)
+            except APIResponseError as error:
+                if not self._is_not_found(error):
+                    raise
+                self.directory.set(user_id, None)
+                users[user_id] = None
+        return users
+    
+    def resolve_pages(self, pages:Iterable[object.Page | dict]) ->dict[str, object.User | object.Bot | None]:
+        """
+        Resolve users referenced by pages in bulk
+        "created_by", "last_edited_by" and people / created_by / last_edited_by properties.
+
+        Parameters:
+            pages:          (Iterable[object.Page | dict])  - Pages
+
+        Returns:
+            users:          (dict)              - {user id: user} [None if user not found]
+        """
+        user_ids = {}
+        for page in pages:
+            user_ids.update(dict.fromkeys(self._page_user_ids(page)))
+        return self.resolve(user_ids)
     
     def who_am_i(self) ->object.Bot:
         """
@@ -290,20 +879,24 @@ class User(Base_api):
         Returns:
             object.Bot:     (object.Bot)    - Api user
         """
-        return object.Bot(**self.client.users.me())
+        return object.Bot(**self._request(self.client.users.me))
 
+@instrument.instrumented
 class Block(Base_api):
-    def get_data(self, id:str) ->object.Block:
+    def get_data(self, id:str, last_edited_time:str | None = None) ->object.Block:
         """
         Get block data
+        If cache is set, cached block is used when it is valid.
 
         Parameters:
             block_id:           (str)                   - Target block id or page id
+            last_edited_time:   (str)                   - Known "last_edited_time" to validate cache [Optional]
             
         Returns:
             object.BlockBase:   (object.BlockBase)      - Block data
         """
-        return object.Block(**self.client.blocks.retrieve(block_id=id))
+        return object.Block(**self._retrieve(f"block:{id}", last_edited_time,
+                                             self.client.blocks.retrieve, block_id=id))
     
     def get_children_blocks(self, id:str) ->object.BlockList:
         """
@@ -315,23 +908,192 @@ class Block(Base_api):
         Returns:
             object.BlockList:   (object.BlockList)      - Block childrens
         """
-        return object.BlockList(**self.client.blocks.children.list(block_id=id))
+        return object.BlockList(**self._request(self.client.blocks.children.list, block_id=id))
+    
+    def iter_children_blocks(self, id:str, page_size:int = 100) ->Iterator[object.Block]:
+        """
+        Iterate all block childrens
+        Follow "next_cursor" until "has_more" is False.
+
+        Parameters:
+            block_id:           (str)                   - Target block id or page id
+            page_size:          (int)                   - Number of blocks per request. Max 100 [Optional]
+        
+        Yields:
+            object.Block:       (object.Block)          - Block children
+        """
+        for block in self._children_dicts(id, page_size):
+            yield object.Block(**block)
+    
+    def _children_dicts(self, id:str, page_size:int = 100) ->Iterator[dict]:
+        kwargs = {'page_size': page_size}
+        while True:
+            response = self._request(self.client.blocks.children.list, block_id=id, **kwargs)
+            yield from response['results']
+            if not response['has_more'] or response['next_cursor'] is None:
+                return
+            kwargs['start_cursor'] = response['next_cursor']
+    
+    def get_block_tree(self, id:str, max_workers:int = 4,
+                                     max_depth:int | None = None,
+                                     expand_child_pages:bool = False,
+                                     checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None) ->object.BlockTree:
+        """
+        Get nested block tree
+        Childrens of each level are fetched concurrently by bounded worker pool.
+        (toggle, column_list, column, table, synced_block, ... any block with "has_children")
+        With "checkpoint", childrens of each block are saved when listed, and the same tree walk
+        resumes without requesting them again. Checkpoint is deleted when the tree is complete.
+
+        Parameters:
+            block_id:           (str)                   - Target block id or page id
+            max_workers:        (int)                   - Max concurrent requests [Paced by scheduler]
+            max_depth:          (int)                   - Max depth to expand. [Default: None, no limit]
+            expand_child_pages: (bool)                  - Expand child_page / child_database content [Default: False]
+            checkpoint:         (FileCheckpoint | SQLiteCheckpoint) - Store of listed childrens [Optional]
+        
+        Returns:
+            object.BlockTree:   (object.BlockTree)      - Root node of the tree (page itself)
+        """
+        # NOTE: Workers share the rate limit of client [Default scheduler if scheduler is not set]
+        block_api = self._scheduled()
+        key = checkpoint_key('block_tree', id, max_depth, expand_child_pages)
+        list_children = partial(block_api._list_children, checkpoint=checkpoint, key=key)
+        sources = [id]
+        root = object.BlockTree(id=id)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # NOTE: Workers run in a copy of the caller context, so requests count into its instrument record
+            pending = {executor.submit(contextvars.copy_context().run, list_children, id): (root, 0)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node, depth = pending.pop(future)
+                        for block in future.result():
+                            child = object.BlockTree(id=block.id, block=block)
+                            node.children.append(child)
+                            if self._is_expandable(block, expand_child_pages) and \
+                                (max_depth is None or depth + 1 < max_depth):
+                                sources.append(self._children_source(block))
+                                pending[executor.submit(contextvars.copy_context().run, list_children,
+                                                        sources[-1])] = (child, depth + 1)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        if checkpoint is not None:
+            for source in sources:
+                checkpoint.delete(f"{key}:{source}")
+        return root
+    
+    def _list_children(self, id:str, checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                                     key:str | None = None) ->list[object.Block]:
+        state = checkpoint.get(f"{key}:{id}") if checkpoint is not None else None
+        if state is None:
+            state = {'results': list(self._children_dicts(id))}
+            if checkpoint is not None:
+                checkpoint.set(f"{key}:{id}", state)
+        return [object.Block(**block) for block in state['results']]
+    
+    @staticmethod
+    def _is_expandable(block:object.Block, expand_child_pages:bool) ->bool:
+        if not block.has_children:
+            return False
+        if block.type in ('child_page', 'child_database'):
+            return expand_child_pages
+        return True
+    
+    @staticmethod
+    def _children_source(block:object.Block) ->str:
+        # Synced block duplicate: content is under the original block
+        if block.type == 'synced_block' and block.synced_block.synced_from is not None:
+            return block.synced_block.synced_from.block_id
+        return block.id
     
     def add_block(self, id:str, block_list:list) ->object.BlockList:
         """
         Append block childrens
+        Block list of any size and nesting depth is split into valid requests
+        (100 children, 1000 blocks, 2 nesting levels per request) and appended in order.
+        Deeper children are appended after their parent is created.
 
         Parameters:
             page_id:       (str)       - Target page id
             block_list:     (list)      - Will append block list
 
         Returns:
-            childrens:      (dict)      - Childrens list
+            childrens:      (dict)      - Childrens list [Merged top level blocks of all requests]
         """
-        block_list = [block if type(block) == dict else block.block_base_dict()
-                      for block in block_list]
-        return object.BlockList(**self.client.blocks.children.append(block_id=id,
-                                                                    children=block_list))
+        results = []
+        for children, deferred in self._append_batches(self._block_list_dicts(block_list)):
+            response = self._request(self.client.blocks.children.append,
+                                     block_id=id, children=children)
+            for block, block_deferred in zip(response['results'], deferred):
+                if block_deferred is not None:
+                    self._append_deferred(block['id'], block_deferred)
+            results.extend(response['results'])
+        return object.BlockList(results=results, type='block')
+    
+    def _append_deferred(self, id:str, deferred:tuple) ->None:
+        nested, overflow = deferred
+        if any(child_deferred is not None for child_deferred in nested):
+            for child, child_deferred in zip(self._list_children(id), nested):
+                if child_deferred is not None:
+                    self._append_deferred(child.id, child_deferred)
+        if overflow:
+            self.add_block(id, overflow)
+    
+    @staticmethod
+    def _block_list_dicts(block_list:list) ->list[dict]:
+        return [block if type(block) == dict else block.block_base_dict()
+                for block in block_list]
+    
+    @classmethod
+    def _append_batches(cls, block_list:list[dict]) ->Iterator[tuple[list[dict], list]]:
+        """
+        Split block list into append requests
+        Yield (children, deferred), "deferred" is aligned with "children":
+        None or (nested deferred of inline children, overflow children) to append later
+        """
+        children, deferred = [], []
+        budget = [BLOCK_APPEND_ELEMENTS_LIMIT]
+        for block in block_list:
+            if len(children) == BLOCK_APPEND_CHILDREN_LIMIT or budget[0] <= 0:
+                yield children, deferred
+                children, deferred = [], []
+                budget = [BLOCK_APPEND_ELEMENTS_LIMIT]
+            budget[0] -= 1
+            block, block_deferred = cls._split_block(block, 0, budget)
+            children.append(block)
+            deferred.append(block_deferred)
+        if children:
+            yield children, deferred
+    
+    @classmethod
+    def _split_block(cls, block:dict, depth:int, budget:list[int]) ->tuple[dict, tuple | None]:
+        payload = block.get(block.get('type'))
+        if type(payload) != dict or not payload.get('children'):
+            return block, None
+        
+        children = payload['children']
+        limit = BLOCK_APPEND_CHILDREN_LIMIT if depth < BLOCK_APPEND_NESTING_LIMIT else 0
+        inline, nested = [], []
+        for child in children[:limit]:
+            if budget[0] <= 0:
+                break
+            budget[0] -= 1
+            child, child_deferred = cls._split_block(child, depth + 1, budget)
+            inline.append(child)
+            nested.append(child_deferred)
+        overflow = children[len(inline):]
+        
+        payload = {key: value for key, value in payload.items() if key != 'children'}
+        if inline:
+            payload['children'] = inline
+        block = {**block, block['type']: payload}
+        if not overflow and all(child_deferred is None for child_deferred in nested):
+            return block, None
+        return block, (nested, overflow)
     
     def update(self, new_block_object: object.Block) ->object.Block:
         """
@@ -344,8 +1106,10 @@ class Block(Base_api):
         Returns:
             new_block_dict:      (dict)       - New block dict
         """
-        return object.Block(**self.client.blocks.update(block_id=new_block_object.id,
-                                                        **new_block_object.block_item()))
+        return object.Block(**self._store(f"block:{new_block_object.id}",
+                                          self._request(self.client.blocks.update,
+                                                        block_id=new_block_object.id,
+                                                        **new_block_object.block_item())))
     
     def del_block(self, block_id:str) ->object.Block:
         """
@@ -357,4 +1121,6 @@ class Block(Base_api):
         Returns:
             deleted_block: (dict)      - New block dict
         """
-        return object.Block(**self.client.blocks.delete(block_id=block_id))
+        if self.cache is not None:
+            self.cache.delete(f"block:{block_id}")
+        return object.Block(**self._request(self.client.blocks.delete, block_id=block_id))
@@ -0,0 +1,654 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import asyncio
+import time
+from typing import AsyncIterator, Container, Iterable
+
+from notion_client.errors import APIResponseError
+
+from notion_kit import object, instrument
+from notion_kit.api import Base_api, Page, Database, User, Block
+from notion_kit.bulk import AsyncBulkJob, AsyncUpdateQueue
+from notion_kit.cache import MemoryCache, SQLiteCache, UserDirectory
+from notion_kit.checkpoint import FileCheckpoint, SQLiteCheckpoint, Progress, checkpoint_key
+from notion_kit.export import ColumnarTable
+from notion_kit.query import Query, FilterMethod
+from notion_kit.scheduler import Scheduler
+
+# NOTE: Awaitable counterparts of "api" classes.
+#       Request body is built by the same helpers as the sync version,
+#       only the client call is awaited. Use with notion_client.AsyncClient.
+
+async def _prefetch(iterator:AsyncIterator, depth:int) ->AsyncIterator:
+    """
+    Read "iterator" ahead by a background task, at most "depth" items wait for the consumer
+    """
+    buffer:asyncio.Queue = asyncio.Queue(maxsize=depth)
+    
+    async def work() ->None:
+        try:
+            async for item in iterator:
+                await buffer.put((True, item))
+        except Exception as error:
+            await buffer.put((False, error))
+            return
+        await buffer.put(None)
+    
+    task = asyncio.create_task(work())
+    try:
+        while (entry := await buffer.get()) is not None:
+            ok, value = entry
+            if not ok:
+                raise value
+            yield value
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+class AsyncBase_api(Base_api):
+    async def _request(self, function, *args, **kwargs):
+        """
+        Await notion client method, through scheduler if it is set
+        """
+        record = instrument.current()
+        if record is None:
+            if self.scheduler is None:
+                return await function(*args, **kwargs)
+            return await self.scheduler.acall(function, *args, **kwargs)
+        
+        # NOTE: Latency of scheduled requests is added by the scheduler, wait time excluded
+        record.add(requests=1)
+        if self.scheduler is None:
+            start = time.perf_counter()
+            try:
+                response = await function(*args, **kwargs)
+            finally:
+                record.add(latency=time.perf_counter() - start)
+        else:
+            response = await self.scheduler.acall(function, *args, **kwargs)
+        record.add(response_bytes=instrument.payload_size(response))
+        return response
+    
+    async def _retrieve(self, key:str, last_edited_time:str | None, function, *args, **kwargs) ->dict:
+        """
+        Get response from cache if it is valid, otherwise request and store it
+        """
+        response = await self._cached(key, last_edited_time)
+        if response is not None:
+            return response
+        response = await self._request(function, *args, **kwargs)
+        await self._store(key, response)
+        return response
+    
+    async def _cached(self, key:str, last_edited_time:str | None) ->dict | None:
+        """
+        Response in cache if it is valid [Awaitable]
+        """
+        if self.cache is None:
+            return None
+        response = await _offload(self.cache.get, key, last_edited_time)
+        if response is not None:
+            record = instrument.current()
+            if record is not None:
+                record.add(cache_hits=1)
+        return response
+    
+    async def _store(self, key:str, response:dict) ->dict:
+        if self.cache is not None:
+            await _offload(self.cache.set, key, response)
+        return response
+
+# NOTE: SQLiteCache and checkpoint store calls block, so they run in a worker thread and the event loop
+#       keeps serving other tasks. MemoryCache only takes a lock, it is called directly.
+async def _offload(function, *args):
+    if isinstance(getattr(function, '__self__', None), MemoryCache):
+        return function(*args)
+    return await asyncio.to_thread(function, *args)
+
+async def _progress(store:FileCheckpoint | SQLiteCheckpoint | None, key:str, interval:float) ->Progress:
+    # Progress with saved state loaded in a worker thread
+    if store is None:
+        return Progress(None, key, interval)
+    return await asyncio.to_thread(Progress, store, key, interval)
+
+@instrument.instrumented
+class AsyncPage(AsyncBase_api):
+    async def create_in_database(self, parent_database_id:str,
+                                       title:object.RichText | None ,
+                                       properties_item_dict:dict[str,object.PropertyItem] | None = None,
+                                       icon:object.Icon | None = None,
+                                       cover:object.FileLink | None = None
+                                       ) ->object.Page:
+        """
+        Create page in database [Awaitable]
+        Same as api.Page.create_in_database
+        """
+        kwargs = Page._create_in_database_kwargs(parent_database_id, title,
+                                                 properties_item_dict, icon, cover)
+        return object.Page.from_dict(await self._request(self.client.pages.create, **kwargs))
+    
+    async def create_in_page(self, parent_page_id, title:object.RichText | None = None,
+                                                  icon:object.Icon | None = None,
+                                                  cover:object.FileLink | None = None,
+                                                  ) ->object.Page:
+        """
+        Create page in page [Awaitable]
+        Same as api.Page.create_in_page
+        """
+        kwargs = Page._create_in_page_kwargs(parent_page_id, title, icon, cover)
+        return object.Page.from_dict(await self._request(self.client.pages.create, **kwargs))
+    
+    async def get_data(self, page_id:str, last_edited_time:str | None = None,
+                                              properties:Iterable[str] | None = None,
+                                              database_id:str | None = None) ->object.Page:
+        """
+        Get page data [Awaitable]
+        Same as api.Page.get_data
+        """
+        if properties is None:
+            return object.Page.from_dict(await self._retrieve(f"page:{page_id}", last_edited_time,
+                                                              self.client.pages.retrieve, page_id))
+        properties = list(properties)
+        if database_id is None:
+            response = await self._retrieve(f"page:{page_id}", last_edited_time, self.client.pages.retrieve, page_id)
+        else:
+            properties = await self._property_ids(database_id, properties)
+            response = await self._cached(f"page:{page_id}", last_edited_time)
+            if response is None:
+                response = await self._request(self.client.pages.retrieve, page_id, filter_properties=properties)
+        missing = Page._missing_properties(response, properties)
+        if missing:
+            raise ValueError(f'Property "{missing[0]}" is not in page')
+        return object.Page.from_dict(response, properties)
+    
+    async def _property_ids(self, database_id:str, properties:list[str]) ->list[str]:
+        database = object.Database(**await self._retrieve(f"database:{database_id}", None,
+                                                          self.client.databases.retrieve, database_id))
+        return Query(filter_properties=properties).validate(database).filter_properties
+    
+    async def update(self, new_page_object:object.Page, full:bool = False) ->object.Page:
+        """
+        Update page [Awaitable]
+        Same as api.Page.update
+        """
+        kwargs = Page._update_kwargs(new_page_object, full)
+        if not kwargs:
+            return new_page_object
+        page = object.Page.from_dict(await self._store(f"page:{new_page_object.id}",
+                                                 await self._request(self.client.pages.update, new_page_object.id, **kwargs)))
+        new_page_object.mark_clean()
+        return page
+    
+    async def update_properties(self, page_id:str, properties:dict[str, object.PropertyItem | dict] | None = None,
+                                                   **fields) ->object.Page:
+        """
+        Update given properties of page, without retrieving it [Awaitable]
+        Same as api.Page.update_properties
+        """
+        kwargs = Page._properties_kwargs(properties, fields)
+        return object.Page.from_dict(await self._store(f"page:{page_id}",
+                                                 await self._request(self.client.pages.update, page_id, **kwargs)))
+    
+    def bulk_create_in_database(self, parent_database_id:str,
+                                      records:Iterable[tuple[object.RichText | str, dict[str,object.PropertyItem] | None]],
+                                      max_workers:int = 4,
+                                      skip:Container[int] | None = None) ->AsyncBulkJob:
+        """
+        Create many pages in database
+        Same as api.Page.bulk_create_in_database, return AsyncBulkJob ["async for" or "await run()"]
+        """
+        page_api = self._scheduled()
+        
+        async def create(record) ->object.Page:
+            title, properties_item_dict = record
+            if type(title) == str:
+                title = object.RichText(text=object.TextContent(content=title))
+            return await page_api.create_in_database(parent_database_id, title, properties_item_dict)
+        
+        return AsyncBulkJob(create, records, max_workers=max_workers, skip=skip)
+    
+    def update_queue(self, max_pending:int = 100,
+                           max_delay:float = 1.0,
+                           max_workers:int = 4) ->AsyncUpdateQueue:
+        """
+        Queue of page updates
+        Same as api.Page.update_queue, return AsyncUpdateQueue [Awaitable "put" / "put_page" / "flush" / "close", "async with"]
+        """
+        page_api = self._scheduled()
+        
+        async def update(page_id:str, kwargs:dict) ->object.Page:
+            return await page_api.update_properties(page_id, **kwargs)
+        
+        return AsyncUpdateQueue(update, max_pending=max_pending, max_delay=max_delay, max_workers=max_workers)
+
+@instrument.instrumented
+class AsyncDatabase(AsyncBase_api):
+    async def create(self, parent_page_id:str, title:object.RichText,
+                                               properties_type_list:list[object.PropertyType] | None = None,
+                                               icon:object.Icon | None = None,
+                                               cover:object.FileLink | None = None,
+                                               is_inline:bool = False) ->object.Database:
+        """
+        Create database [Awaitable]
+        Same as api.Database.create
+        """
+        kwargs = Database._create_kwargs(parent_page_id, title, properties_type_list,
+                                         icon, cover, is_inline)
+        return object.Database(**await self._request(self.client.databases.create, **kwargs))
+    
+    async def get_pages(self, database_id:str, query:Query | None = None,
+                                               validate:bool = True) ->object.DatabaseContainer:
+        """
+        Get first pages of database [Awaitable]
+        Same as api.Database.get_pages
+        """
+        kwargs = {}
+        if query is not None:
+            if validate:
+                query = query.validate(await self.get_data(database_id))
+            kwargs = query.asdict()
+        response = await self._request(self.client.databases.query, database_id, **kwargs)
+        if query is not None and query.filter_properties:
+            response['results'] = [object.Page.from_dict(page, query.filter_properties) for page in response['results']]
+        return object.DatabaseContainer(**response)
+    
+    async def iter_pages(self, database_id:str, filter:dict | None = None,
+                                                sorts:list[dict] | None = None,
+                                                page_size:int = 100,
+                                                query:Query | None = None,
+                                                validate:bool = True,
+                                                raw:bool = False,
+                                                prefetch:int = 1,
+                                                checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                                                checkpoint_interval:float = 0.0) ->AsyncIterator[object.Page | dict]:
+        """
+        Iterate all pages of database [Async generator]
+        Same as api.Database.iter_pages. Next responses are requested by a background task.
+        """
+        if query is not None and validate:
+            query = query.validate(await self.get_data(database_id))
+        kwargs = Database._query_kwargs(filter, sorts, page_size, query)
+        properties = (query.filter_properties or None) if query is not None else None
+        progress = await _progress(checkpoint, checkpoint_key('iter_pages', database_id, kwargs), checkpoint_interval)
+        if progress.state is not None:
+            kwargs['start_cursor'] = progress.state['start_cursor']
+        responses = self._query_responses(database_id, kwargs)
+        if prefetch > 0:
+            responses = _prefetch(responses, prefetch)
+        completed = False
+        try:
+            async for response in responses:
+                for page in response['results']:
+                    yield page if raw else object.Page.from_dict(page, properties)
+                if response['has_more'] and response['next_cursor'] is not None:
+                    await progress.aupdate({'start_cursor': response['next_cursor']})
+            completed = True
+        finally:
+            await progress.aclose(completed)
+    
+    async def _query_responses(self, database_id:str, kwargs:dict) ->AsyncIterator[dict]:
+        while True:
+            response = await self._request(self.client.databases.query, database_id, **kwargs)
+            yield response
+            if not response['has_more'] or response['next_cursor'] is None:
+                return
+            kwargs['start_cursor'] = response['next_cursor']
+    
+    async def scan(self, database_id:str, partitions:Iterable[FilterMethod],
+                                          query:Query | None = None,
+                                          max_workers:int = 4,
+                                          page_size:int = 100,
+                                          validate:bool = True,
+                                          raw:bool = False,
+                                          max_buffered:int = 1000,
+                                          checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                                          checkpoint_interval:float = 0.0) ->AsyncIterator[object.Page | dict]:
+        """
+        Iterate all pages of database by parallel partitions [Async generator]
+        Same as api.Database.scan
+        """
+        queries = Database._partition_queries(partitions, query)
+        if validate:
+            database = await self.get_data(database_id)
+            queries = [partition_query.validate(database) for partition_query in queries]
+        properties = (query.filter_properties or None) if query is not None else None
+        async for page in self._scan(database_id, queries, max_workers, page_size, max_buffered,
+                                     checkpoint, checkpoint_interval):
+            yield page if raw else object.Page.from_dict(page, properties)
+    
+    async def _scan(self, database_id:str, queries:list[Query], max_workers:int = 4,
+                          page_size:int = 100, max_buffered:int = 1000,
+                          checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                          checkpoint_interval:float = 0.0) ->AsyncIterator[dict]:
+        database_api = self._scheduled()
+        kwargs_list = [Database._query_kwargs(page_size=page_size, query=partition_query) for partition_query in queries]
+        progress = await _progress(checkpoint, checkpoint_key('scan', database_id, kwargs_list), checkpoint_interval)
+        cursors:dict[str, str | None] = dict(progress.state['cursors']) if progress.state is not None else {}
+        pending = iter([(str(index), kwargs, cursors.get(str(index)))
+                        for index, kwargs in enumerate(kwargs_list)
+                        if str(index) not in cursors or cursors[str(index)] is not None])
+        buffer:asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+        
+        async def work() ->None:
+            try:
+                for index, kwargs, start_cursor in pending:
+                    async for item in database_api._partition_pages(database_id, index, kwargs, start_cursor):
+                        await buffer.put((True, item))
+            except Exception as error:
+                await buffer.put((False, error))
+                return
+            await buffer.put(None)
+        
+        tasks = [asyncio.create_task(work()) for _ in range(max(1, min(max_workers, len(kwargs_list))))]
+        completed = False
+        try:
+            running = len(tasks)
+            while running:
+                entry = await buffer.get()
+                if entry is None:
+                    running -= 1
+                    continue
+                ok, value = entry
+                if not ok:
+                    raise value
+                if type(value) == tuple:
+                    index, cursors[index] = value
+                    await progress.aupdate({'cursors': dict(cursors)})
+                    continue
+                yield value
+            completed = True
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await progress.aclose(completed)
+    
+    async def _partition_pages(self, database_id:str, index:str, kwargs:dict,
+                                     start_cursor:str | None = None) ->AsyncIterator[dict | tuple[str, str | None]]:
+        if start_cursor is not None:
+            kwargs['start_cursor'] = start_cursor
+        async for response in self._query_responses(database_id, kwargs):
+            for page in response['results']:
+                yield page
+            has_more = response['has_more'] and response['next_cursor'] is not None
+            yield index, response['next_cursor'] if has_more else None
+    
+    async def export(self, database_id:str, columns:Iterable[str] | None = None,
+                                            query:Query | None = None,
+                                            validate:bool = True,
+                                            page_size:int = 100,
+                                            partitions:Iterable[FilterMethod] | None = None,
+                                            max_workers:int = 4,
+                                            id_column:str = 'id') ->ColumnarTable:
+        """
+        Export database pages into typed column buffers [Awaitable]
+        Same as api.Database.export
+        """
+        database = await self.get_data(database_id)
+        columns = list(columns) if columns is not None else None
+        table = ColumnarTable.from_database(database, columns, id_column)
+        query = Database._export_query(database, columns, query)
+        if partitions is not None:
+            queries = Database._partition_queries(partitions, query)
+            if validate:
+                queries = [partition_query.validate(database) for partition_query in queries]
+            async for page in self._scan(database_id, queries, max_workers, page_size):
+                table.append(page)
+            return table
+        if query is not None and validate:
+            query = query.validate(database)
+        async for page in self.iter_pages(database_id, page_size=page_size, query=query,
+                                          validate=False, raw=True):
+            table.append(page)
+        return table
+    
+    async def get_data(self, database_id:str, last_edited_time:str | None = None) ->object.Database:
+        """
+        Get database information [Awaitable]
+        Same as api.Database.get_data
+        """
+        return object.Database(**await self._retrieve(f"database:{database_id}", last_edited_time,
+                                                      self.client.databases.retrieve, database_id))
+    
+    async def update(self, new_database_object:object.Database) ->object.Database:
+        """
+        Update database [Awaitable]
+        Same as api.Database.update
+        """
+        kwargs = Database._update_kwargs(new_database_object)
+        return object.Database(**await self._store(f"database:{new_database_object.id}",
+                                             await self._request(self.client.databases.update, new_database_object.id, **kwargs)))
+
+@instrument.instrumented
+class AsyncUser(AsyncBase_api):
+    def __init__(self, client, id:str | None, scheduler:Scheduler | None = None,
+                                              cache:MemoryCache | SQLiteCache | None = None,
+                                              directory_ttl:float | None = 3600):
+        super().__init__(client, id, scheduler=scheduler, cache=cache)
+        self.directory = UserDirectory(ttl=directory_ttl)
+    
+    async def iter_users(self, page_size:int = 100) ->AsyncIterator[object.User | object.Bot]:
+        """
+        Iterate all users in workspace [Async iterator]
+        Same as api.User.iter_users
+        """
+        start_cursor = None
+        while True:
+            kwargs = {'page_size': page_size}
+            if start_cursor is not None:
+                kwargs['start_cursor'] = start_cursor
+            response = await self._request(self.client.users.list, **kwargs)
+            for user in response['results']:
+                user = User._dict_to_object(user)
+                if user is not None:
+                    yield user
+            if not response.get('has_more') or response.get('next_cursor') is None:
+                return
+            start_cursor = response['next_cursor']
+    
+    async def get_user_list(self) ->list[object.User | object.Bot]:
+        """
+        Get user list [Awaitable]
+        Same as api.User.get_user_list
+        """
+        user_list = [user async for user in self.iter_users()]
+        self.directory.load(user_list)
+        return user_list
+    
+    async def load_directory(self, force:bool = False) ->dict[str, object.User | object.Bot]:
+        """
+        Load user directory [Awaitable]
+        Same as api.User.load_directory
+        """
+        if force or not self.directory.loaded:
+            await self.get_user_list()
+        return self.directory.users()
+    
+    async def get_user_data(self, user_id:str) ->object.User | object.Bot | None:
+        """
+        Get user data [Awaitable]
+        Same as api.User.get_user_data
+        """
+        if user_id in self.directory:
+            return self.directory.get(user_id)
+        user = User._dict_to_object(await self._request(self.client.users.retrieve, user_id=user_id))
+        self.directory.set(user_id, user)
+        return user
+    
+    async def resolve(self, user_ids:Iterable[str]) ->dict[str, object.User | object.Bot | None]:
+        """
+        Resolve user ids in bulk [Awaitable]
+        Same as api.User.resolve
+        """
+        await self.load_directory()
+        users = {}
+        for user_id in user_ids:
+            if user_id in users:
+                continue
+            try:
+                users[user_id] = await self.get_user_data(user_id)
+            except APIResponseError as error:
+                if not User._is_not_found(error):
+                    raise
+                self.directory.set(user_id, None)
+                users[user_id] = None
+        return users
+    
+    async def resolve_pages(self, pages:Iterable[object.Page | dict]) ->dict[str, object.User | object.Bot | None]:
+        """
+        Resolve users referenced by pages in bulk [Awaitable]
+        Same as api.User.resolve_pages
+        """
+        user_ids = {}
+        for page in pages:
+            user_ids.update(dict.fromkeys(User._page_user_ids(page)))
+        return await self.resolve(user_ids)
+    
+    async def who_am_i(self) ->object.Bot:
+        """
+        Get api user [Awaitable]
+        Same as api.User.who_am_i
+        """
+        return object.Bot(**await self._request(self.client.users.me))
+
+@instrument.instrumented
+class AsyncBlock(AsyncBase_api):
+    async def get_data(self, id:str, last_edited_time:str | None = None) ->object.Block:
+        """
+        Get block data [Awaitable]
+        Same as api.Block.get_data
+        """
+        return object.Block(**await self._retrieve(f"block:{id}", last_edited_time,
+                                                   self.client.blocks.retrieve, block_id=id))
+    
+    async def get_children_blocks(self, id:str) ->object.BlockList:
+        """
+        Get block childrens [Awaitable]
+        Same as api.Block.get_children_blocks
+        """
+        return object.BlockList(**await self._request(self.client.blocks.children.list, block_id=id))
+    
+    async def iter_children_blocks(self, id:str, page_size:int = 100) ->AsyncIterator[object.Block]:
+        """
+        Iterate all block childrens [Async generator]
+        Same as api.Block.iter_children_blocks
+        """
+        async for block in self._children_dicts(id, page_size):
+            yield object.Block(**block)
+    
+    async def _children_dicts(self, id:str, page_size:int = 100) ->AsyncIterator[dict]:
+        kwargs = {'page_size': page_size}
+        while True:
+            response = await self._request(self.client.blocks.children.list, block_id=id, **kwargs)
+            for block in response['results']:
+                yield block
+            if not response['has_more'] or response['next_cursor'] is None:
+                return
+            kwargs['start_cursor'] = response['next_cursor']
+    
+    async def get_block_tree(self, id:str, max_workers:int = 4,
+                                           max_depth:int | None = None,
+                                           expand_child_pages:bool = False,
+                                           checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None) ->object.BlockTree:
+        """
+        Get nested block tree [Awaitable]
+        Same as api.Block.get_block_tree, "max_workers" bounds concurrent requests.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+        block_api = self._scheduled()
+        key = checkpoint_key('block_tree', id, max_depth, expand_child_pages)
+        sources = [id]
+        
+        async def expand(node:object.BlockTree, source_id:str, depth:int) -> None:
+            async with semaphore:
+                blocks = await block_api._list_children(source_id, checkpoint, key)
+            tasks = []
+            for block in blocks:
+                child = object.BlockTree(id=block.id, block=block)
+                node.children.append(child)
+                if Block._is_expandable(block, expand_child_pages) and \
+                    (max_depth is None or depth + 1 < max_depth):
+                    sources.append(Block._children_source(block))
+                    tasks.append(expand(child, sources[-1], depth + 1))
+            await asyncio.gather(*tasks)
+        
+        root = object.BlockTree(id=id)
+        await expand(root, id, 0)
+        if checkpoint is not None:
+            for source in sources:
+                await _offload(checkpoint.delete, f"{key}:{source}")
+        return root
+    
+    async def _list_children(self, id:str, checkpoint:FileCheckpoint | SQLiteCheckpoint | None = None,
+                                           key:str | None = None) ->list[object.Block]:
+        state = await _offload(checkpoint.get, f"{key}:{id}") if checkpoint is not None else None
+        if state is None:
+            state = {'results': [block async for block in self._children_dicts(id)]}
+            if checkpoint is not None:
+                await _offload(checkpoint.set, f"{key}:{id}", state)
+        return [object.Block(**block) for block in state['results']]
+    
+    async def add_block(self, id:str, block_list:list) ->object.BlockList:
+        """
+        Append block childrens [Awaitable]
+        Same as api.Block.add_block
+        """
+        results = []
+        for children, deferred in Block._append_batches(Block._block_list_dicts(block_list)):
+            response = await self._request(self.client.blocks.children.append,
+                                           block_id=id, children=children)
+            for block, block_deferred in zip(response['results'], deferred):
+                if block_deferred is not None:
+                    await self._append_deferred(block['id'], block_deferred)
+            results.extend(response['results'])
+        return object.BlockList(results=results, type='block')
+    
+    async def _append_deferred(self, id:str, deferred:tuple) ->None:
+        nested, overflow = deferred
+        if any(child_deferred is not None for child_deferred in nested):
+            children = [child async for child in self.iter_children_blocks(id)]
+            for child, child_deferred in zip(children, nested):
+                if child_deferred is not None:
+                    await self._append_deferred(child.id, child_deferred)
+        if overflow:
+            await self.add_block(id, overflow)
+    
+    async def update(self, new_block_object: object.Block) ->object.Block:
+        """
+        Update block [Awaitable]
+        Same as api.Block.update
+        """
+        return object.Block(**await self._store(f"block:{new_block_object.id}",
+                                          await self._request(self.client.blocks.update,
+                                                              block_id=new_block_object.id,
+                                                              **new_block_object.block_item())))
+    
+    async def del_block(self, block_id:str) ->object.Block:
+        """
+        Delete block [Awaitable]
+        Same as api.Block.del_block
+        """
+        if self.cache is not None:
+            await _offload(self.cache.delete, f"block:{block_id}")
+        return object.Block(**await self._request(self.client.blocks.delete, block_id=block_id))
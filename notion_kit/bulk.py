@@ -0,0 +1,648 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import asyncio
+import contextvars
+import inspect
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Container, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# FC: [Bulk] result of one record
+@dataclass
+class BulkResult:
+    index: int                          # Index of record in input
+    record: Any                         # Input record
+    value: Any = None                   # Return value [Success]
+    error: Exception | None = None      # Raised exception [Failed]
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+    
+    def error_dict(self) -> dict:
+        return {
+            'index': self.index,
+            'error': type(self.error).__name__,
+            'code': str(getattr(self.error, 'code', '')),
+            'message': str(self.error),
+        }
+
+# FC: [Bulk] report
+@dataclass
+class BulkReport:
+    total: int = 0
+    succeeded: int = 0
+    elapsed: float = 0.0
+    failed: list[BulkResult] = field(default_factory=list)
+    done_indices: set[int] = field(default_factory=set)
+    
+    def add(self, result:BulkResult) -> None:
+        self.total += 1
+        if result.ok:
+            self.succeeded += 1
+            self.done_indices.add(result.index)
+        else:
+            self.failed.append(result)
+    
+    def failed_records(self) -> list:
+        """
+        Records of failed results, in input order [For retry]
+        """
+        return [result.record for result in sorted(self.failed, key=lambda result: result.index)]
+    
+    def asdict(self) -> dict:
+        return {
+            'total': self.total,
+            'succeeded': self.succeeded,
+            'elapsed': self.elapsed,
+            'failed': [result.error_dict() for result in self.failed],
+            'done_indices': sorted(self.done_indices),
+        }
+
+# FC: [Bulk] bounded concurrent run
+def run_bounded(function:Callable[[Any], Any],
+                items:Iterable,
+                max_workers:int = 4,
+                skip:Container[int] | None = None) ->Iterator[BulkResult]:
+    """
+    Call "function" for each item with bounded concurrency
+    Items are read lazily, at most 2 * max_workers items are in memory.
+    Results are yielded in completion order.
+    
+    Parameters:
+        function:       (callable)      - function(item)
+        items:          (Iterable)      - Items
+        max_workers:    (int)           - Max concurrent calls
+        skip:           (Container)     - Index of items to skip [For resume]
+    
+    Yields:
+        BulkResult:     (BulkResult)    - Result of each item
+    """
+    window = max_workers * 2
+    items = iter(enumerate(items))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        try:
+            while True:
+                for index, item in items:
+                    if skip is not None and index in skip:
+                        continue
+                    pending[executor.submit(function, item)] = (index, item)
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, item = pending.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        yield BulkResult(index=index, record=item, value=future.result())
+                    else:
+                        yield BulkResult(index=index, record=item, error=error) # type: ignore
+        finally:
+            for future in pending:
+                future.cancel()
+
+async def arun_bounded(function:Callable[[Any], Awaitable],
+                       items:Iterable,
+                       max_workers:int = 4,
+                       skip:Container[int] | None = None) ->AsyncIterator[BulkResult]:
+    """
+    [Awaitable] Same as run_bounded, "function" is a coroutine function
+    """
+    window = max_workers * 2
+    semaphore = asyncio.Semaphore(max_workers)
+    items = iter(enumerate(items))
+    
+    async def call(item):
+        async with semaphore:
+            return await function(item)
+    
+    pending = {}
+    try:
+        while True:
+            for index, item in items:
+                if skip is not None and index in skip:
+                    continue
+                pending[asyncio.ensure_future(call(item))] = (index, item)
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, item = pending.pop(task)
+                error = task.exception()
+                if error is None:
+                    yield BulkResult(index=index, record=item, value=task.result())
+                else:
+                    yield BulkResult(index=index, record=item, error=error) # type: ignore
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+# FC: [Bulk] merge of concurrent streams
+_STREAM_END = object()
+
+def merge_streams(sources:Iterable[Callable[[], Iterable]],
+                  max_workers:int = 4,
+                  max_buffered:int = 1000) ->Iterator[Any]:
+    """
+    Run each source in a worker thread and merge their items
+    Items are yielded in arrival order. Workers wait when "max_buffered" items are not consumed yet.
+    One source with max_workers=1 is a background read-ahead of that source.
+    Error of any source is raised here, and other workers are stopped.
+    
+    Parameters:
+        sources:        (Iterable[callable])    - source() returns iterable of items. Called in worker thread
+        max_workers:    (int)                   - Max sources running at the same time
+        max_buffered:   (int)                   - Max items waiting for the consumer
+    
+    Yields:
+        Any:            (Any)                   - Items of all sources
+    """
+    sources = list(sources)
+    buffer:queue.Queue = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+    lock = threading.Lock()
+    pending = iter(sources)
+    
+    def put(entry) -> bool:
+        # NOTE: Timeout loop, so a worker blocked on full buffer stops when the consumer is gone
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def work() -> None:
+        try:
+            while not stop.is_set():
+                with lock:
+                    source = next(pending, None)
+                if source is None:
+                    break
+                for item in source():
+                    if not put((True, item)):
+                        return
+        except BaseException as error:
+            put((False, error))
+        finally:
+            put(_STREAM_END)
+    
+    # NOTE: Workers run in a copy of the caller context, so requests are counted into its instrument record
+    workers = [threading.Thread(target=contextvars.copy_context().run, args=(work,), daemon=True)
+               for _ in range(max(1, min(max_workers, len(sources))))]
+    for worker in workers:
+        worker.start()
+    try:
+        running = len(workers)
+        while running:
+            entry = buffer.get()
+            if entry is _STREAM_END:
+                running -= 1
+                continue
+            ok, value = entry
+            if not ok:
+                raise value
+            yield value
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+# FC: [Bulk] job
+class BulkJob:
+    def __init__(self, function:Callable[[Any], Any],
+                       records:Iterable,
+                       max_workers:int = 4,
+                       skip:Container[int] | None = None):
+        """
+        Iterable bulk job. Iterate it to stream results, "report" is filled while iterating.
+        
+        Parameters:
+            function:       (callable)      - function(record)
+            records:        (Iterable)      - Records
+            max_workers:    (int)           - Max concurrent calls
+            skip:           (Container)     - Index of records to skip. Example: report.done_indices [For resume]
+        """
+        self.function = function
+        self.records = records
+        self.max_workers = max_workers
+        self.skip = skip
+        self.report = BulkReport()
+        
+    def __iter__(self) ->Iterator[BulkResult]:
+        start = time.monotonic()
+        try:
+            for result in run_bounded(self.function, self.records, self.max_workers, self.skip):
+                self.report.add(result)
+                yield result
+        finally:
+            self.report.elapsed += time.monotonic() - start
+    
+    def run(self) ->BulkReport:
+        """
+        Run all records
+
+        Returns:
+            BulkReport:     (BulkReport)    - Report
+        """
+        for _ in self:
+            pass
+        return self.report
+
+class AsyncBulkJob(BulkJob):
+    """
+    [Awaitable] Same as BulkJob, "function" is a coroutine function
+    Use "async for" to stream results, or "await run()".
+    """
+    def __iter__(self):
+        raise TypeError('AsyncBulkJob is not iterable, use "async for"')
+    
+    async def __aiter__(self) ->AsyncIterator[BulkResult]:
+        start = time.monotonic()
+        try:
+            async for result in arun_bounded(self.function, self.records, self.max_workers, self.skip):
+                self.report.add(result)
+                yield result
+        finally:
+            self.report.elapsed += time.monotonic() - start
+    
+    async def run(self) ->BulkReport: # type: ignore[override]
+        async for _ in self:
+            pass
+        return self.report
+
+# FC: [Bulk] pending update of one page
+@dataclass
+class PendingUpdate:
+    page_id: str
+    kwargs: dict = field(default_factory=dict)     # {"properties": {name: item dict}, "archived": ...}
+    puts: int = 0                                   # Number of merged changes
+    
+    def merge(self, kwargs:dict) -> None:
+        for name, value in kwargs.items():
+            if name == 'properties':
+                self.kwargs.setdefault('properties', {}).update(value)
+            else:
+                self.kwargs[name] = value
+        self.puts += 1
+
+# FC: [Bulk] coalescing update queue
+class UpdateQueue:
+    def __init__(self, function:Callable[[str, dict], Any],
+                       max_pending:int = 100,
+                       max_delay:float = 1.0,
+                       max_workers:int = 4,
+                       on_result:Callable[[BulkResult], Any] | None = None):
+        """
+        Page update queue [Thread safe]
+        Changes of the same page are merged (later value wins per property) and sent as one request.
+        A background thread flushes when "max_pending" pages are pending or the oldest change waits "max_delay".
+        Pages of a flush are sent concurrently, flushes run one by one, so one page is never updated concurrently.
+        
+        Parameters:
+            function:       (callable)      - function(page_id, kwargs) sends one update
+            max_pending:    (int)           - Pending pages to trigger flush
+            max_delay:      (float)         - Seconds to trigger flush
+            max_workers:    (int)           - Max concurrent requests of a flush
+            on_result:      (callable)      - on_result(BulkResult) for each page [Optional]
+                                              BulkResult.record is PendingUpdate, value is function return value
+        
+        Exception of "on_result" (or of a flush) does not stop the queue: it is raised by the next
+        "put()", "flush()" or "close()". Request errors are not raised, they are in "report.failed".
+        """
+        self.function = function
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+        self.on_result = on_result
+        self.report = BulkReport()
+        self.puts = 0
+        self._pending:dict[str, PendingUpdate] = {}
+        self._first_put:float | None = None
+        self._flush_requested = False
+        self._flushing = False
+        self._closed = False
+        self._stopped = False
+        self._error:Exception | None = None
+        self._sent = 0
+        self._start()
+    
+    def _start(self) -> None:
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name='notion_kit-update-queue', daemon=True)
+        self._worker.start()
+    
+    def __enter__(self) -> 'UpdateQueue':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        """
+        Number of pending pages
+        """
+        return len(self._pending)
+    
+    def put(self, page_id:str, properties:dict | None = None, **fields) -> None:
+        """
+        Add change of page
+        
+        Parameters:
+            page_id:        (str)           - Target page id
+            properties:     (dict)          - {name: PropertyItem or property item dict} [Optional]
+            **fields:                       - "archived", "icon", "cover" [Optional]
+        
+        Raises:
+            RuntimeError:  If queue is closed or its background thread stopped
+            Exception:     Raised by "on_result" since last call
+        """
+        kwargs = self._kwargs(properties, fields)
+        with self._condition:
+            self._merge(page_id, kwargs)
+            self._condition.notify_all()
+    
+    def put_page(self, page) -> None:
+        """
+        Add changes of object.Page [Changed properties and fields]. Page is marked clean.
+        """
+        changes = page.changes()
+        if changes:
+            self.put(page.id, changes.get('properties'),
+                     **{name: value for name, value in changes.items() if name != 'properties'})
+        page.mark_clean()
+    
+    def flush(self) -> BulkReport:
+        """
+        Send all pending changes and wait
+        
+        Returns:
+            BulkReport:     (BulkReport)    - Report of all flushed pages
+        
+        Raises:
+            Exception:     Raised by "on_result" since last call
+            RuntimeError:  If background thread stopped before pending changes are sent
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while (self._pending or self._flushing) and not self._stopped:
+                self._condition.wait()
+            self._raise_error()
+            if self._pending:
+                raise RuntimeError('UpdateQueue worker stopped, pending changes are not sent')
+        return self.report
+    
+    def close(self) -> BulkReport:
+        """
+        Flush pending changes and stop background thread
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+        with self._condition:
+            self._raise_error()
+        return self.report
+    
+    @staticmethod
+    def _kwargs(properties:dict | None, fields:dict) -> dict:
+        kwargs = dict(fields)
+        if properties:
+            kwargs['properties'] = {name: item if type(item) == dict else item.Dict
+                                    for name, item in properties.items()}
+        for name, value in fields.items():
+            if hasattr(value, 'Dict'):
+                kwargs[name] = value.Dict
+        return kwargs
+    
+    def _merge(self, page_id:str, kwargs:dict) -> None:
+        # NOTE: Called with condition held
+        if self._closed:
+            raise RuntimeError('UpdateQueue is closed')
+        self._raise_error()
+        if self._stopped:
+            raise RuntimeError('UpdateQueue worker stopped')
+        update = self._pending.get(page_id)
+        if update is None:
+            update = self._pending[page_id] = PendingUpdate(page_id)
+        update.merge(kwargs)
+        self.puts += 1
+        if self._first_put is None:
+            self._first_put = time.monotonic()
+    
+    def _take(self) -> list[PendingUpdate]:
+        # NOTE: Called with condition held
+        batch = list(self._pending.values())
+        self._pending = {}
+        self._first_put = None
+        self._flush_requested = False
+        self._flushing = True
+        return batch
+    
+    def _fail(self, error:Exception) -> None:
+        # NOTE: First error is kept until it is raised to the caller
+        with self._condition:
+            if self._error is None:
+                self._error = error
+    
+    def _raise_error(self) -> None:
+        # NOTE: Called with condition held
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+    
+    def _due(self) -> bool:
+        if not self._pending:
+            return False
+        return (self._closed or self._flush_requested or
+                len(self._pending) >= self.max_pending or
+                time.monotonic() - self._first_put >= self.max_delay)
+    
+    def _timeout(self) -> float | None:
+        if self._first_put is None:
+            return None
+        return max(0.0, self._first_put + self.max_delay - time.monotonic())
+    
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._condition:
+                    while not self._due():
+                        if self._closed:
+                            return
+                        self._condition.wait(self._timeout())
+                    batch = self._take()
+                try:
+                    self._send(batch)
+                except Exception as error:
+                    self._fail(error)
+                finally:
+                    with self._condition:
+                        self._flushing = False
+                        self._condition.notify_all()
+        finally:
+            # NOTE: "flush()" never waits on a stopped thread
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
+    
+    def _send(self, batch:list[PendingUpdate]) -> None:
+        start = time.monotonic()
+        
+        def send(update:PendingUpdate):
+            return self.function(update.page_id, update.kwargs)
+        
+        for result in run_bounded(send, batch, self.max_workers):
+            result.index += self._sent
+            self.report.add(result)
+            if self.on_result is not None:
+                try:
+                    self.on_result(result)
+                except Exception as error:
+                    self._fail(error)
+        self._sent += len(batch)
+        self.report.elapsed += time.monotonic() - start
+
+class AsyncUpdateQueue(UpdateQueue):
+    def __init__(self, function:Callable[[str, dict], Awaitable],
+                       max_pending:int = 100,
+                       max_delay:float = 1.0,
+                       max_workers:int = 4,
+                       on_result:Callable[[BulkResult], Any] | None = None):
+        """
+        [Awaitable] Same as UpdateQueue, "function" is a coroutine function
+        "put", "put_page", "flush" and "close" are awaitable. Use "async with".
+        A background task of the running event loop flushes, it starts at the first "put()".
+        "on_result" may be a function or a coroutine function.
+        """
+        super().__init__(function, max_pending=max_pending, max_delay=max_delay,  # type: ignore[arg-type]
+                         max_workers=max_workers, on_result=on_result)
+    
+    def _start(self) -> None:
+        self._condition = asyncio.Condition() # type: ignore[assignment]
+        self._worker = None # type: ignore[assignment]
+    
+    def __enter__(self):
+        raise TypeError('Use "async with" for AsyncUpdateQueue')
+    
+    async def __aenter__(self) -> 'AsyncUpdateQueue':
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def put(self, page_id:str, properties:dict | None = None, **fields) -> None: # type: ignore[override]
+        kwargs = self._kwargs(properties, fields)
+        async with self._condition: # type: ignore[attr-defined]
+            self._merge(page_id, kwargs)
+            if self._worker is None:
+                self._worker = asyncio.create_task(self._run()) # type: ignore[assignment]
+            self._condition.notify_all()
+    
+    async def put_page(self, page) -> None: # type: ignore[override]
+        changes = page.changes()
+        if changes:
+            await self.put(page.id, changes.get('properties'),
+                           **{name: value for name, value in changes.items() if name != 'properties'})
+        page.mark_clean()
+    
+    async def flush(self) -> BulkReport: # type: ignore[override]
+        async with self._condition: # type: ignore[attr-defined]
+            self._flush_requested = True
+            self._condition.notify_all()
+            while (self._pending or self._flushing) and not self._stopped:
+                await self._condition.wait() # type: ignore[misc]
+            self._raise_error()
+            if self._pending:
+                raise RuntimeError('UpdateQueue worker stopped, pending changes are not sent')
+        return self.report
+    
+    async def close(self) -> BulkReport: # type: ignore[override]
+        async with self._condition: # type: ignore[attr-defined]
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            await self._worker
+        self._raise_error()
+        return self.report
+    
+    def _fail(self, error:Exception) -> None:
+        # NOTE: Single event loop, no lock is needed
+        if self._error is None:
+            self._error = error
+    
+    async def _run(self) -> None: # type: ignore[override]
+        try:
+            while True:
+                async with self._condition: # type: ignore[attr-defined]
+                    while not self._due():
+                        if self._closed:
+                            return
+                        try:
+                            await asyncio.wait_for(self._condition.wait(), self._timeout()) # type: ignore[arg-type]
+                        except asyncio.TimeoutError:
+                            pass
+                    batch = self._take()
+                try:
+                    await self._send(batch)
+                except Exception as error:
+                    self._fail(error)
+                finally:
+                    async with self._condition: # type: ignore[attr-defined]
+                        self._flushing = False
+                        self._condition.notify_all()
+        finally:
+            async with self._condition: # type: ignore[attr-defined]
+                self._stopped = True
+                self._condition.notify_all()
+    
+    async def _send(self, batch:list[PendingUpdate]) -> None: # type: ignore[override]
+        start = time.monotonic()
+        
+        async def send(update:PendingUpdate):
+            return await self.function(update.page_id, update.kwargs) # type: ignore[misc]
+        
+        async for result in arun_bounded(send, batch, self.max_workers):
+            result.index += self._sent
+            self.report.add(result)
+            if self.on_result is not None:
+                try:
+                    value = self.on_result(result)
+                    if inspect.isawaitable(value):
+                        await value
+                except Exception as error:
+                    self._fail(error)
+        self._sent += len(batch)
+        self.report.elapsed += time.monotonic() - start
@@ -0,0 +1,223 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# NOTE: Cache interface
+#       get(key, last_edited_time=None) -> dict | None
+#       set(key, value:dict) -> None
+#       delete(key) -> None
+#       clear() -> None
+#   Value is the response dict of notion api. It is stored as JSON text,
+#   so every "get" returns a new dict and objects never share state with the cache.
+#   Entry is valid when:
+#       - "last_edited_time" is given and equal to the cached one [TTL is ignored], or
+#       - "last_edited_time" is not given and entry is not older than TTL
+
+# FC: [Cache] in-memory LRU
+class MemoryCache:
+    def __init__(self, maxsize:int = 1024, ttl:float | None = 300):
+        """
+        In-memory LRU cache [Thread safe]
+        
+        Parameters:
+            maxsize:    (int)       - Max entries
+            ttl:        (float)     - Seconds to keep entry. [None: no expiry]
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data:OrderedDict[str, tuple[str, str | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key:str, last_edited_time:str | None = None) -> dict | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            text, cached_time, stored_at = entry
+            if not _is_valid(cached_time, stored_at, last_edited_time, self.ttl):
+                self._data.pop(key)
+                return None
+            self._data.move_to_end(key)
+        return json.loads(text)
+    
+    def set(self, key:str, value:dict) -> None:
+        text = json.dumps(value)
+        with self._lock:
+            self._data[key] = (text, value.get('last_edited_time'), time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key:str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+# FC: [Cache] SQLite
+class SQLiteCache:
+    def __init__(self, path:str, maxsize:int = 100_000, ttl:float | None = 3600):
+        """
+        On-disk cache by SQLite [Thread safe, can be shared by worker processes]
+        
+        Parameters:
+            path:       (str)       - SQLite file path
+            maxsize:    (int)       - Max entries. Least recently used entries are evicted
+            ttl:        (float)     - Seconds to keep entry. [None: no expiry]
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evict_every = max(1, min(100, maxsize // 10))
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_edited_time TEXT, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    
+    def get(self, key:str, last_edited_time:str | None = None) -> dict | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, last_edited_time, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            text, cached_time, stored_at = row
+            if not _is_valid(cached_time, stored_at, last_edited_time, self.ttl):
+                self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(text)
+    
+    def set(self, key:str, value:dict) -> None:
+        text = json.dumps(value)
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                (key, text, value.get('last_edited_time'), now, now))
+            # NOTE: Evict in batch, not on every write
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._connection.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+    
+    def delete(self, key:str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+    
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM cache")
+    
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+def _is_valid(cached_time:str | None, stored_at:float,
+              last_edited_time:str | None, ttl:float | None) -> bool:
+    if last_edited_time is not None:
+        return cached_time == last_edited_time
+    return ttl is None or time.time() - stored_at <= ttl
+
+# FC: [Cache] user directory
+class UserDirectory:
+    def __init__(self, ttl:float | None = 3600):
+        """
+        Workspace users by id [Thread safe]
+        Users are rarely changed, so "object.User" / "object.Bot" are kept as objects (shared, not copied).
+        None is kept for user id which is not found, so it is not requested again.
+        
+        Parameters:
+            ttl:        (float)     - Seconds to keep user and full list. [None: no expiry]
+        """
+        self.ttl = ttl
+        self._users:dict[str, tuple[object | None, float]] = {}
+        self._loaded_at:float | None = None
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._users)
+    
+    def __contains__(self, user_id:str) -> bool:
+        with self._lock:
+            entry = self._users.get(user_id)
+            return entry is not None and _is_valid(None, entry[1], None, self.ttl)
+    
+    @property
+    def loaded(self) -> bool:
+        """
+        Full user list is loaded and not expired
+        """
+        return self._loaded_at is not None and _is_valid(None, self._loaded_at, None, self.ttl)
+    
+    def get(self, user_id:str):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None or not _is_valid(None, entry[1], None, self.ttl):
+                return None
+            return entry[0]
+    
+    def set(self, user_id:str, user) -> None:
+        with self._lock:
+            self._users[user_id] = (user, time.time())
+    
+    def load(self, users:list) -> None:
+        """
+        Replace directory by full user list
+        """
+        now = time.time()
+        with self._lock:
+            self._users = {user.id: (user, now) for user in users}
+            self._loaded_at = now
+    
+    def users(self) -> dict:
+        with self._lock:
+            return {user_id: user for user_id, (user, stored_at) in self._users.items()
+                    if user is not None and _is_valid(None, stored_at, None, self.ttl)}
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._loaded_at = None
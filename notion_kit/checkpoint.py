@@ -0,0 +1,225 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# NOTE: Checkpoint interface
+#       get(key) -> dict | None
+#       set(key, state:dict) -> None
+#       delete(key) -> None
+#       clear() -> None
+#   State is a small JSON dict of a scan position (cursor of each partition, listed children, ...).
+#   Key names one job, same database / query / tree resumes the same job.
+#   Position is saved after its pages are consumed, so a resumed job repeats at most
+#   the pages of one response (per partition), and never skips one.
+
+# FC: [Checkpoint] JSON lines file
+class FileCheckpoint:
+    def __init__(self, path:str):
+        """
+        Checkpoint store by JSON lines file [Thread safe]
+        Every "set" appends one line, so saving is cheap for large jobs. File is compacted on open.
+        
+        Parameters:
+            path:       (str)       - File path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._states:dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue    # NOTE: Last line can be cut by a crash
+                    if entry['state'] is None:
+                        self._states.pop(entry['key'], None)
+                    else:
+                        self._states[entry['key']] = entry['state']
+        self._compact()
+        self._file = open(path, 'a', encoding='utf-8')
+    
+    def __len__(self) -> int:
+        return len(self._states)
+    
+    def _compact(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            for key, state in self._states.items():
+                file.write(json.dumps({'key': key, 'state': state}) + '\n')
+        os.replace(temp_path, self.path)
+    
+    def _append(self, key:str, state:dict | None) -> None:
+        self._file.write(json.dumps({'key': key, 'state': state}) + '\n')
+        self._file.flush()
+    
+    def get(self, key:str) -> dict | None:
+        with self._lock:
+            state = self._states.get(key)
+        return None if state is None else json.loads(json.dumps(state))
+    
+    def set(self, key:str, state:dict) -> None:
+        state = json.loads(json.dumps(state))
+        with self._lock:
+            self._states[key] = state
+            self._append(key, state)
+    
+    def delete(self, key:str) -> None:
+        with self._lock:
+            if self._states.pop(key, None) is not None:
+                self._append(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._file.close()
+            self._compact()
+            self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+# FC: [Checkpoint] SQLite
+class SQLiteCheckpoint:
+    def __init__(self, path:str):
+        """
+        Checkpoint store by SQLite [Thread safe, can be shared by worker processes]
+        
+        Parameters:
+            path:       (str)       - SQLite file path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint ("
+                "key TEXT PRIMARY KEY, state TEXT NOT NULL, saved_at REAL NOT NULL)")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM checkpoint").fetchone()[0]
+    
+    def get(self, key:str) -> dict | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state FROM checkpoint WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+    
+    def set(self, key:str, state:dict) -> None:
+        text = json.dumps(state)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO checkpoint VALUES (?, ?, ?)", (key, text, time.time()))
+    
+    def delete(self, key:str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM checkpoint WHERE key = ?", (key,))
+    
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM checkpoint")
+    
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+def checkpoint_key(kind:str, *parts) -> str:
+    """
+    Key of job from its parameters
+    
+    Parameters:
+        kind:       (str)       - Job kind. Example: "iter_pages"
+        *parts:                 - JSON serializable parameters of job
+    """
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{kind}:{digest[:16]}"
+
+# FC: [Checkpoint] progress of one job
+class Progress:
+    def __init__(self, store:FileCheckpoint | SQLiteCheckpoint | None, key:str, interval:float = 0.0):
+        """
+        Saved position of one job. No-op when "store" is None.
+        
+        Parameters:
+            store:      (FileCheckpoint | SQLiteCheckpoint) - Checkpoint store [Optional]
+            key:        (str)       - Key of job
+            interval:   (float)     - Min seconds between saves [0: save every update]
+        """
+        self.store = store
+        self.key = key
+        self.interval = interval
+        self.state:dict | None = store.get(key) if store is not None else None
+        self._pending = False
+        self._saved_at = time.monotonic()
+    
+    def update(self, state:dict) -> None:
+        if self._mark(state):
+            self._save()
+    
+    async def aupdate(self, state:dict) -> None:
+        """
+        Same as "update", store is written in a worker thread [Awaitable]
+        """
+        if self._mark(state):
+            await asyncio.to_thread(self._save)
+    
+    def _mark(self, state:dict) -> bool:
+        # Keep state, True if it is time to save
+        if self.store is None:
+            return False
+        self.state = state
+        self._pending = True
+        return time.monotonic() - self._saved_at >= self.interval
+    
+    def _save(self) -> None:
+        self.store.set(self.key, self.state)    # type: ignore
+        self._pending = False
+        self._saved_at = time.monotonic()
+    
+    def close(self, completed:bool) -> None:
+        """
+        Delete checkpoint of completed job, or save the last position of stopped job
+        """
+        if self.store is None:
+            return
+        if completed:
+            self.store.delete(self.key)
+        elif self._pending:
+            self._save()
+    
+    async def aclose(self, completed:bool) -> None:
+        """
+        Same as "close", store is written in a worker thread [Awaitable]
+        """
+        if self.store is not None:
+            await asyncio.to_thread(self.close, completed)
@@ -0,0 +1,573 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import importlib
+import json
+from abc import ABC, abstractmethod
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable
+
+from .object import Database
+
+# NOTE: Columnar export of database pages
+#       Pages are read as response dicts and written into typed column buffers,
+#       so no per-cell Python object is kept:
+#           number                          -> float64           [array('d'), null: NaN]
+#           checkbox                        -> bit array         [bytearray, LSB first]
+#           select / status / created_by... -> dictionary codes  [array('i') + labels, null: -1]
+#           date / created_time / ...       -> timestamp (us, UTC) [array('q'), null: NaT]
+#           title / rich_text / url ...     -> string            [int64 offsets + UTF-8 bytes]
+#           multi_select / people / ...     -> list of dictionary / string
+#       Buffers follow Arrow layout, so "to_arrow()" only wraps them.
+#       numpy and pyarrow are optional, imported when "to_numpy()" / "to_arrow()" is called.
+
+_NULL_TIMESTAMP = -2**63    # NOTE: Same as numpy NaT
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _optional(name:str):
+    try:
+        return importlib.import_module(name)
+    except ImportError as error:
+        raise ImportError(f'"{name}" is required for this output: pip install {name}') from error
+
+@lru_cache(maxsize=4096)
+def _to_timestamp(text:str) -> int:
+    """
+    ISO 8601 date / datetime to microseconds from epoch. Date without time zone is UTC.
+    """
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    value = datetime.fromisoformat(text)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+# FC: [Export] bit array
+class BitArray:
+    """
+    Packed bools, least significant bit first [Arrow bitmap layout]
+    """
+    __slots__ = ('data', 'length')
+    
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.length = 0
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __getitem__(self, index:int) -> bool:
+        if not 0 <= index < self.length:
+            raise IndexError('BitArray index out of range')
+        return bool(self.data[index >> 3] >> (index & 7) & 1)
+    
+    def append(self, value:bool) -> None:
+        if self.length & 7 == 0:
+            self.data.append(0)
+        if value:
+            self.data[-1] |= 1 << (self.length & 7)
+        self.length += 1
+    
+    def to_list(self) -> list[bool]:
+        return [self[index] for index in range(self.length)]
+    
+    def to_numpy(self):
+        np = _optional('numpy')
+        return np.unpackbits(np.frombuffer(bytes(self.data), dtype=np.uint8),
+                             count=self.length, bitorder='little').astype(bool)
+
+#--------------------------[Column]---------------------#
+# FC: [Export] column base
+class Column(ABC):
+    """
+    Typed column of one property
+    "validity" bit is False for null.
+    Subclass implements "_append", "_append_null", "_get" and "to_arrow".
+    """
+    kind = ''
+    
+    def __init__(self, name:str, type:str) -> None:
+        self.name = name
+        self.type = type
+        self.validity = BitArray()
+        self.null_count = 0
+    
+    def __len__(self) -> int:
+        return len(self.validity)
+    
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(name={self.name!r}, type={self.type!r}, length={len(self)})'
+    
+    def append(self, value) -> None:
+        if value is None:
+            self.validity.append(False)
+            self.null_count += 1
+            self._append_null()
+        else:
+            self.validity.append(True)
+            self._append(value)
+    
+    def to_pylist(self) -> list:
+        return [self._get(index) if self.validity[index] else None for index in range(len(self))]
+    
+    def to_numpy(self):
+        np = _optional('numpy')
+        return np.array(self.to_pylist(), dtype=object)
+    
+    @abstractmethod
+    def to_arrow(self):
+        ...
+    
+    def _arrow_validity(self, pa):
+        return None if self.null_count == 0 else pa.py_buffer(bytes(self.validity.data))
+    
+    @abstractmethod
+    def _append(self, value) -> None:
+        ...
+    
+    @abstractmethod
+    def _append_null(self) -> None:
+        ...
+    
+    @abstractmethod
+    def _get(self, index:int):
+        ...
+
+# FC: [Export] float64 column
+class NumberColumn(Column):
+    kind = 'float64'
+    
+    def __init__(self, name:str, type:str) -> None:
+        super().__init__(name, type)
+        self.values = array('d')
+    
+    def _append(self, value) -> None:
+        self.values.append(value)
+    
+    def _append_null(self) -> None:
+        self.values.append(float('nan'))
+    
+    def _get(self, index:int) -> float:
+        return self.values[index]
+    
+    def to_numpy(self):
+        """
+        float64 array, null is NaN
+        """
+        np = _optional('numpy')
+        return np.frombuffer(self.values.tobytes(), dtype=np.float64)
+    
+    def to_arrow(self):
+        pa = _optional('pyarrow')
+        return pa.Array.from_buffers(pa.float64(), len(self),
+                                     [self._arrow_validity(pa), pa.py_buffer(self.values.tobytes())],
+                                     null_count=self.null_count)
+
+# FC: [Export] bool column
+class BoolColumn(Column):
+    kind = 'bool'
+    
+    def __init__(self, name:str, type:str) -> None:
+        super().__init__(name, type)
+        self.values = BitArray()
+    
+    def _append(self, value) -> None:
+        self.values.append(value)
+    
+    def _append_null(self) -> None:
+        self.values.append(False)
+    
+    def _get(self, index:int) -> bool:
+        return self.values[index]
+    
+    def to_numpy(self):
+        """
+        bool array, null is False
+        """
+        return self.values.to_numpy()
+    
+    def to_arrow(self):
+        pa = _optional('pyarrow')
+        return pa.Array.from_buffers(pa.bool_(), len(self),
+                                     [self._arrow_validity(pa), pa.py_buffer(bytes(self.values.data))],
+                                     null_count=self.null_count)
+
+# FC: [Export] dictionary encoded column
+class DictionaryColumn(Column):
+    kind = 'dictionary'
+    
+    def __init__(self, name:str, type:str) -> None:
+        super().__init__(name, type)
+        self.codes = array('i')
+        self.dictionary:list[str] = []
+        self._lookup:dict[str, int] = {}
+    
+    def _append(self, value) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        self.codes.append(code)
+    
+    def _append_null(self) -> None:
+        self.codes.append(-1)
+    
+    def _get(self, index:int) -> str:
+        return self.dictionary[self.codes[index]]
+    
+    def to_numpy(self):
+        """
+        int32 codes of ".dictionary", null is -1
+        """
+        np = _optional('numpy')
+        return np.frombuffer(self.codes.tobytes(), dtype=np.int32)
+    
+    def to_arrow(self):
+        pa = _optional('pyarrow')
+        codes = self.codes
+        if self.null_count:
+            codes = array('i', (max(code, 0) for code in codes))
+        indices = pa.Array.from_buffers(pa.int32(), len(self),
+                                        [self._arrow_validity(pa), pa.py_buffer(codes.tobytes())],
+                                        null_count=self.null_count)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(self.dictionary, type=pa.string()))
+
+# FC: [Export] timestamp column
+class TimestampColumn(Column):
+    kind = 'timestamp[us, UTC]'
+    
+    def __init__(self, name:str, type:str) -> None:
+        super().__init__(name, type)
+        self.values = array('q')
+    
+    def _append(self, value) -> None:
+        self.values.append(_to_timestamp(value))
+    
+    def _append_null(self) -> None:
+        self.values.append(_NULL_TIMESTAMP)
+    
+    def _get(self, index:int) -> datetime:
+        return datetime.fromtimestamp(self.values[index] / 1_000_000, tz=timezone.utc)
+    
+    def to_numpy(self):
+        """
+        datetime64[us] array (UTC), null is NaT
+        """
+        np = _optional('numpy')
+        return np.frombuffer(self.values.tobytes(), dtype=np.int64).view('datetime64[us]')
+    
+    def to_arrow(self):
+        pa = _optional('pyarrow')
+        return pa.Array.from_buffers(pa.timestamp('us', tz='UTC'), len(self),
+                                     [self._arrow_validity(pa), pa.py_buffer(self.values.tobytes())],
+                                     null_count=self.null_count)
+
+# FC: [Export] string column
+class StringColumn(Column):
+    kind = 'string'
+    
+    def __init__(self, name:str, type:str) -> None:
+        super().__init__(name, type)
+        self.offsets = array('q', [0])
+        self.data = bytearray()
+    
+    def _append(self, value) -> None:
+        self.data += value.encode()
+        self.offsets.append(len(self.data))
+    
+    def _append_null(self) -> None:
+        self.offsets.append(len(self.data))
+    
+    def _get(self, index:int) -> str:
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode()
+    
+    def to_arrow(self):
+        pa = _optional('pyarrow')
+        return pa.Array.from_buffers(pa.large_string(), len(self),
+                                     [self._arrow_validity(pa),
+                                      pa.py_buffer(self.offsets.tobytes()),
+                                      pa.py_buffer(bytes(self.data))],
+                                     null_count=self.null_count)
+
+# FC: [Export] list column
+class ListColumn(Column):
+    """
+    List of values, all values are stored in one child column
+    """
+    kind = 'list'
+    
+    def __init__(self, name:str, type:str, item_class:type[Column]) -> None:
+        super().__init__(name, type)
+        self.offsets = array('q', [0])
+        self.items = item_class(name, type)
+        self.kind = f'list<{self.items.kind}>'
+    
+    def _append(self, value) -> None:
+        for item in value:
+            self.items.append(item)
+        self.offsets.append(len(self.items))
+    
+    def _append_null(self) -> None:
+        self.offsets.append(len(self.items))
+    
+    def _get(self, index:int) -> list:
+        return [self.items._get(item) for item in range(self.offsets[index], self.offsets[index + 1])]
+    
+    def to_arrow(self):
+        pa = _optional('pyarrow')
+        items = self.items.to_arrow()
+        return pa.Array.from_buffers(pa.large_list(items.type), len(self),
+                                     [self._arrow_validity(pa), pa.py_buffer(self.offsets.tobytes())],
+                                     null_count=self.null_count, children=[items])
+
+# NOTE: {value type of formula / rollup: column class}
+_DYNAMIC_COLUMNS = {
+    "number":   NumberColumn,
+    "boolean":  BoolColumn,
+    "string":   StringColumn,
+    "date":     TimestampColumn,
+}
+
+# FC: [Export] formula / rollup column
+class DynamicColumn(Column):
+    """
+    Column class is decided by the first value type: (value type, value)
+    Value of other type, or of type not in _DYNAMIC_COLUMNS, is null. All null column is string.
+    """
+    def __init__(self, name:str, type:str) -> None:
+        super().__init__(name, type)
+        self.value_type:str | None = None
+        self.column:Column | None = None
+        self._pending_nulls = 0
+    
+    @property
+    def kind(self) -> str:
+        return self._resolved().kind
+    
+    def __len__(self) -> int:
+        return self._pending_nulls if self.column is None else len(self.column)
+    
+    def append(self, value) -> None:
+        if value is not None and value[0] not in _DYNAMIC_COLUMNS:
+            value = None
+        if value is not None and self.column is None:
+            self.value_type = value[0]
+            self.column = _DYNAMIC_COLUMNS[self.value_type](self.name, self.type)
+            for _ in range(self._pending_nulls):
+                self.column.append(None)
+        if self.column is None:
+            self._pending_nulls += 1
+        elif value is None or value[0] != self.value_type:
+            self.column.append(None)
+        else:
+            self.column.append(value[1])
+    
+    # NOTE: "append" is overridden, values go to the column of the value type
+    def _append(self, value) -> None:
+        self.append(value)
+    
+    def _append_null(self) -> None:
+        self.append(None)
+    
+    def _get(self, index:int):
+        return self._resolved()._get(index)
+    
+    def _resolved(self) -> Column:
+        if self.column is not None:
+            return self.column
+        column = StringColumn(self.name, self.type)
+        for _ in range(self._pending_nulls):
+            column.append(None)
+        return column
+    
+    def to_pylist(self) -> list:
+        return self._resolved().to_pylist()
+    
+    def to_numpy(self):
+        return self._resolved().to_numpy()
+    
+    def to_arrow(self):
+        return self._resolved().to_arrow()
+
+#--------------------------[Property value]---------------------#
+def _plain_text(rich_text:list[dict]) -> str:
+    return ''.join(text['plain_text'] for text in rich_text)
+
+def _name(value:dict | None) -> str | None:
+    return None if value is None else value['name']
+
+def _start(value:dict | None) -> str | None:
+    return None if value is None else value['start']
+
+def _formula_value(item:dict) -> tuple | None:
+    formula = item['formula']
+    value = formula.get(formula['type'])
+    if formula['type'] == 'date':
+        value = _start(value)
+    return None if value is None else (formula['type'], value)
+
+def _rollup_value(item:dict) -> tuple | None:
+    rollup = item['rollup']
+    # NOTE: "unsupported" / "incomplete" rollup has no value
+    value = rollup.get(rollup['type'])
+    if value is None or rollup['type'] in ('unsupported', 'incomplete'):
+        return None
+    if rollup['type'] == 'date':
+        return ('date', value['start'])
+    if rollup['type'] == 'array':
+        return ('string', json.dumps(value))
+    return (rollup['type'], value)
+
+# NOTE: {property type: (column factory, property item dict -> value)}
+COLUMN_TYPES = {
+    "title":            (StringColumn, lambda item: _plain_text(item['title'])),
+    "rich_text":        (StringColumn, lambda item: _plain_text(item['rich_text'])),
+    "number":           (NumberColumn, lambda item: item['number']),
+    "select":           (DictionaryColumn, lambda item: _name(item['select'])),
+    "multi_select":     (lambda name, type: ListColumn(name, type, DictionaryColumn),
+                         lambda item: [option['name'] for option in item['multi_select']]),
+    "status":           (DictionaryColumn, lambda item: _name(item['status'])),
+    "date":             (TimestampColumn, lambda item: _start(item['date'])),
+    "people":           (lambda name, type: ListColumn(name, type, DictionaryColumn),
+                         lambda item: [user['id'] for user in item['people']]),
+    "files":            (lambda name, type: ListColumn(name, type, StringColumn),
+                         lambda item: [file['name'] for file in item['files']]),
+    "checkbox":         (BoolColumn, lambda item: item['checkbox']),
+    "url":              (StringColumn, lambda item: item['url']),
+    "email":            (StringColumn, lambda item: item['email']),
+    "phone_number":     (StringColumn, lambda item: item['phone_number']),
+    "relation":         (lambda name, type: ListColumn(name, type, StringColumn),
+                         lambda item: [page['id'] for page in item['relation']]),
+    "formula":          (DynamicColumn, _formula_value),
+    "rollup":           (DynamicColumn, _rollup_value),
+    "created_time":     (TimestampColumn, lambda item: item['created_time']),
+    "created_by":       (DictionaryColumn, lambda item: item['created_by']['id']),
+    "last_edited_time": (TimestampColumn, lambda item: item['last_edited_time']),
+    "last_edited_by":   (DictionaryColumn, lambda item: item['last_edited_by']['id']),
+}
+
+#--------------------------[Table]---------------------#
+# FC: [Export] columnar table
+class ColumnarTable:
+    def __init__(self, schema:dict[str, str], id_column:str = 'id') -> None:
+        """
+        Columns of database pages. First column ("id_column") is page id.
+        
+        Parameters:
+            schema:     (dict[str, str])    - {property name: property type}
+                                              Property type not in COLUMN_TYPES is skipped
+            id_column:  (str)               - Name of page id column
+        
+        Raises:
+            ValueError:  If property name is same as "id_column"
+        """
+        self.id_column = id_column
+        self.columns:dict[str, Column] = {id_column: StringColumn(id_column, 'id')}
+        self._fields:list[tuple[str, Column, object]] = []
+        for name, type in schema.items():
+            if type not in COLUMN_TYPES:
+                continue
+            if name == id_column:
+                raise ValueError(f'Property "{name}" is same as page id column, set other "id_column"')
+            factory, value = COLUMN_TYPES[type]
+            column = factory(name, type)
+            self.columns[name] = column
+            self._fields.append((name, column, value))
+    
+    @classmethod
+    def from_database(cls, database:Database, columns:Iterable[str] | None = None,
+                                               id_column:str = 'id') -> 'ColumnarTable':
+        """
+        Table of database schema
+        
+        Parameters:
+            database:   (object.Database)   - Database
+            columns:    (Iterable[str])     - Property names to export [Optional, default: all]
+            id_column:  (str)               - Name of page id column
+        
+        Raises:
+            ValueError:  If column is not in database, or property name is same as "id_column"
+        """
+        schema = {name: property_type.type for name, property_type in database.properties.items()
+                  if property_type is not None}
+        if columns is not None:
+            columns = list(columns)
+            for name in columns:
+                if name not in schema:
+                    raise ValueError(f'Property "{name}" is not in database')
+            schema = {name: schema[name] for name in columns}
+        return cls(schema, id_column)
+    
+    def __len__(self) -> int:
+        return len(self.columns[self.id_column])
+    
+    def __getitem__(self, name:str) -> Column:
+        return self.columns[name]
+    
+    def __repr__(self) -> str:
+        return f'ColumnarTable(rows={len(self)}, columns={list(self.columns)})'
+    
+    @property
+    def column_names(self) -> list[str]:
+        return list(self.columns)
+    
+    def append(self, page:dict) -> None:
+        """
+        Append page response dict
+        """
+        self.columns[self.id_column].append(page['id'])
+        properties = page['properties']
+        for name, column, value in self._fields:
+            item = properties.get(name)
+            column.append(None if item is None else value(item))
+    
+    def extend(self, pages:Iterable[dict]) -> None:
+        for page in pages:
+            self.append(page)
+    
+    def to_pydict(self) -> dict[str, list]:
+        return {name: column.to_pylist() for name, column in self.columns.items()}
+    
+    def to_numpy(self) -> dict:
+        """
+        {column name: numpy array} [Requires numpy]
+        Dictionary columns are int32 codes, labels are in "table[name].dictionary".
+        """
+        return {name: column.to_numpy() for name, column in self.columns.items()}
+    
+    def to_arrow(self):
+        """
+        pyarrow.Table [Requires pyarrow]
+        """
+        pa = _optional('pyarrow')
+        return pa.table({name: column.to_arrow() for name, column in self.columns.items()})
+    
+    def write_parquet(self, path:str, **kwargs) -> None:
+        """
+        Write Parquet file [Requires pyarrow]
+        """
+        parquet = _optional('pyarrow.parquet')
+        parquet.write_table(self.to_arrow(), path, **kwargs)
@@ -0,0 +1,373 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import functools
+import inspect
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Callable
+
+# NOTE: Instrumentation of api methods
+#       Every public method of api / async_api classes makes one CallRecord when a hook is added:
+#           instrument.add_hook(callback)       # callback(record) after each call
+#           collector = Collector(); instrument.add_hook(collector)
+#       Nested api calls in the same call count into the outer record.
+#       Worker threads of a call (Example: get_block_tree, scan) run in a copy of the caller context,
+#       so their requests count into the record of that call. Counters are added under the lock of record.
+#       Latency is summed over requests, so it can be longer than duration for concurrent methods.
+#       Parse time is measured around building objects from responses (see parse_timed).
+#       Without hooks, methods are called directly and nothing is measured.
+
+# FC: [Instrument] record of one api call
+@dataclass
+class CallRecord:
+    method: str                     # Example: "Page.get_data"
+    start: float = 0.0              # time.time() of call
+    duration: float = 0.0           # Seconds in the call [Generator: time in "next", not in consumer]
+    latency: float = 0.0            # Seconds waiting for notion responses [Sum of concurrent requests]
+    wait_time: float = 0.0          # Seconds waiting for rate limit (token / Retry-After)
+    requests: int = 0               # Requests sent, retries included
+    retries: int = 0                # Retried requests
+    throttled: int = 0              # Responses with status 429
+    cache_hits: int = 0             # Responses read from cache
+    response_bytes: int = 0         # Size of response JSON
+    parse_time: float = 0.0         # Seconds building objects from responses [Sum of concurrent threads]
+    error: str | None = None        # Exception name if the call raised
+    
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+    
+    def add(self, **values) -> None:
+        """
+        Add values to counters [Thread safe]. Example: record.add(requests=1, latency=0.2)
+        """
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+    
+    def asdict(self) -> dict:
+        return asdict(self)
+
+_hooks:tuple[Callable[[CallRecord], object], ...] = ()
+_hooks_lock = threading.Lock()
+_current:ContextVar[CallRecord | None] = ContextVar('notion_kit_call_record', default=None)
+_parsing:ContextVar[bool] = ContextVar('notion_kit_parsing', default=False)
+
+def add_hook(hook:Callable[[CallRecord], object]) -> None:
+    """
+    Call "hook(record)" after each api call
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+def remove_hook(hook:Callable[[CallRecord], object]) -> None:
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(_ for _ in _hooks if _ != hook)
+
+def current() -> CallRecord | None:
+    """
+    Record of the running api call [None: not instrumented]
+    """
+    return _current.get()
+
+def payload_size(response) -> int:
+    # NOTE: Client returns parsed JSON, so the size is of compact JSON text
+    return len(json.dumps(response, separators=(',', ':'), ensure_ascii=False).encode())
+
+def parse_timed(function):
+    """
+    Decorator: add seconds of "function" to "parse_time" of the running record
+    Only the outer call is measured, objects built inside it are not measured again.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        record = _current.get()
+        if record is None or _parsing.get():
+            return function(*args, **kwargs)
+        token = _parsing.set(True)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _parsing.reset(token)
+            record.add(parse_time=time.perf_counter() - start)
+    return wrapper
+
+def _emit(record:CallRecord) -> None:
+    for hook in _hooks:
+        hook(record)
+
+class _Measure:
+    """
+    Start / stop one record in the current context. Nested calls do not make a record.
+    """
+    __slots__ = ('record', 'token', 'started')
+    
+    def __init__(self, record:CallRecord | None):
+        self.record = record
+        self.token = None
+        self.started = 0.0
+    
+    def enter(self) -> None:
+        if self.record is not None:
+            self.token = _current.set(self.record)
+            self.started = time.perf_counter()
+    
+    def exit(self, error:BaseException | None = None) -> None:
+        if self.record is not None:
+            self.record.duration += time.perf_counter() - self.started
+            _current.reset(self.token)
+            if error is not None and not isinstance(error, (StopIteration, StopAsyncIteration, GeneratorExit)):
+                self.record.error = type(error).__name__
+
+def _new_record(method:str) -> CallRecord | None:
+    if not _hooks or _current.get() is not None:
+        return None
+    return CallRecord(method=method, start=time.time())
+
+def _wrap(function, method:str):
+    if inspect.isasyncgenfunction(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            record = _new_record(method)
+            if record is None:
+                async for item in function(*args, **kwargs):
+                    yield item
+                return
+            iterator = function(*args, **kwargs)
+            try:
+                while True:
+                    measure = _Measure(record)
+                    measure.enter()
+                    try:
+                        item = await iterator.__anext__()
+                    except BaseException as error:
+                        measure.exit(error)
+                        if isinstance(error, StopAsyncIteration):
+                            return
+                        raise
+                    measure.exit()
+                    yield item
+            finally:
+                await iterator.aclose()
+                _emit(record)
+    elif inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            record = _new_record(method)
+            if record is None:
+                return (yield from function(*args, **kwargs))
+            iterator = function(*args, **kwargs)
+            try:
+                while True:
+                    measure = _Measure(record)
+                    measure.enter()
+                    try:
+                        item = next(iterator)
+                    except BaseException as error:
+                        measure.exit(error)
+                        if isinstance(error, StopIteration):
+                            return error.value
+                        raise
+                    measure.exit()
+                    yield item
+            finally:
+                iterator.close()
+                _emit(record)
+    elif inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            record = _new_record(method)
+            if record is None:
+                return await function(*args, **kwargs)
+            measure = _Measure(record)
+            measure.enter()
+            try:
+                result = await function(*args, **kwargs)
+            except BaseException as error:
+                measure.exit(error)
+                _emit(record)
+                raise
+            measure.exit()
+            _emit(record)
+            return result
+    else:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            record = _new_record(method)
+            if record is None:
+                return function(*args, **kwargs)
+            measure = _Measure(record)
+            measure.enter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as error:
+                measure.exit(error)
+                _emit(record)
+                raise
+            measure.exit()
+            _emit(record)
+            return result
+    return wrapper
+
+def instrumented(cls):
+    """
+    Class decorator: instrument public methods defined in the class
+    """
+    for name, function in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.isfunction(function):
+            continue
+        setattr(cls, name, _wrap(function, f'{cls.__name__}.{name}'))
+    return cls
+
+#--------------------------[Collector]---------------------#
+# NOTE: Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = tuple(256 * 4 ** _ for _ in range(9))   # 256 B ... 16 MB
+
+# FC: [Instrument] histogram
+class Histogram:
+    def __init__(self, bounds:tuple[float, ...]):
+        """
+        Fixed bucket histogram
+        
+        Parameters:
+            bounds:     (tuple[float])  - Bucket upper bounds, ascending. Last bucket is +inf
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+    
+    def observe(self, value:float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def quantile(self, q:float) -> float:
+        """
+        Upper bound of the bucket of quantile "q" [Max value for the last bucket]
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+    
+    def asdict(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([*map(str, self.bounds), '+inf'], self.counts)),
+        }
+
+# FC: [Instrument] statistics of one method
+@dataclass
+class MethodStats:
+    calls: int = 0
+    errors: int = 0
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    cache_hits: int = 0
+    wait_time: float = 0.0
+    duration: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    parse_time: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    response_bytes: Histogram = field(default_factory=lambda: Histogram(BYTES_BUCKETS))
+    
+    def add(self, record:CallRecord) -> None:
+        self.calls += 1
+        self.errors += record.error is not None
+        self.requests += record.requests
+        self.retries += record.retries
+        self.throttled += record.throttled
+        self.cache_hits += record.cache_hits
+        self.wait_time += record.wait_time
+        self.duration.observe(record.duration)
+        self.latency.observe(record.latency)
+        self.parse_time.observe(record.parse_time)
+        self.response_bytes.observe(record.response_bytes)
+    
+    def asdict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'requests': self.requests,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'cache_hits': self.cache_hits,
+            'wait_time': self.wait_time,
+            'duration': self.duration.asdict(),
+            'latency': self.latency.asdict(),
+            'parse_time': self.parse_time.asdict(),
+            'response_bytes': self.response_bytes.asdict(),
+        }
+
+# FC: [Instrument] collector
+class Collector:
+    def __init__(self):
+        """
+        Hook collecting histograms per method [Thread safe]
+        Use: instrument.add_hook(collector)
+        """
+        self.methods:dict[str, MethodStats] = {}
+        self._lock = threading.Lock()
+    
+    def __call__(self, record:CallRecord) -> None:
+        with self._lock:
+            stats = self.methods.get(record.method)
+            if stats is None:
+                stats = self.methods[record.method] = MethodStats()
+            stats.add(record)
+    
+    def summary(self) -> dict[str, dict]:
+        """
+        {method: statistics dict}, sorted by total duration
+        """
+        with self._lock:
+            items = sorted(self.methods.items(), key=lambda item: item[1].duration.sum, reverse=True)
+            return {method: stats.asdict() for method, stats in items}
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.methods.clear()
@@ -21,7 +21,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 ####################################################################################
-from dataclasses import dataclass, field, asdict
+from collections.abc import Mapping, MutableMapping
+from copy import deepcopy
+from dataclasses import dataclass, field, fields, asdict
+
+from . import instrument
 
 from .CONTENTS import (
     ALL_PROPERTIES_TYPES,
@@ -32,6 +36,7 @@ from .CONTENTS import (
     CODE_LANGUAGE_LIST,
     BLOCK_TYPE_LIST,
     BLOCK_CHILDREN_TYPES,
+    NON_UPDATABLE_PROPERTIES_ITEMS,
 )
 
 def clear_empty_id(Dict:dict) ->None:
@@ -46,20 +51,60 @@ def check_color(color):
     if color not in TEXT_COLOR_LIST:
         raise ValueError(f"Color {color} is not in {TEXT_COLOR_LIST}")
 
+def _asdict_value(value):
+    # NOTE: Same conversion as "dataclasses.asdict" for a field value
+    if hasattr(type(value), '__dataclass_fields__'):
+        return asdict(value)
+    if type(value) in (list, tuple):
+        return type(value)(_asdict_value(_) for _ in value)
+    if type(value) == dict:
+        return {key: _asdict_value(item) for key, item in value.items()}
+    return deepcopy(value)
+
+# FC: [Base] cached dict of object
+class DictMethod:
+    """
+    ".Dict" is computed on first read and cached.
+    "update()" drops the cache, so the next read of ".Dict" follows the object.
+    """
+    __slots__ = ()
+    
+    @property
+    def Dict(self) -> dict:
+        Dict = getattr(self, '_Dict', None)
+        if Dict is None:
+            Dict = self.asdict()
+            self._Dict = Dict
+        return Dict
+    
+    def asdict(self) -> dict:
+        raise NotImplementedError
+    
+    def update(self):
+        self._Dict = None
+
 # FC: [Base] object class generic method
 @dataclass
-class BaseMethod:
+class BaseMethod(DictMethod):
+    """
+    Fields in "_asdict_skip" are not converted by "asdict()" of dataclass, the object converts them itself.
+    """
+    __slots__ = ()
+    _asdict_skip = ()
+    
     def __post_init__(self) -> None:
-        self.Dict = self.asdict()
+        self._Dict = None
                               
     def asdict(self) -> dict: 
-        Dict = asdict(self) 
+        if self._asdict_skip:
+            # NOTE: Skipped fields keep their place in the dict [None until set by the object]
+            Dict = {_.name: None if _.name in self._asdict_skip else _asdict_value(getattr(self, _.name))
+                    for _ in fields(self)}
+        else:
+            Dict = asdict(self) 
         clear_empty_id(Dict)
         clear_empty_name(Dict)
         return Dict
-
-    def update(self):
-        self.Dict = self.asdict()
         
 # FC: [Base] color
 @dataclass
@@ -268,6 +313,7 @@ class User(BaseMethod):
     person: Email = field(default_factory=Email)
     type: str = 'person'
     
+    @instrument.parse_timed
     def __post_init__(self) -> None:
         if type(self.person) == dict:
             self.person = Email(**self.person) # type: ignore
@@ -283,6 +329,7 @@ class Bot(BaseMethod):
     object: str = 'user'
     type: str = 'bot'
     
+    @instrument.parse_timed
     def __post_init__(self) -> None:
         if type(self.bot) == dict:
             self.bot = BotBase(**self.bot) # type: ignore
@@ -768,118 +815,161 @@ class PropertyType(BaseMethod):
     def rename(self, new_name: str) -> None:
         self.name = new_name
         
+# FC: [L2 Base] property Item value
+def _to_rich_text_list(value):
+    return [RichText(**text) if type(text) == dict else text for text in value] # type: ignore
+
+def _to_option_list(value):
+    return [Option(**option) if type(option) == dict else option for option in value] # type: ignore
+
+def _to_user_list(value):
+    return [User(**user) if type(user) == dict else user for user in value] # type: ignore
+
+def _to_file_list(value):
+    new_files = []
+    for file in value:
+        if type(file) == dict and file['type'] == 'file':
+            new_files.append(FileUpload(**file)) # type: ignore
+        elif type(file) == dict and file['type'] == 'external':
+            new_files.append(FileLink(**file)) # type: ignore
+        else:
+            new_files.append(file)
+    return new_files
+
+def _to_user_or_bot(value):
+    if type(value) == dict:
+        return Bot(**value) if value['type'] == 'bot' else User(**value) # type: ignore
+    return value
+
+def _to_object(cls):
+    return lambda value: cls(**value) if type(value) == dict else value
+
+# NOTE: {type: (default value factory, dict to object converter)}
+PROPERTY_ITEM_VALUES = {
+    "title":            (list, _to_rich_text_list),
+    "rich_text":        (list, _to_rich_text_list),
+    "number":           (lambda: None, None),
+    "select":           (lambda: None, _to_object(Option)),
+    "multi_select":     (list, _to_option_list),
+    "status":           (lambda: None, _to_object(Option)),
+    "date":             (lambda: None, _to_object(Date)),
+    "people":           (list, _to_user_list),
+    "files":            (list, _to_file_list),
+    "checkbox":         (lambda: False, None),
+    "url":              (lambda: None, None),
+    "email":            (lambda: None, None),
+    "phone_number":     (lambda: None, None),
+    "relation":         (list, None),   # Example: [{'id': str}, ...]
+    "formula":          (FormulaValue, _to_object(FormulaValue)),
+    "rollup":           (RollupItem, _to_object(RollupItem)),
+    "created_time":     (str, None),
+    "created_by":       (User, _to_user_or_bot),
+    "last_edited_time": (str, None),
+    "last_edited_by":   (User, _to_user_or_bot),
+}
+
 # FC: [L2 Base] property Item
-@dataclass
-class PropertyItem(BaseMethod): 
-    has_more: bool = False # NOTE: This is onlt for relation
-    id: str = field(default_factory=str)
-    type: str = field(default_factory=str)
+class PropertyItem(DictMethod): 
+    """
+    Property item of page
+    Compact: only "has_more", "id", "type" and the value of "type" are stored.
+    Read value of other type get its default. Example: ".number" of "select" item is None.
     
-    # NOTE: Property value
-    title: list[RichText] = field(default_factory=list)
-    rich_text: list[RichText] = field(default_factory=list)
-    number: int | float | None = None
-    select: Option | None = None
-    multi_select: list[Option] = field(default_factory=list) 
-    status: Option | None = None
-    date: Date | None = None
-    people: list[User] = field(default_factory=list)
-    files: list[FileLink | FileUpload ] = field(default_factory=list)
-    checkbox: bool = False
-    url: str | None = None
-    email: str | None = None
-    phone_number: str | None = None
-    relation: list[dict] = field(default_factory=list) # Example: [{'id': str}, ...]
-    formula: FormulaValue = field(default_factory=FormulaValue)
-    rollup: RollupItem = field(default_factory=RollupItem)
-    created_by: User | Bot = field(default_factory=User)
-    created_time: str = field(default_factory=str)
-    last_edited_by: User | Bot = field(default_factory=User)
-    last_edited_time: str = field(default_factory=str)
+    Setting value or "type", or calling "update()" after changing a nested object, marks item dirty.
+    Not a dataclass: "asdict()" / ".Dict" convert only the stored value.
     
-    def __post_init__(self) -> None:
-        if type(self.created_by) == dict:
-            self.created_by = Bot(**self.created_by) if self.created_by['type'] == 'bot' else User(**self.created_by) # type: ignore
-        if type(self.date) == dict:
-            self.date = Date(**self.date) # type: ignore
-        if type(self.files) == list:
-            new_files = []
-            for file in self.files:
-                if type(file) == dict and file['type'] == 'file': # type: ignore
-                    new_files.append(FileUpload(**file)) # type: ignore
-                elif type(file) == dict and file['type'] == 'external': # type: ignore
-                    new_files.append(FileLink(**file)) # type: ignore
-                else:
-                    new_files.append(file)
-            self.files = new_files
-        if type(self.last_edited_by) == dict:
-            self.last_edited_by = Bot(**self.last_edited_by) if self.last_edited_by['type'] == 'bot' else User(**self.last_edited_by) # type: ignore
-        if type(self.formula) == dict:
-            self.formula = FormulaValue(**self.formula) # type: ignore
-        if type(self.multi_select) == list:
-            new_multi_select = []
-            for option in self.multi_select:
-                if type(option) == dict:
-                    new_multi_select.append(Option(**option)) # type: ignore
-                else:
-                    new_multi_select.append(option)
-            self.multi_select = new_multi_select
-        if type(self.title) == list:
-            new_title = []
-            for _,rich_text in enumerate(self.title):
-                if type(rich_text) == dict:
-                    new_title.append(RichText(**rich_text)) # type: ignore
-                else:
-                    new_title.append(rich_text)
-            self.title = new_title
-        if type(self.people) == list:
-            new_people = []
-            for user in self.people:
-                if type(user) == dict:
-                    new_people.append(User(**user)) # type: ignore
-                else:
-                    new_people.append(user)
-            self.people = new_people
-        if type(self.rollup) == dict:
-            self.rollup = RollupItem(**self.rollup) # type: ignore
-        if type(self.select) == dict:
-            self.select = Option(**self.select) # type: ignore
-        if type(self.status) == dict:
-            self.status = Option(**self.status) # type: ignore
-        if type(self.rich_text) == list:
-            new_rich_text = []
-            for _,rich_text in enumerate(self.rich_text):
-                if type(rich_text) == dict:
-                    new_rich_text.append(RichText(**rich_text)) # type: ignore
-                else:
-                    new_rich_text.append(rich_text)
-            self.rich_text = new_rich_text
-        super().__post_init__() 
+    Parameters:
+        has_more    (bool):     - Only for relation
+        id          (str):      - Property id
+        type        (str):      - Property type. Possible values are in ALL_PROPERTIES_TYPES
+        **value:                - {type: value}. Example: number=1, select=Option(...)
+                                  Value of other type is ignored.
+    """
+    __slots__ = ('has_more', 'id', 'type', 'value', '_Dict', '_dirty')
+    
+    @instrument.parse_timed
+    def __init__(self, has_more:bool = False, id:str = '', type:str = '', **value) -> None:
+        for name in value:
+            if name not in PROPERTY_ITEM_VALUES:
+                raise TypeError(f"PropertyItem got an unexpected keyword argument '{name}'")
+        object.__setattr__(self, 'has_more', has_more)
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'type', type)
+        object.__setattr__(self, 'value', self.__convert(type, value[type]) if type in value else self.__default(type))
+        object.__setattr__(self, '_Dict', None)
+        object.__setattr__(self, '_dirty', False)
+    
+    @staticmethod
+    def __default(type:str):
+        return PROPERTY_ITEM_VALUES[type][0]() if type in PROPERTY_ITEM_VALUES else None
+    
+    @staticmethod
+    def __convert(type:str, value):
+        converter = PROPERTY_ITEM_VALUES[type][1]
+        return converter(value) if converter is not None and value is not None else value
         
-    def __zip(self) -> dict: 
-        return dict(zip(ALL_PROPERTIES_TYPES,
-                        [self.title, self.rich_text, self.number, self.select, 
-                        self.multi_select, self.status, self.date, self.people, 
-                        self.files, self.checkbox, self.url, self.email, 
-                        self.phone_number, self.relation, self.formula, 
-                        self.rollup, self.created_time, self.created_by, 
-                        self.last_edited_time, self.last_edited_by,
-                        ]))
+    def __getattr__(self, name:str):
+        # NOTE: Only called when slots not found: value of type
+        if name not in PROPERTY_ITEM_VALUES:
+            raise AttributeError(f"'PropertyItem' object has no attribute '{name}'")
+        if name == self.type:
+            return self.value
+        return self.__default(name)
+    
+    def __setattr__(self, name:str, value) -> None:
+        if name in PROPERTY_ITEM_VALUES:
+            if name != self.type:
+                raise AttributeError(f"Can not set '{name}' of '{self.type}' property item")
+            name = 'value'
+        elif name == 'type' and value != self.type:
+            object.__setattr__(self, 'value', self.__default(value))
+        object.__setattr__(self, name, value)
+        if name in ('value', 'type', 'has_more'):
+            object.__setattr__(self, '_Dict', None)
+            object.__setattr__(self, '_dirty', True)
+    
+    def __getstate__(self) -> tuple:
+        return (self.has_more, self.id, self.type, self.value, self._dirty)
+    
+    def __setstate__(self, state:tuple) -> None:
+        for name, value in zip(('has_more', 'id', 'type', 'value', '_dirty'), state):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_Dict', None)
+    
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+    
+    def update(self):
+        super().update()
+        object.__setattr__(self, '_dirty', True)
+    
+    def mark_clean(self) -> None:
+        object.__setattr__(self, '_dirty', False)
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.has_more, self.id, self.type, self.value) ==
+                (other.has_more, other.id, other.type, other.value))
+    
+    def __repr__(self) -> str:
+        has_more = f"has_more={self.has_more!r}, " if self.type == 'relation' else ""
+        return f"PropertyItem({has_more}id={self.id!r}, type={self.type!r}, {self.type}={self.value!r})"
 
     def asdict(self) -> dict: 
-        _zip_value = self.__zip()
-        if (type(_zip_value[self.type]) == dict or
-            type(_zip_value[self.type]) == str or
-            type(_zip_value[self.type]) == int or
-            type(_zip_value[self.type]) == float or
-            type(_zip_value[self.type]) == bool or
-            _zip_value[self.type] == None):
-            value = _zip_value[self.type]
-        elif type(_zip_value[self.type]) == list:
+        if (type(self.value) == dict or
+            type(self.value) == str or
+            type(self.value) == int or
+            type(self.value) == float or
+            type(self.value) == bool or
+            self.value == None):
+            value = self.value
+        elif type(self.value) == list:
             value = [ _ if type(_) == dict else _.asdict()
-                     for _ in _zip_value[self.type]]
+                     for _ in self.value]
         else:
-            value = _zip_value[self.type].asdict()
+            value = self.value.asdict()
         
         if (type(value) == dict and 
             ('options' in value or 'groups' in value)):
@@ -902,19 +992,256 @@ class PropertyItem(BaseMethod):
         return self.Dict[self.type]
 
 #--------------------------[Page]---------------------#
+# FC: [Page] properties
+class PropertyDict(MutableMapping):
+    """
+    Properties of page {name: PropertyItem}
+    Remembers names which are set after load, for minimal page update.
+    Items loaded by "load()" are kept as response dicts and parsed into PropertyItem on first read,
+    so reading few columns of wide page does not build every item.
+    # NOTE: Mapping over an inner dict, not a dict subclass: "dict(...)", "{**...}" and copies read items
+    #       by "__getitem__", so they always get PropertyItem
+    """
+    __slots__ = ('_data', '_dirty', '_raw')
+    
+    def __init__(self, *args, **kwargs) -> None:
+        self._data:dict[str, dict | PropertyItem] = dict(*args, **kwargs)
+        self._dirty:set[str] = set()
+        self._raw:set[str] = set()
+    
+    def __reduce__(self):
+        return (self.__class__, (self._data,), (None, {'_dirty': set(self._dirty), '_raw': set(self._raw)}))
+    
+    def load(self, name:str, value:dict | PropertyItem) -> None:
+        """
+        Set item of response without marking it changed. Dict is parsed on first read.
+        """
+        self._data[name] = value
+        if type(value) == dict:
+            self._raw.add(name)
+        else:
+            self._raw.discard(name)
+    
+    def _parse(self, name:str):
+        item = self._data[name]
+        if name in self._raw:
+            item = self._data[name] = PropertyItem(**item)
+            self._raw.discard(name)
+        return item
+    
+    def _parse_all(self) -> None:
+        for name in list(self._raw):
+            self._parse(name)
+    
+    def __getitem__(self, name:str):
+        return self._parse(name)
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, name) -> bool:
+        return name in self._data
+    
+    def keys(self):
+        return self._data.keys()
+    
+    def get(self, name:str, default=None):
+        return self._parse(name) if name in self._data else default
+    
+    def values(self):
+        self._parse_all()
+        return self._data.values()
+    
+    def items(self):
+        self._parse_all()
+        return self._data.items()
+    
+    def copy(self) -> 'PropertyDict':
+        new = self.__class__(self._data)
+        new._dirty, new._raw = set(self._dirty), set(self._raw)
+        return new
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PropertyDict):
+            other._parse_all()
+            other = other._data
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        self._parse_all()
+        return self._data == other
+    
+    __hash__ = None # type: ignore
+    
+    def __repr__(self) -> str:
+        self._parse_all()
+        return repr(self._data)
+    
+    def __setitem__(self, name:str, item) -> None:
+        self._data[name] = item
+        self._dirty.add(name)
+        self._raw.discard(name)
+    
+    def __delitem__(self, name:str) -> None:
+        del self._data[name]
+        self._dirty.discard(name)
+        self._raw.discard(name)
+    
+    def pop(self, name:str, *default):
+        if name in self._data:
+            self._parse(name)
+        self._dirty.discard(name)
+        return self._data.pop(name, *default)
+    
+    def popitem(self):
+        self._parse_all()
+        name, item = self._data.popitem()
+        self._dirty.discard(name)
+        return name, item
+    
+    def clear(self) -> None:
+        self._data.clear()
+        self._dirty.clear()
+        self._raw.clear()
+    
+    def setdefault(self, name:str, default=None):
+        if name not in self._data:
+            self[name] = default
+        return self[name]
+    
+    def update(self, *args, **kwargs) -> None:
+        for name, item in dict(*args, **kwargs).items():
+            self[name] = item
+    
+    def dirty(self) -> list[str]:
+        """
+        Names of set or changed properties
+        """
+        # NOTE: Unparsed items are unchanged, they are not parsed here
+        return [name for name, item in self._data.items()
+                if name in self._dirty or (name not in self._raw and getattr(item, 'dirty', False))]
+    
+    def mark_dirty(self, *names:str) -> None:
+        self._dirty.update(names if names else self._data)
+    
+    def mark_clean(self) -> None:
+        self._dirty.clear()
+        for name, item in self._data.items():
+            if name not in self._raw and type(item) == PropertyItem:
+                item.mark_clean()
+
+# NOTE: Page fields sent by update besides properties
+PAGE_UPDATE_FIELDS = ('archived', 'icon', 'cover')
+PAGE_UPDATE_DEFAULTS = {'archived': False, 'icon': None, 'cover': None}
+
 # FC: [Page] object
 @dataclass
 class Page(RequestInfo): 
+    """
+    Changes after load are tracked: set property items, changed item values,
+    and "archived" / "icon" / "cover". Nested object changes need "item.update()" or "mark_dirty()".
+    Page built by constructor is changed: all its properties, and "archived" / "icon" / "cover" if set.
+    Page of response ("from_dict", api methods) has no change.
+    """
     object: str = 'page'
     properties: dict[str, PropertyItem] = field(default_factory=dict)
+    _asdict_skip = ('properties',)
 
+    @instrument.parse_timed
     def __post_init__(self) -> None:
-        new_properties = {}
-        if type(self.properties) == dict:
-            for name, value in self.properties.items():
-                new_properties.update({name: PropertyItem(**value)}) # type: ignore
+        new_properties = PropertyDict()
+        if isinstance(self.properties, Mapping):
+            # NOTE: Items stay response dicts until read, see PropertyDict
+            items = self.properties._data if isinstance(self.properties, PropertyDict) else self.properties
+            for name, value in items.items():
+                new_properties.load(name, value)
         self.properties = new_properties
         super().__post_init__()
+        new_properties.mark_dirty()
+        self._dirty_fields:set[str] = {name for name in PAGE_UPDATE_FIELDS
+                                       if getattr(self, name) != PAGE_UPDATE_DEFAULTS[name]}
+
+    @classmethod
+    @instrument.parse_timed
+    def from_dict(cls, Dict:dict, properties:list[str] | None = None) -> 'Page':
+        """
+        Page of response dict, with only some properties. Page has no change.
+
+        Parameters:
+            Dict:       (dict)          - Response dict of page
+            properties: (list[str])     - Property names or ids to keep, others are skipped [Optional, default: all]
+        """
+        if properties is None:
+            page = cls(**Dict)
+        else:
+            keep = set(properties)
+            page = cls(**{**Dict, 'properties': {name: value for name, value in Dict.get('properties', {}).items()
+                                                 if name in keep or value.get('id') in keep}})
+        page.mark_clean()
+        return page
+
+    def __setattr__(self, name:str, value) -> None:
+        if name == 'properties' and type(value) != PropertyDict:
+            value = PropertyDict(value)
+            value.mark_dirty()
+        super().__setattr__(name, value)
+        dirty_fields = self.__dict__.get('_dirty_fields')
+        if dirty_fields is not None and name in PAGE_UPDATE_FIELDS:
+            dirty_fields.add(name)
+    
+    def dirty_properties(self) -> list[str]:
+        """
+        Names of properties changed after load
+        """
+        return self.properties.dirty()
+    
+    def dirty_fields(self) -> list[str]:
+        """
+        Changed fields of PAGE_UPDATE_FIELDS
+        """
+        return [name for name in PAGE_UPDATE_FIELDS if name in self._dirty_fields]
+    
+    def mark_dirty(self, *names:str) -> None:
+        """
+        Mark properties (or "archived" / "icon" / "cover") changed. No names: all properties
+        """
+        self._dirty_fields.update(name for name in names if name in PAGE_UPDATE_FIELDS)
+        property_names = [name for name in names if name not in PAGE_UPDATE_FIELDS]
+        if property_names or not names:
+            self.properties.mark_dirty(*property_names)
+    
+    def mark_clean(self) -> None:
+        self._dirty_fields.clear()
+        self.properties.mark_clean()
+    
+    def changes(self, full:bool = False) -> dict:
+        """
+        Body of page update: changed properties and fields. Read-only properties are skipped.
+        
+        Parameters:
+            full:       (bool)      - All properties, "archived", "icon" and "cover"
+        """
+        if full:
+            names, fields = list(self.properties), PAGE_UPDATE_FIELDS
+        else:
+            names, fields = self.dirty_properties(), self.dirty_fields()
+        
+        changes = {}
+        properties = {}
+        for name in names:
+            item = self.properties[name]
+            item_dict = item if type(item) == dict else item.Dict
+            if item_dict['type'] in NON_UPDATABLE_PROPERTIES_ITEMS:
+                continue
+            properties[name] = item_dict
+        if properties:
+            changes['properties'] = properties
+        for name in fields:
+            value = getattr(self, name)
+            changes[name] = value.Dict if isinstance(value, BaseMethod) else value
+        return changes
     
     def asdict(self) -> dict: 
         Dict = super().asdict()
@@ -980,7 +1307,9 @@ class Database(RequestInfo):
     is_inline: bool = False
     properties: dict[str, PropertyType | None] = field(default_factory=dict)
     title: list[RichText] = field(default_factory=list)
+    _asdict_skip = ('properties',)
     
+    @instrument.parse_timed
     def __post_init__(self) -> None:
         new_description = []
         for _, text in enumerate(self.description):
@@ -1048,12 +1377,14 @@ class DatabaseContainer(BaseMethod):
     page: dict = field(default_factory=dict)
     results: list[Page] = field(default_factory=list)
     type: str = field(default_factory=str)
+    _asdict_skip = ('results',)
     
+    @instrument.parse_timed
     def __post_init__(self) -> None:
         new_pages = []
         for page in self.results:
             if type(page) == dict:
-                new_pages.append(Page(**page)) # type: ignore
+                new_pages.append(Page.from_dict(page))
             else:
                 new_pages.append(page)
         self.results = new_pages
@@ -1067,98 +1398,101 @@ class DatabaseContainer(BaseMethod):
         return Dict
 
 #--------------------------[Block]---------------------#
+# FC: [Block] block type object
+# NOTE: {block type: object class of block type value}
+BLOCK_TYPE_OBJECTS = {
+    "paragraph": Paragraph,
+    "heading_1": Heading, "heading_2": Heading, "heading_3": Heading,
+    "callout": Callout,
+    "quote": Quote,
+    "bulleted_list_item": BulletedListItem,
+    "numbered_list_item": NumberedListItem,
+    "to_do": ToDo,
+    "toggle": Toggle,
+    "code": Code,
+    "child_page": ChildPage,
+    "child_database": ChildDatabase,
+    "embed": Url, "bookmark": Url, "link_preview": Url,
+    "image": FileLink, "video": FileLink, "pdf": FileLink,
+    "equation": Expression,
+    "divider": dict,
+    "table_of_contents": ColorMethod,
+    "breadcrumb": dict,
+    "template": Template,
+    "link_to_page": LinkTo,
+    "synced_block": SyncedBlock,
+    "column_list": dict,
+    "column": dict,
+    "table": Table,
+    "table_row": TableRow,
+}
+
 # FC: [Block] Retrieve request info
 @dataclass
 class Block(BlockBase, BaseMethod):
+    """
+    Only the value of "type" is built to object. Value of other block type is None.
+
+    Raises:
+        ValueError:  If the "type" is not in the BLOCK_TYPE_LIST
+    """
     type: str = field(default_factory=str)
     
     # text block
-    paragraph: Paragraph = field(default_factory=Paragraph)
-    heading_1: Heading = field(default_factory=Heading)
-    heading_2: Heading = field(default_factory=Heading)
-    heading_3: Heading = field(default_factory=Heading)
-    callout: Callout = field(default_factory=Callout)
-    quote: Quote = field(default_factory=Quote)
-    bulleted_list_item: BulletedListItem = field(default_factory=BulletedListItem)
-    numbered_list_item: NumberedListItem = field(default_factory=NumberedListItem)
-    to_do: ToDo = field(default_factory=ToDo)
-    toggle: Toggle = field(default_factory=Toggle)
-    code: Code = field(default_factory=Code)
+    paragraph: Paragraph | None = None
+    heading_1: Heading | None = None
+    heading_2: Heading | None = None
+    heading_3: Heading | None = None
+    callout: Callout | None = None
+    quote: Quote | None = None
+    bulleted_list_item: BulletedListItem | None = None
+    numbered_list_item: NumberedListItem | None = None
+    to_do: ToDo | None = None
+    toggle: Toggle | None = None
+    code: Code | None = None
     # child page
-    child_page: ChildPage = field(default_factory=ChildPage)
-    child_database: ChildDatabase = field(default_factory=ChildDatabase)
+    child_page: ChildPage | None = None
+    child_database: ChildDatabase | None = None
     # Url block
-    embed: Url = field(default_factory=Url)
-    bookmark: Url = field(default_factory=Url)
-    link_preview: Url = field(default_factory=Url)
+    embed: Url | None = None
+    bookmark: Url | None = None
+    link_preview: Url | None = None
     ## Media block
-    image: FileLink = field(default_factory=FileLink)
-    video: FileLink = field(default_factory=FileLink)
-    pdf: FileLink = field(default_factory=FileLink)
+    image: FileLink | None = None
+    video: FileLink | None = None
+    pdf: FileLink | None = None
     # Other
-    equation: Expression = field(default_factory=Expression)
-    divider: dict = field(default_factory=dict)
-    table_of_contents: ColorMethod = field(default_factory=ColorMethod)
-    breadcrumb: dict = field(default_factory=dict)
-    template: Template = field(default_factory=Template)
-    link_to_page: LinkTo = field(default_factory=LinkTo)
-    synced_block: SyncedBlock = field(default_factory=SyncedBlock)
+    equation: Expression | None = None
+    divider: dict | None = None
+    table_of_contents: ColorMethod | None = None
+    breadcrumb: dict | None = None
+    template: Template | None = None
+    link_to_page: LinkTo | None = None
+    synced_block: SyncedBlock | None = None
     ## column is column_list children.
-    column_list: dict = field(default_factory=dict)
-    column: dict = field(default_factory=dict)
+    column_list: dict | None = None
+    column: dict | None = None
     ## table_row is table children.
-    table: Table = field(default_factory=Table)
-    table_row: TableRow = field(default_factory=TableRow)
+    table: Table | None = None
+    table_row: TableRow | None = None
     
+    @instrument.parse_timed
     def __post_init__(self) -> None:
         if not self.type in BLOCK_TYPE_LIST:
             raise ValueError(f"Block type {self.type} is not in the BLOCK_TYPE_LIST")
         
-        self.paragraph = Paragraph(**self.paragraph) if type(self.paragraph) == dict else self.paragraph # type: ignore
-        self.heading_1 = Heading(**self.heading_1) if type(self.heading_1) == dict else self.heading_1 # type: ignore
-        self.heading_2 = Heading(**self.heading_2) if type(self.heading_2) == dict else self.heading_2 # type: ignore
-        self.heading_3 = Heading(**self.heading_3) if type(self.heading_3) == dict else self.heading_3 # type: ignore
-        self.callout = Callout(**self.callout) if type(self.callout) == dict else self.callout # type: ignore
-        self.quote = Quote(**self.quote) if type(self.quote) == dict else self.quote # type: ignore
-        self.bulleted_list_item = BulletedListItem(**self.bulleted_list_item) if type(self.bulleted_list_item) == dict else self.bulleted_list_item # type: ignore
-        self.numbered_list_item = NumberedListItem(**self.numbered_list_item) if type(self.numbered_list_item) == dict else self.numbered_list_item # type: ignore
-        self.to_do = ToDo(**self.to_do) if type(self.to_do) == dict else self.to_do # type: ignore
-        self.toggle = Toggle(**self.toggle) if type(self.toggle) == dict else self.toggle # type: ignore
-        self.code = Code(**self.code) if type(self.code) == dict else self.code # type: ignore
-        self.child_page = ChildPage(**self.child_page) if type(self.child_page) == dict else self.child_page # type: ignore
-        self.child_database = ChildDatabase(**self.child_database) if type(self.child_database) == dict else self.child_database # type: ignore
-        self.embed = Url(**self.embed) if type(self.embed) == dict else self.embed # type: ignore
-        self.bookmark = Url(**self.bookmark) if type(self.bookmark) == dict else self.bookmark # type: ignore
-        self.link_preview = Url(**self.link_preview) if type(self.link_preview) == dict else self.link_preview # type: ignore
-        self.image = FileLink(**self.image) if type(self.image) == dict else self.image # type: ignore
-        self.video = FileLink(**self.video) if type(self.video) == dict else self.video # type: ignore
-        self.pdf = FileLink(**self.pdf) if type(self.pdf) == dict else self.pdf # type: ignore
-        self.equation = Expression(**self.equation) if type(self.equation) == dict else self.equation # type: ignore
-        self.table_of_contents = ColorMethod(**self.table_of_contents) if type(self.table_of_contents) == dict else self.table_of_contents # type: ignore
-        self.template = Template(**self.template) if type(self.template) == dict else self.template # type: ignore
-        self.link_to_page = LinkTo(**self.link_to_page) if type(self.link_to_page) == dict else self.link_to_page # type: ignore
-        self.synced_block = SyncedBlock(**self.synced_block) if type(self.synced_block) == dict else self.synced_block # type: ignore
-        self.table = Table(**self.table) if type(self.table) == dict else self.table # type: ignore
-        self.table_row = TableRow(**self.table_row) if type(self.table_row) == dict else self.table_row # type: ignore
+        type_object = BLOCK_TYPE_OBJECTS[self.type]
+        value = getattr(self, self.type)
+        if value is None:
+            value = type_object()
+        elif type(value) == dict and type_object != dict:
+            value = type_object(**value)
+        setattr(self, self.type, value)
         super().__post_init__()
 
-    def __zip(self) -> dict:
-        return dict(zip(BLOCK_TYPE_LIST,
-                        [self.paragraph, self.heading_1, self.heading_2, self.heading_3,
-                         self.callout, self.quote, self.bulleted_list_item, self.numbered_list_item,
-                         self.to_do, self.toggle, self.code, self.child_page, self.child_database,
-                         self.embed, self.bookmark, self.link_preview, self.image, self.video, self.pdf,
-                         self.equation, self.divider, self.table_of_contents, self.breadcrumb, self.template, 
-                         self.link_to_page, self.synced_block, self.column_list, self.column,
-                         self.table, self.table_row]))
-    
-    def update(self) -> None:
-        self.Dict = self.asdict()
-   
     def asdict(self) -> dict:
-        _zip_value = self.__zip()
-
-        value = _zip_value[self.type].asdict() if _zip_value[self.type] != {} and type(_zip_value[self.type]) != dict else _zip_value[self.type]
+        type_value = getattr(self, self.type)
+        value = type_value.asdict() if type_value != {} and type(type_value) != dict else type_value
         
         Dict = {
             "archived": self.archived,
@@ -1217,7 +1551,9 @@ class BlockList(BaseMethod):
     object: str = 'list'
     results: list[Block] = field(default_factory=list)
     type: str = field(default_factory=str)
+    _asdict_skip = ('results',)
     
+    @instrument.parse_timed
     def __post_init__(self) -> None:
         if not self.type in BLOCK_CHILDREN_TYPES:
             raise ValueError(f'Invalid type: {self.type}')
@@ -1251,4 +1587,32 @@ class BlockList(BaseMethod):
     
     def get_block_short_list(self) -> list[dict]:
         return [block.block_id_type() for block in self.results]
+
+# FC: [Block] tree node
+@dataclass
+class BlockTree(BaseMethod):
+    """
+    Nested block tree. Root node is the page (or block) itself, so it has no "block".
+    """
+    id: str = field(default_factory=str)
+    block: Block | None = None
+    children: list['BlockTree'] = field(default_factory=list)
+    
+    def asdict(self) -> dict:
+        return {
+            "id": self.id,
+            "block": self.block.asdict() if self.block is not None else None,
+            "children": [child.asdict() for child in self.children],
+        }
+    
+    def walk(self, depth:int = 0):
+        """
+        Depth first iterate all nodes. Yield: (depth, BlockTree)
+        """
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+    
+    def count(self) -> int:
+        return sum(1 for _ in self.walk()) - 1
         
\ No newline at end of file
@@ -0,0 +1,381 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from .object import BaseMethod, Database, PropertyType
+from .CONTENTS import (
+    FILTER_CONDITIONS,
+    FILTER_EMPTY_CONDITIONS,
+    FILTER_RELATIVE_DATE_CONDITIONS,
+    FILTER_COMPOUND_OPERATORS,
+    FILTER_NESTING_LIMIT,
+    FILTER_TIMESTAMP_TYPES,
+    SORT_DIRECTIONS,
+)
+
+# NOTE: Database query builder
+#       Query(filter=Filter("Num", "number", "greater_than", 3) & Filter("Done", "checkbox", "equals", True),
+#             sorts=[Sort("Num", "descending")],
+#             filter_properties=["Name", "Num"])
+#       ".validate(database)" checks properties against the database schema before the request.
+
+# NOTE: Text filter can be used for any text-like property
+_TEXT_PROPERTIES_TYPES = ["title", "rich_text", "url", "email", "phone_number"]
+_FORMULA_FILTER_TYPES = {"checkbox": "checkbox", "date": "date", "number": "number", "string": "rich_text"}
+
+def _check_condition(type:str, condition:str, value) -> None:
+    if condition not in FILTER_CONDITIONS[type]:
+        raise ValueError(f'Invalid condition of "{type}" filter: {condition}')
+    if condition in FILTER_EMPTY_CONDITIONS or condition in FILTER_RELATIVE_DATE_CONDITIONS:
+        return
+    if value is None:
+        raise ValueError(f'Condition "{condition}" of "{type}" filter needs a value')
+    if type == 'number' and (isinstance(value, bool) or not isinstance(value, (int, float))):
+        raise ValueError(f'Value of "number" filter must be a number: {value!r}')
+    if type == 'checkbox' and not isinstance(value, bool):
+        raise ValueError(f'Value of "checkbox" filter must be a bool: {value!r}')
+
+def _condition_value(condition:str, value):
+    if condition in FILTER_EMPTY_CONDITIONS:
+        return True
+    if condition in FILTER_RELATIVE_DATE_CONDITIONS:
+        return {}
+    return value
+
+def _single_condition(value, name:str) -> tuple[str, Any]:
+    if type(value) != dict or len(value) != 1:
+        raise ValueError(f'Value of "{name}" filter must be a dict of one condition: {value!r}')
+    return next(iter(value.items()))
+
+# FC: [Query] filter operators
+class FilterMethod(BaseMethod):
+    """
+    "&" and "|" combine filters into CompoundFilter
+    """
+    __slots__ = ()
+    
+    def __and__(self, other:'FilterMethod') -> 'CompoundFilter':
+        return CompoundFilter.combine('and', self, other)
+    
+    def __or__(self, other:'FilterMethod') -> 'CompoundFilter':
+        return CompoundFilter.combine('or', self, other)
+    
+    def depth(self) -> int:
+        return 0
+    
+    def leaves(self) -> list['Filter']:
+        return []
+
+# FC: [Query] property filter
+@dataclass
+class Filter(FilterMethod):
+    """
+    Parameters:
+        property:   (str)   - Property name or id
+        type:       (str)   - Property type. Possible values are the keys of FILTER_CONDITIONS
+        condition:  (str)   - Condition. Possible values are FILTER_CONDITIONS[type]
+        value:              - Condition value. Not needed by "is_empty", "is_not_empty" and relative dates
+                              "formula": {condition: value} of "checkbox" / "date" / "number" / "string"
+                              "rollup":  {type: {condition: value}} of "any" / "every" / "none",
+                                         {condition: value} of "date" / "number"
+    
+    Raises:
+        ValueError:  If "type", "condition" or "value" is invalid
+    """
+    property: str = field(default_factory=str)
+    type: str = 'title'
+    condition: str = 'equals'
+    value: Any = None
+    
+    def __post_init__(self) -> None:
+        if self.type not in FILTER_CONDITIONS:
+            raise ValueError(f'Invalid filter type: {self.type}')
+        if self.condition not in FILTER_CONDITIONS[self.type]:
+            raise ValueError(f'Invalid condition of "{self.type}" filter: {self.condition}')
+        
+        if self.type == 'formula':
+            condition, value = _single_condition(self.value, 'formula')
+            _check_condition(_FORMULA_FILTER_TYPES[self.condition], condition, value)
+        elif self.type == 'rollup' and self.condition in ('any', 'every', 'none'):
+            type, condition_dict = _single_condition(self.value, 'rollup')
+            if type not in FILTER_CONDITIONS or type in ('formula', 'rollup'):
+                raise ValueError(f'Invalid type of "rollup" filter: {type}')
+            condition, value = _single_condition(condition_dict, 'rollup')
+            _check_condition(type, condition, value)
+        elif self.type == 'rollup':
+            condition, value = _single_condition(self.value, 'rollup')
+            _check_condition(self.condition, condition, value)
+        else:
+            _check_condition(self.type, self.condition, self.value)
+        super().__post_init__()
+    
+    def leaves(self) -> list['Filter']:
+        return [self]
+    
+    def asdict(self) -> dict:
+        if self.type in ('formula', 'rollup'):
+            value = self.value
+        else:
+            value = _condition_value(self.condition, self.value)
+        return {
+            "property": self.property,
+            self.type: {self.condition: value},
+        }
+
+# FC: [Query] page timestamp filter
+@dataclass
+class TimestampFilter(FilterMethod):
+    """
+    Filter by "created_time" / "last_edited_time" of page, no property is needed
+    
+    Raises:
+        ValueError:  If "timestamp" or "condition" is invalid
+    """
+    timestamp: str = 'last_edited_time'
+    condition: str = 'on_or_after'
+    value: Any = None
+    
+    def __post_init__(self) -> None:
+        if self.timestamp not in FILTER_TIMESTAMP_TYPES:
+            raise ValueError(f'Invalid timestamp: {self.timestamp}')
+        _check_condition(self.timestamp, self.condition, self.value)
+        super().__post_init__()
+    
+    def asdict(self) -> dict:
+        return {
+            "timestamp": self.timestamp,
+            self.timestamp: {self.condition: _condition_value(self.condition, self.value)},
+        }
+
+# FC: [Query] compound filter
+@dataclass
+class CompoundFilter(FilterMethod):
+    """
+    Raises:
+        ValueError:  If "operator" is not "and" / "or"
+    """
+    operator: str = 'and'
+    filters: list[FilterMethod] = field(default_factory=list)
+    
+    def __post_init__(self) -> None:
+        if self.operator not in FILTER_COMPOUND_OPERATORS:
+            raise ValueError(f'Invalid compound operator: {self.operator}')
+        super().__post_init__()
+    
+    @classmethod
+    def combine(cls, operator:str, left:FilterMethod, right:FilterMethod) -> 'CompoundFilter':
+        # NOTE: "a & b & c" is one "and" of three filters, not nested
+        filters = []
+        for filter in (left, right):
+            if type(filter) == cls and filter.operator == operator:
+                filters.extend(filter.filters)
+            else:
+                filters.append(filter)
+        return cls(operator=operator, filters=filters)
+    
+    def depth(self) -> int:
+        return 1 + max((filter.depth() for filter in self.filters), default=0)
+    
+    def leaves(self) -> list[Filter]:
+        return [leaf for filter in self.filters for leaf in filter.leaves()]
+    
+    def asdict(self) -> dict:
+        return {self.operator: [filter.asdict() for filter in self.filters]}
+
+# FC: [Query] sort
+@dataclass
+class Sort(BaseMethod):
+    """
+    Sort by property (name or id) or by page "created_time" / "last_edited_time"
+    
+    Raises:
+        ValueError:  If "direction" or "timestamp" is invalid
+    """
+    property: str | None = None
+    direction: str = 'ascending'
+    timestamp: str | None = None
+    
+    def __post_init__(self) -> None:
+        if self.direction not in SORT_DIRECTIONS:
+            raise ValueError(f'Invalid sort direction: {self.direction}')
+        if (self.property is None) == (self.timestamp is None):
+            raise ValueError('Sort needs one of "property" or "timestamp"')
+        if self.timestamp is not None and self.timestamp not in FILTER_TIMESTAMP_TYPES:
+            raise ValueError(f'Invalid timestamp: {self.timestamp}')
+        super().__post_init__()
+    
+    def asdict(self) -> dict:
+        if self.property is not None:
+            return {"property": self.property, "direction": self.direction}
+        return {"timestamp": self.timestamp, "direction": self.direction}
+
+# FC: [Query] database query
+@dataclass
+class Query(BaseMethod):
+    """
+    Parameters:
+        filter:             (FilterMethod)  - Filter, TimestampFilter or CompoundFilter [Optional]
+        sorts:              (list[Sort])    - Sorts [Optional]
+        filter_properties:  (list[str])     - Only return these properties (name or id) [Optional]
+    
+    Raises:
+        ValueError:  If compound filter is nested deeper than FILTER_NESTING_LIMIT
+    """
+    filter: FilterMethod | None = None
+    sorts: list[Sort] = field(default_factory=list)
+    filter_properties: list[str] = field(default_factory=list)
+    
+    def __post_init__(self) -> None:
+        if self.filter is not None and self.filter.depth() > FILTER_NESTING_LIMIT:
+            raise ValueError(f'Compound filter can be nested up to {FILTER_NESTING_LIMIT} levels')
+        super().__post_init__()
+    
+    def asdict(self) -> dict:
+        """
+        Keyword arguments of "client.databases.query"
+        """
+        kwargs = {}
+        if self.filter is not None:
+            kwargs['filter'] = self.filter.asdict()
+        if self.sorts:
+            kwargs['sorts'] = [sort.asdict() for sort in self.sorts]
+        if self.filter_properties:
+            kwargs['filter_properties'] = list(self.filter_properties)
+        return kwargs
+    
+    def validate(self, database:Database) -> 'Query':
+        """
+        Check query against database schema
+        
+        Parameters:
+            database:   (object.Database)   - Database of query
+        
+        Returns:
+            Query:      (Query)     - Same query, "filter_properties" are converted to property ids
+        
+        Raises:
+            ValueError:  If property is not in database, or filter type does not match property type
+        """
+        schema = _Schema(database)
+        for leaf in (self.filter.leaves() if self.filter is not None else []):
+            property_type = schema.find(leaf.property)
+            if not _is_compatible(leaf.type, property_type.type):
+                raise ValueError(f'Filter type "{leaf.type}" does not match '
+                                 f'property "{property_type.name}" of type "{property_type.type}"')
+        for sort in self.sorts:
+            if sort.property is not None:
+                schema.find(sort.property)
+        return replace(self, filter_properties=[schema.find(name).id for name in self.filter_properties])
+
+# FC: [Query] range partitions of parallel scan
+# NOTE: Partitions are disjoint and cover all pages, so "Database.scan" returns each page once.
+#       First partition has no lower bound and last has no upper bound.
+def timestamp_partitions(start:datetime | str, end:datetime | str,
+                         parts:int, timestamp:str = 'created_time') -> list[FilterMethod]:
+    """
+    Split pages into "parts" ranges of "created_time" / "last_edited_time"
+    
+    Parameters:
+        start:      (datetime | str)    - Start of range. ISO 8601 string or datetime (naive is UTC)
+        end:        (datetime | str)    - End of range
+        parts:      (int)               - Number of partitions
+        timestamp:  (str)               - "created_time" or "last_edited_time"
+    
+    Returns:
+        list[FilterMethod]: (list)      - Filter of each partition
+    
+    Raises:
+        ValueError:  If "parts" < 1, "end" is not after "start" or "timestamp" is invalid
+    """
+    start, end = _to_datetime(start), _to_datetime(end)
+    if parts < 1:
+        raise ValueError(f'Parts {parts} must be greater than 0')
+    if end <= start:
+        raise ValueError(f'End {end.isoformat()} must be after start {start.isoformat()}')
+    if parts == 1:
+        return [TimestampFilter(timestamp, 'is_not_empty')]
+    step = (end - start) / parts
+    bounds = [(start + step * index).isoformat() for index in range(1, parts)]
+    partitions:list[FilterMethod] = [TimestampFilter(timestamp, 'before', bounds[0])]
+    for lower, upper in zip(bounds, bounds[1:]):
+        partitions.append(TimestampFilter(timestamp, 'on_or_after', lower) & TimestampFilter(timestamp, 'before', upper))
+    partitions.append(TimestampFilter(timestamp, 'on_or_after', bounds[-1]))
+    return partitions
+
+def number_partitions(property:str, bounds:Iterable[int | float]) -> list[FilterMethod]:
+    """
+    Split pages into ranges of a number property
+    N bounds make N + 1 ranges, and one more partition of pages with empty value.
+    
+    Parameters:
+        property:   (str)               - Number property name or id. Example: unique number of each page
+        bounds:     (Iterable[number])  - Bounds between partitions. Example: range(0, 300000, 30000)
+    
+    Returns:
+        list[FilterMethod]: (list)      - Filter of each partition
+    
+    Raises:
+        ValueError:  If "bounds" is empty or not numbers
+    """
+    bounds = sorted(set(bounds))
+    if not bounds:
+        raise ValueError('Bounds must not be empty')
+    partitions:list[FilterMethod] = [Filter(property, 'number', 'less_than', bounds[0])]
+    for lower, upper in zip(bounds, bounds[1:]):
+        partitions.append(Filter(property, 'number', 'greater_than_or_equal_to', lower) &
+                          Filter(property, 'number', 'less_than', upper))
+    partitions.append(Filter(property, 'number', 'greater_than_or_equal_to', bounds[-1]))
+    partitions.append(Filter(property, 'number', 'is_empty'))
+    return partitions
+
+def _to_datetime(value:datetime | str) -> datetime:
+    if type(value) == str:
+        # NOTE: "Z" suffix of Notion timestamps is not parsed by fromisoformat before Python 3.11
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+class _Schema:
+    def __init__(self, database:Database):
+        self.by_name:dict[str, PropertyType] = {}
+        self.by_id:dict[str, PropertyType] = {}
+        for name, property_type in database.properties.items():
+            if property_type is None:
+                continue
+            self.by_name[name] = property_type
+            self.by_id[property_type.id] = property_type
+    
+    def find(self, property:str) -> PropertyType:
+        property_type = self.by_name.get(property) or self.by_id.get(property)
+        if property_type is None:
+            raise ValueError(f'Property "{property}" is not in database')
+        return property_type
+
+def _is_compatible(filter_type:str, property_type:str) -> bool:
+    if filter_type in _TEXT_PROPERTIES_TYPES:
+        return property_type in _TEXT_PROPERTIES_TYPES
+    return filter_type == property_type
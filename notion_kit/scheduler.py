@@ -0,0 +1,268 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import asyncio
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+
+from notion_client.errors import HTTPResponseError
+
+from notion_kit import instrument
+
+# FC: [Scheduler] statistics snapshot
+@dataclass
+class SchedulerStats:
+    requests: int = 0           # Finished requests (success or error)
+    retries: int = 0            # Retried requests
+    throttled: int = 0          # Responses with status 429
+    waiting: int = 0            # Queue depth: callers waiting for a token
+    in_flight: int = 0          # Requests sent and not yet answered
+    wait_time: float = 0.0      # Total seconds spent waiting for tokens
+    latency_total: float = 0.0  # Total seconds spent in requests
+    latency_max: float = 0.0    # Slowest request in seconds
+    
+    @property
+    def latency_avg(self) -> float:
+        return self.latency_total / self.requests if self.requests else 0.0
+
+# FC: [Scheduler] token bucket
+class TokenBucket:
+    def __init__(self, rate:float=3.0, capacity:float | None = None):
+        """
+        Token bucket rate limiter
+        Tokens can go negative, so every caller reserves its own time slot (FIFO pacing).
+        
+        Parameters:
+            rate:           (float)     - Tokens refilled per second
+            capacity:       (float)     - Max tokens (burst size). [Default: rate]
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate {rate} must be greater than 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Reserve one token
+
+        Returns:
+            wait:           (float)     - Seconds to wait before the token can be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+    
+    def pause(self, seconds:float) -> None:
+        """
+        Stop handing out tokens for "seconds" [Used for "Retry-After"]
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+# FC: [Scheduler] request scheduler
+class Scheduler:
+    def __init__(self, rate:float=3.0,
+                       burst:float | None = None,
+                       max_retries:int = 5,
+                       backoff_base:float = 1.0,
+                       backoff_max:float = 60.0,
+                       retry_statuses:tuple[int, ...] = (429,)):
+        """
+        Request scheduler between api classes and notion client
+        Pace requests by token bucket, retry rate limited requests with "Retry-After" or jittered exponential backoff.
+        
+        Parameters:
+            rate:           (float)         - Requests per second. [Default: 3, Notion average limit]
+            burst:          (float)         - Max burst size. [Default: rate]
+            max_retries:    (int)           - Max retries per request
+            backoff_base:   (float)         - First backoff seconds, doubled on each retry
+            backoff_max:    (float)         - Max backoff seconds
+            retry_statuses: (tuple[int])    - HTTP status to retry. [Default: (429,)]
+                                              Add 502/503/504 only if duplicated writes are acceptable
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self._stats = SchedulerStats()
+        self._lock = threading.Lock()
+    
+    def stats(self) -> SchedulerStats:
+        """
+        Get statistics snapshot
+
+        Returns:
+            SchedulerStats:     (SchedulerStats)    - Copy of current statistics
+        """
+        with self._lock:
+            return SchedulerStats(**vars(self._stats))
+    
+    def _retry_delay(self, error:Exception, attempt:int) -> float | None:
+        if not isinstance(error, HTTPResponseError) or error.status not in self.retry_statuses:
+            return None
+        if attempt >= self.max_retries:
+            return None
+        retry_after = error.headers.get('retry-after') if error.headers is not None else None
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(backoff / 2, backoff)
+    
+    def _enter(self) -> float:
+        with self._lock:
+            self._stats.waiting += 1
+        return self.bucket.reserve()
+    
+    def _leave(self) -> None:
+        # Waiting caller left before its request [Cancelled / interrupted]
+        with self._lock:
+            self._stats.waiting -= 1
+    
+    def _start(self, wait:float) -> float:
+        with self._lock:
+            self._stats.waiting -= 1
+            self._stats.in_flight += 1
+            self._stats.wait_time += wait
+        record = instrument.current()
+        if record is not None:
+            record.add(wait_time=wait)
+        return time.monotonic()
+    
+    def _finish(self, start:float, error:Exception | None) -> None:
+        latency = time.monotonic() - start
+        with self._lock:
+            self._stats.in_flight -= 1
+            self._stats.requests += 1
+            self._stats.latency_total += latency
+            self._stats.latency_max = max(self._stats.latency_max, latency)
+            if isinstance(error, HTTPResponseError) and error.status == 429:
+                self._stats.throttled += 1
+        record = instrument.current()
+        if record is not None:
+            record.add(latency=latency, throttled=int(isinstance(error, HTTPResponseError) and error.status == 429))
+    
+    def _retry(self, error:Exception, attempt:int) -> bool:
+        delay = self._retry_delay(error, attempt)
+        if delay is None:
+            return False
+        self.bucket.pause(delay)
+        with self._lock:
+            self._stats.retries += 1
+        record = instrument.current()
+        if record is not None:
+            record.add(retries=1, requests=1)
+        return True
+    
+    def call(self, function, *args, **kwargs):
+        """
+        Call "function" under rate limit
+
+        Parameters:
+            function:       (callable)      - Notion client method. Example: client.pages.retrieve
+            args, kwargs:                   - Arguments of function
+            
+        Returns:
+            Return value of function
+        """
+        attempt = 0
+        while True:
+            wait = self._enter()
+            start, error = None, None
+            try:
+                if wait > 0:
+                    time.sleep(wait)
+                start = self._start(wait)
+                result = function(*args, **kwargs)
+            except Exception as caught:
+                error = caught
+            finally:
+                # NOTE: Counters are restored also on KeyboardInterrupt
+                if start is None:
+                    self._leave()
+                else:
+                    self._finish(start, error)
+            if error is None:
+                return result
+            if not self._retry(error, attempt):
+                raise error
+            attempt += 1
+    
+    async def acall(self, function, *args, **kwargs):
+        """
+        Await "function" under rate limit [Awaitable version of "call"]
+        """
+        attempt = 0
+        while True:
+            wait = self._enter()
+            start, error = None, None
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                start = self._start(wait)
+                result = await function(*args, **kwargs)
+            except Exception as caught:
+                error = caught
+            finally:
+                # NOTE: Counters are restored also when the task is cancelled (CancelledError)
+                if start is None:
+                    self._leave()
+                else:
+                    self._finish(start, error)
+            if error is None:
+                return result
+            if not self._retry(error, attempt):
+                raise error
+            attempt += 1
+
+# NOTE: {notion client: Scheduler} for concurrent methods of api without scheduler.
+#       One per client, so concurrent jobs / queues / scans of one workspace share the rate limit.
+_DEFAULT_SCHEDULERS:weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_DEFAULT_SCHEDULERS_LOCK = threading.Lock()
+
+def default_scheduler(client) -> Scheduler:
+    """
+    Scheduler (Notion rate limit) of client, created on first call [Thread safe]
+    
+    Parameters:
+        client:     (notion_client.Client | notion_client.AsyncClient)  - Client of requests
+    """
+    with _DEFAULT_SCHEDULERS_LOCK:
+        scheduler = _DEFAULT_SCHEDULERS.get(client)
+        if scheduler is None:
+            scheduler = _DEFAULT_SCHEDULERS[client] = Scheduler()
+        return scheduler
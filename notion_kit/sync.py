@@ -0,0 +1,155 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+####################################################################################
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Iterator
+
+from notion_kit import object
+from notion_kit.api import Database
+
+# FC: [Sync] watermark store
+class WatermarkStore:
+    def __init__(self, path:str):
+        """
+        Watermark of each database, saved in a JSON file
+        {database_id: {"last_edited_time": str, "ids": [page id edited at "last_edited_time"]}}
+        
+        Parameters:
+            path:       (str)       - JSON file path
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding='utf-8') as file:
+            return json.load(file)
+    
+    def _dump(self, data:dict) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+    
+    def get(self, database_id:str) -> dict | None:
+        with self._lock:
+            return self._load().get(database_id)
+    
+    def set(self, database_id:str, watermark:dict) -> None:
+        with self._lock:
+            data = self._load()
+            data[database_id] = watermark
+            self._dump(data)
+    
+    def reset(self, database_id:str) -> None:
+        with self._lock:
+            data = self._load()
+            if data.pop(database_id, None) is not None:
+                self._dump(data)
+
+# FC: [Sync] change event
+@dataclass
+class SyncEvent:
+    kind: str               # "inserted", "updated" or "archived"
+    page: object.Page
+
+# FC: [Sync] incremental database sync
+class DatabaseSync:
+    def __init__(self, database_api:Database, store:WatermarkStore, save_every:int = 100):
+        """
+        Incremental database sync by "last_edited_time" watermark
+        
+        Parameters:
+            database_api:   (api.Database)      - Database api. Example: kit.Database
+            store:          (WatermarkStore)    - Watermark store
+            save_every:     (int)               - Save watermark every N events
+        """
+        self.database_api = database_api
+        self.store = store
+        self.save_every = save_every
+    
+    def sync(self, database_id:str, filter:dict | None = None) ->Iterator[SyncEvent]:
+        """
+        Yield pages edited since last sync
+        Notion "last_edited_time" is rounded to minute, so pages at the watermark minute are
+        queried again and the ones already seen are skipped.
+        Watermark is saved after the consumer handled the event, stop iterating is safe.
+        
+        NOTE: Notion query does not return trashed pages, "archived" event is only
+              for pages returned with "archived": True.
+        
+        Parameters:
+            database_id:    (str)           - Target database id
+            filter:         (dict)          - Extra query filter [Optional]
+        
+        Yields:
+            SyncEvent:      (SyncEvent)     - Inserted / updated / archived page
+                                              First sync yields all pages as "inserted"
+        """
+        state = self.store.get(database_id)
+        watermark = state['last_edited_time'] if state is not None else None
+        seen = set(state['ids']) if state is not None else set()
+        
+        filters = [] if filter is None else [filter]
+        if watermark is not None:
+            filters.append({'timestamp': 'last_edited_time',
+                            'last_edited_time': {'on_or_after': watermark}})
+        query_filter = None if not filters else filters[0] if len(filters) == 1 else {'and': filters}
+        sorts = [{'timestamp': 'last_edited_time', 'direction': 'ascending'}]
+        
+        new_watermark, new_seen = watermark, set(seen)
+        count = 0
+        try:
+            for page in self.database_api.iter_pages(database_id, filter=query_filter, sorts=sorts):
+                if page.last_edited_time == watermark and page.id in seen:
+                    continue
+                if page.archived:
+                    kind = 'archived'
+                elif watermark is None or (page.created_time >= watermark and page.id not in seen):
+                    kind = 'inserted'
+                else:
+                    kind = 'updated'
+                yield SyncEvent(kind=kind, page=page)
+                
+                if page.last_edited_time != new_watermark:
+                    new_watermark, new_seen = page.last_edited_time, set()
+                new_seen.add(page.id)
+                count += 1
+                if count % self.save_every == 0:
+                    self._save(database_id, new_watermark, new_seen)
+        finally:
+            if count:
+                self._save(database_id, new_watermark, new_seen)
+    
+    def _save(self, database_id:str, watermark:str | None, seen:set[str]) -> None:
+        self.store.set(database_id, {'last_edited_time': watermark, 'ids': sorted(seen)})
+    
+    def reset(self, database_id:str) -> None:
+        """
+        Drop watermark, next sync reads all pages
+        """
+        self.store.reset(database_id)
@@ -21,15 +21,126 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 ####################################################################################
+import asyncio
 import logging
+import threading
+import weakref
 
+import httpx
 from notion_client import Client, AsyncClient
 from notion_client.helpers import get_id
 
 from .gadget import Gadget
+from .scheduler import Scheduler
+from .cache import MemoryCache, SQLiteCache
+from .transport import http_client as make_http_client, async_http_client as make_async_http_client
 from .api import Page, Database, User, Block
+from .async_api import AsyncPage, AsyncDatabase, AsyncUser, AsyncBlock
+
+# NOTE: Method of class or instance
+#       "kit.Client(token)" sets the class level default client (one workspace).
+#       "kit(token)" / "kit.get(token)" make an instance with its own client and helpers,
+#       so one process can serve many workspaces at the same time.
+# NOTE: Close tasks of async HTTP clients, referenced until done
+_closing:set[asyncio.Task] = set()
+# NOTE: Token of HTTP client given by "http_client"
+#       notion_client sets auth header on the client, a client of another token would send its token.
+_http_client_tokens:weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_http_client_tokens_lock = threading.Lock()
+
+def _claim_http_client(http_client:httpx.Client | httpx.AsyncClient, token:str) ->None:
+    """
+    Bind HTTP client given by caller to token
+    Raise ValueError if the client is already used by another token.
+    """
+    with _http_client_tokens_lock:
+        owner = _http_client_tokens.setdefault(http_client, token)
+    if owner != token:
+        raise ValueError('http_client is used by another token, '
+                         'share the connection pool by "transport" instead')
+
+def _close_async_http_client(http_client:httpx.AsyncClient) ->None:
+    """
+    Close async HTTP client from sync code
+    On running event loop of this thread, closed by a task. Otherwise closed in a new event loop.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        task = loop.create_task(http_client.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+        return
+    try:
+        asyncio.run(http_client.aclose())
+    except RuntimeError:
+        # NOTE: Connections of a closed event loop can not be closed by another loop.
+        #       Client is marked closed and its sockets are freed with the connections.
+        pass
+
+class _hybridmethod:
+    def __init__(self, function):
+        self.function = function
+        self.__doc__ = function.__doc__
     
+    def __get__(self, instance, owner):
+        return self.function.__get__(owner if instance is None else instance)
+
 class kit:
+    _registry:dict[str, 'kit'] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, token:str | None = None, **options):
+        """
+        Kit of one workspace
+        Client and helpers are attributes of the instance, not shared with other instances.
+
+        Parameter
+            token:          (str)       - Notion token [Optional: call ".Client(token)" later]
+            **options:                  - Options of kit.Client
+        """
+        if token is not None:
+            self.Client(token, **options)
+    
+    @classmethod
+    def get(cls, token:str, **options) ->'kit':
+        """
+        Get kit of token from registry [Thread safe]
+        Kit is created once for a token, options of later calls are ignored.
+
+        Parameter
+            token:          (str)       - Notion token
+            **options:                  - Options of kit.Client
+        """
+        instance = cls._registry.get(token)
+        if instance is None:
+            with cls._registry_lock:
+                instance = cls._registry.get(token)
+                if instance is None:
+                    instance = cls._registry[token] = cls(token, **options)
+        return instance
+    
+    @classmethod
+    def release(cls, token:str) ->None:
+        """
+        Remove kit of token from registry and close HTTP clients created by the kit
+        Clients given by "http_client" and shared connection pools are not closed.
+        """
+        with cls._registry_lock:
+            instance = cls._registry.pop(token, None)
+        if instance is None:
+            return
+        instance._release_async_http_client()
+    
+    @_hybridmethod
+    def _release_async_http_client(self) ->None:
+        # NOTE: Sync client of kit is on a shared pool (or caller's), closing it closes the pool
+        if vars(self).get('_owns_async_http_client'):
+            self._owns_async_http_client = False
+            _close_async_http_client(self.async_http_client)
+    
     @staticmethod
     def get_id(url:str) ->str:
         """
@@ -40,26 +151,112 @@ class kit:
         """
         return get_id(url)
     
-    @classmethod
-    def method(cls) -> None:
-        cls.Gadget:Gadget = Gadget()
-        cls.Page:Page = Page(cls.client, id=None)         
-        cls.Database:Database = Database(cls.client, id=None)
-        cls.User:User = User(cls.client, id=None)
-        cls.Block:Block = Block(cls.client, id=None)
+    @_hybridmethod
+    def method(self) -> None:
+        self.Gadget:Gadget = Gadget()
+        self.Page:Page = Page(self.client, id=None, scheduler=self.scheduler, cache=self.cache)         
+        self.Database:Database = Database(self.client, id=None, scheduler=self.scheduler, cache=self.cache)
+        self.User:User = User(self.client, id=None, scheduler=self.scheduler, cache=self.cache)
+        self.Block:Block = Block(self.client, id=None, scheduler=self.scheduler, cache=self.cache)
     
-    @classmethod
-    def Client(cls, token:str, log_level:int=logging.WARNING) ->Client:
+    @_hybridmethod
+    def async_method(self) -> None:
+        self.AsyncPage:AsyncPage = AsyncPage(self.async_client, id=None, scheduler=self.async_scheduler, cache=self.async_cache)
+        self.AsyncDatabase:AsyncDatabase = AsyncDatabase(self.async_client, id=None, scheduler=self.async_scheduler, cache=self.async_cache)
+        self.AsyncUser:AsyncUser = AsyncUser(self.async_client, id=None, scheduler=self.async_scheduler, cache=self.async_cache)
+        self.AsyncBlock:AsyncBlock = AsyncBlock(self.async_client, id=None, scheduler=self.async_scheduler, cache=self.async_cache)
+    
+    @_hybridmethod
+    def Client(self, token:str, log_level:int=logging.WARNING,
+                            scheduler:Scheduler | None = None,
+                            cache:MemoryCache | SQLiteCache | None = None,
+                            http_client:httpx.Client | None = None,
+                            transport:httpx.HTTPTransport | None = None,
+                            max_connections:int | None = 100,
+                            max_keepalive_connections:int | None = 20,
+                            keepalive_expiry:float | None = 30.0,
+                            http2:bool = False,
+                            timeout_ms:int = 60_000,
+                            base_url:str = "https://api.notion.com") ->Client:
         """
         Set client from notion_client
+        Called on class: default client of "kit". Called on instance: client of the instance only.
+        One HTTP connection pool is shared by all methods, threads and kits of same pool options.
+
+        Parameter
+            token:          (str)       - Notion token
+            log_level:      (int)       - Log level
+            scheduler:      (Scheduler) - Rate limit scheduler for all requests [Optional]
+            cache:          (MemoryCache | SQLiteCache) - Cache of retrieved page, database and block [Optional]
+            http_client:    (httpx.Client)  - Own HTTP client. Pool options below are ignored [Optional]
+                                              One http_client for one token: notion_client sets auth header on it,
+                                              ValueError if used by another token
+            transport:      (httpx.HTTPTransport) - Connection pool shared with other kits [Optional]
+                                                    Pool options below are ignored [Default: shared pool of options]
+            max_connections:            (int)   - Max open connections [None: no limit]
+            max_keepalive_connections:  (int)   - Max idle connections kept alive [None: no limit]
+            keepalive_expiry:           (float) - Seconds to keep idle connection
+            http2:          (bool)      - Use HTTP/2 [Needs "h2": pip install httpx[http2]]
+            timeout_ms:     (int)       - Request timeout in milliseconds
+            base_url:       (str)       - Root url of Notion API [Proxy or local test server]
+        """
+        if http_client is None:
+            http_client = make_http_client(max_connections, max_keepalive_connections,
+                                           keepalive_expiry, http2, transport=transport)
+        _claim_http_client(http_client, token)
+        self.token = token
+        self.log_level = log_level
+        self.scheduler = scheduler
+        self.cache = cache
+        self.http_client = http_client
+        self.client = Client(auth=token, log_level=log_level, timeout_ms=timeout_ms,
+                             base_url=base_url, client=http_client)
+        
+        self.method()
+        return  self.client
+    
+    @_hybridmethod
+    def AsyncClient(self, token:str, log_level:int=logging.WARNING,
+                                 scheduler:Scheduler | None = None,
+                                 cache:MemoryCache | SQLiteCache | None = None,
+                                 http_client:httpx.AsyncClient | None = None,
+                                 transport:httpx.AsyncHTTPTransport | None = None,
+                                 max_connections:int | None = 100,
+                                 max_keepalive_connections:int | None = 20,
+                                 keepalive_expiry:float | None = 30.0,
+                                 http2:bool = False,
+                                 timeout_ms:int = 60_000,
+                                 base_url:str = "https://api.notion.com") ->AsyncClient:
+        """
+        Set async client from notion_client
+        Awaitable methods are in "kit.AsyncPage", "kit.AsyncDatabase", "kit.AsyncUser", "kit.AsyncBlock"
 
         Parameter
             token:          (str)       - Notion token
             log_level:      (int)       - Log level
+            scheduler:      (Scheduler) - Rate limit scheduler for all requests [Optional]
+            cache:          (MemoryCache | SQLiteCache) - Cache of retrieved page, database and block [Optional]
+            http_client:    (httpx.AsyncClient) - Own HTTP client. Same as kit.Client [Optional]
+            transport:      (httpx.AsyncHTTPTransport) - Connection pool shared with other kits of one event loop
+                                                         [Default: new pool of the kit]
+            Pool options, http2, timeout_ms, base_url: Same as kit.Client
         """
-        cls.token = token
-        cls.log_level = log_level
-        cls.client = Client(auth=token, log_level=log_level)
+        owns = http_client is None and transport is None
+        if http_client is None:
+            http_client = make_async_http_client(max_connections, max_keepalive_connections,
+                                                 keepalive_expiry, http2, transport=transport)
+        _claim_http_client(http_client, token)
+        # NOTE: Previous client of this kit is replaced, close its connection pool if created by the kit
+        if vars(self).get('async_http_client') is not http_client:
+            self._release_async_http_client()
+        self._owns_async_http_client = owns
+        self.token = token
+        self.log_level = log_level
+        self.async_scheduler = scheduler
+        self.async_cache = cache
+        self.async_http_client = http_client
+        self.async_client = AsyncClient(auth=token, log_level=log_level, timeout_ms=timeout_ms,
+                                        base_url=base_url, client=http_client)
         
-        cls.method()
-        return  cls.client
\ No newline at end of file
+        self.async_method()
+        return self.async_client
\ No newline at end of file
@@ -0,0 +1,134 @@
+####################################################################################
+# MIT License
+#
+# Copyright (c) 2023 bluewhitep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import importlib.util
+import threading
+
+import httpx
+
+# NOTE: Shared HTTP transport
+#       The transport is the pool of keep-alive connections. One transport of same pool options
+#       is shared by all kits of the process, so concurrent workers and tenants reuse TLS
+#       connections instead of opening a new pool for each kit.
+#       Each kit wraps the transport in its own light httpx.Client, because notion_client sets
+#       auth header, base url and timeout on the client ("timeout_ms" of kit.Client).
+#       httpx transports are safe to share between threads.
+_transports:dict[tuple, httpx.HTTPTransport] = {}
+_transports_lock = threading.Lock()
+
+def _limits(max_connections:int | None,
+            max_keepalive_connections:int | None,
+            keepalive_expiry:float | None) -> httpx.Limits:
+    return httpx.Limits(max_connections=max_connections,
+                        max_keepalive_connections=max_keepalive_connections,
+                        keepalive_expiry=keepalive_expiry)
+
+def _check_http2(http2:bool) -> None:
+    if http2 and importlib.util.find_spec('h2') is None:
+        raise ImportError('HTTP/2 needs "h2": pip install httpx[http2]')
+
+def http_transport(max_connections:int | None = 100,
+                   max_keepalive_connections:int | None = 20,
+                   keepalive_expiry:float | None = 30.0,
+                   http2:bool = False,
+                   shared:bool = True) -> httpx.HTTPTransport:
+    """
+    Connection pool for httpx.Client
+    
+    Parameters:
+        max_connections:            (int)       - Max open connections [None: no limit]
+        max_keepalive_connections:  (int)       - Max idle connections kept alive [None: no limit]
+        keepalive_expiry:           (float)     - Seconds to keep idle connection
+        http2:                      (bool)      - Use HTTP/2 [Needs "h2" package]
+        shared:                     (bool)      - Same pool for same options in the process [False: new pool]
+    
+    Returns:
+        httpx.HTTPTransport:        (httpx.HTTPTransport)
+    """
+    _check_http2(http2)
+    if not shared:
+        return httpx.HTTPTransport(limits=_limits(max_connections, max_keepalive_connections, keepalive_expiry),
+                                   http2=http2)
+    key = (max_connections, max_keepalive_connections, keepalive_expiry, http2)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = _transports[key] = http_transport(*key, shared=False)
+    return transport
+
+def async_http_transport(max_connections:int | None = 100,
+                         max_keepalive_connections:int | None = 20,
+                         keepalive_expiry:float | None = 30.0,
+                         http2:bool = False) -> httpx.AsyncHTTPTransport:
+    """
+    Connection pool for httpx.AsyncClient
+    Same as http_transport, always a new pool
+    # NOTE: Connections of async pool belong to one event loop, share it only between kits of that loop
+    """
+    _check_http2(http2)
+    return httpx.AsyncHTTPTransport(limits=_limits(max_connections, max_keepalive_connections, keepalive_expiry),
+                                    http2=http2)
+
+def close_http_transports() -> None:
+    """
+    Close shared connection pools of http_transport
+    Kits made before keep a closed pool, call it at the end of the process.
+    """
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        transport.close()
+
+def http_client(max_connections:int | None = 100,
+                max_keepalive_connections:int | None = 20,
+                keepalive_expiry:float | None = 30.0,
+                http2:bool = False,
+                transport:httpx.HTTPTransport | None = None) -> httpx.Client:
+    """
+    HTTP client on a shared connection pool, for notion_client.Client
+    Client is light: only headers, base url and timeout of one token.
+    # NOTE: Closing the client closes its transport, do not close a client of a shared pool
+    
+    Parameters:
+        Pool options:               Same as http_transport [Ignored with "transport"]
+        transport:                  (httpx.HTTPTransport) - Connection pool [Optional: shared pool of options]
+    
+    Returns:
+        httpx.Client:               (httpx.Client)
+    """
+    if transport is None:
+        transport = http_transport(max_connections, max_keepalive_connections, keepalive_expiry, http2)
+    return httpx.Client(transport=transport)
+
+def async_http_client(max_connections:int | None = 100,
+                      max_keepalive_connections:int | None = 20,
+                      keepalive_expiry:float | None = 30.0,
+                      http2:bool = False,
+                      transport:httpx.AsyncHTTPTransport | None = None) -> httpx.AsyncClient:
+    """
+    HTTP client with connection pool, for notion_client.AsyncClient
+    Same as http_client [Without "transport": new pool of the client]
+    """
+    if transport is None:
+        transport = async_http_transport(max_connections, max_keepalive_connections, keepalive_expiry, http2)
+    return httpx.AsyncClient(transport=transport)
@@ -12,6 +12,11 @@ _pkg_name = "notion_kit"
 _version = "1.1.0" # Change 1.0.2 => 1.1.0
 _packages=["notion_kit"]
 _install_requires=_requires_from_file("requirements.txt"),
+_extras_require = {
+    "numpy": ["numpy"],
+    "arrow": ["pyarrow"],
+    "http2": ["httpx[http2]"],
+}
 _author = "Jieqiang Zhang"
 _author_email = "bluewhite2389@gmail.com"
 _description = "For easy use notion-sdk-py"
@@ -30,6 +35,7 @@ setup(
     version=_version,
     packages=_packages,
     install_requires=_install_requires,
+    extras_require=_extras_require,
     author=_author,
     author_email=_author_email,
     description=_description,